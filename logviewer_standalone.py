@@ -11,13 +11,16 @@ Features:
 - All filtering and viewing features
 """
 
+import argparse
+import io
 import json
 import re
 import sys
 import os
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time, timedelta, timezone
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Union
 
 try:
     from rich.console import Console
@@ -337,6 +340,46 @@ class LogEntry:
         return msg
 
 
+# ============================================================================
+# Parallel Parsing
+# ============================================================================
+
+PARALLEL_CHUNK_BYTES = 32 * 1024 * 1024
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+
+def split_ranges(file_path, parts: int):
+    """Split a file into at most `parts` byte ranges that start at line boundaries"""
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return []
+
+    bounds = [0]
+    with open(file_path, 'rb') as f:
+        for i in range(1, parts):
+            guess = max(size * i // parts, bounds[-1], 1)
+            f.seek(guess - 1)
+            f.readline()  # Move to the start of the line after the guess
+            pos = f.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def parse_range(file_path: str, start: int, end: int):
+    """Parse one byte range in a worker process; line numbers are range-relative"""
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    # Same newline and decoding rules as the serial text-mode reader
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', errors='replace').readlines()
+    entries = [LogEntry(line, i) for i, line in enumerate(lines, 1) if line.strip()]
+    return len(lines), entries
+
+
 # ============================================================================
 # LogViewer Class - Refactored Version
 # ============================================================================
@@ -344,8 +387,9 @@ class LogEntry:
 class LogViewer:
     """Main log viewer application"""
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, workers: int = 1):
         self.file_path = Path(file_path)
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
         self.entries: List[LogEntry] = []
         self.filtered_entries: List[LogEntry] = []
         self.current_filter: Dict[str, Any] = {}
@@ -359,12 +403,16 @@ class LogViewer:
         console.print(f"[cyan]Loading log file: {self.file_path}[/cyan]")
 
         try:
-            with open(self.file_path, 'r', encoding='utf-8', errors='replace') as f:
-                lines = f.readlines()
+            if self.workers > 1 and self.file_path.stat().st_size >= PARALLEL_MIN_BYTES:
+                self._load_parallel()
+            else:
+                with open(self.file_path, 'r', encoding='utf-8', errors='replace') as f:
+                    lines = f.readlines()
 
-            for i, line in track(enumerate(lines, 1), description="Parsing logs...", total=len(lines)):
-                if line.strip():
-                    self.entries.append(LogEntry(line, i))
+                for i, line in track(enumerate(lines, 1), description="Parsing logs...",
+                                     total=len(lines)):
+                    if line.strip():
+                        self.entries.append(LogEntry(line, i))
 
             self.filtered_entries = self.entries.copy()
             console.print(f"[green]✓ Loaded {len(self.entries)} log entries[/green]\n")
@@ -373,6 +421,24 @@ class LogViewer:
             console.print(f"[red]Error loading file: {e}[/red]")
             sys.exit(1)
 
+    def _load_parallel(self):
+        """Parse newline-aligned byte ranges in a process pool, keeping file order"""
+        size = self.file_path.stat().st_size
+        chunks = max(self.workers * 4, -(-size // PARALLEL_CHUNK_BYTES))
+        ranges = split_ranges(self.file_path, chunks)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(parse_range, str(self.file_path), start, end)
+                       for start, end in ranges]
+
+            lines_before = 0
+            for future in track(futures, description=f"Parsing logs ({self.workers} workers)..."):
+                line_count, entries = future.result()
+                for entry in entries:
+                    entry.line_number += lines_before
+                self.entries.extend(entries)
+                lines_before += line_count
+
     def display_summary(self):
         """Display log statistics summary"""
         table = Table(title="Log Summary", box=box.ROUNDED)
@@ -567,6 +633,181 @@ class LogViewer:
             console.print(f"[red]Error saving: {e}[/red]\n")
 
 
+# ============================================================================
+# Batch Queries
+# ============================================================================
+
+def parse_time_bound(spec: str, end: bool = False) -> Union[datetime, time]:
+    """
+    Parse --since/--until: a time of day (10:00, 10:00:30) or an ISO date or
+    datetime. An --until bound covers its whole last unit (10:30 runs to 10:30:59).
+    """
+    spec = spec.strip()
+    match = re.fullmatch(r'(\d{1,2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?', spec)
+    if match:
+        # Built from the fields: time.fromisoformat only takes 3 or 6 digit fractions before 3.11
+        hours, minutes, seconds, fraction = match.groups()
+        try:
+            bound: Union[datetime, time] = time(int(hours), int(minutes), int(seconds or 0),
+                                                int((fraction or '0').ljust(6, '0')))
+        except ValueError:
+            raise ValueError(f"Invalid time: {spec}")
+        precise = seconds is not None
+    else:
+        iso = spec[:-1] + '+00:00' if spec.endswith('Z') else spec
+        iso = re.sub(r'\.(\d{1,6})\d*', lambda m: '.' + m.group(1).ljust(6, '0'), iso, count=1)
+        try:
+            bound = datetime.fromisoformat(iso)
+        except ValueError:
+            raise ValueError(f"Invalid time: {spec}")
+        precise = len(spec) > 16
+        if end and len(spec) == 10:  # A date: up to the end of that day
+            return bound + timedelta(days=1, microseconds=-1)
+
+    if end and not precise:
+        bound = bound.replace(second=59, microsecond=999999)
+    return bound
+
+
+def _in_window(ts: datetime, since, until) -> bool:
+    """
+    Check a timestamp against the bounds. Times of day and bounds without an
+    offset are read on the log's clock (the entry's own offset); a bound with
+    an offset is compared in UTC, taking naive timestamps as UTC.
+    """
+    for bound, after in ((since, True), (until, False)):
+        if bound is None:
+            continue
+        if isinstance(bound, time):
+            value = ts.time()
+        elif bound.tzinfo is None:
+            value, bound = ts, bound.replace(tzinfo=ts.tzinfo)
+        else:
+            value = ts if ts.tzinfo is not None else ts.replace(tzinfo=timezone.utc)
+        if (value < bound) if after else (value > bound):
+            return False
+    return True
+
+
+def query_entries(paths: List[Path], level=None, method=None, status_code=None, search=None,
+                  thread=None, service=None, since=None, until=None,
+                  limit: Optional[int] = None) -> Iterator[LogEntry]:
+    """
+    Yield the matching entries of each file, reading one line at a time so
+    memory use does not grow with the input; stops after `limit` matches.
+    Lines without a timestamp take the one of the line before them.
+    """
+    if limit is not None and limit <= 0:
+        return
+    level = level.upper() if level else None
+    method = method.upper() if method else None
+    search = search.lower() if search else None
+    found = 0
+
+    for path in paths:
+        current = None  # Timestamp of the last line that had one
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for i, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                # Cheap checks on the raw text before parsing
+                if search and search not in line.lower() and not (since or until):
+                    continue
+
+                entry = LogEntry(line, i)
+                if entry.timestamp is not None:
+                    current = entry.timestamp
+                if since or until:
+                    if current is None or not _in_window(current, since, until):
+                        continue
+                    if search and search not in entry.raw_line.lower():
+                        continue
+
+                if level and (entry.level or '').upper() != level:
+                    continue
+                if method and (entry.method or '').upper() != method:
+                    continue
+                if status_code and entry.status_code != status_code:
+                    continue
+                if thread and not (entry.thread and thread.lower() in entry.thread.lower()):
+                    continue
+                if service and not (entry.service_name
+                                    and service.lower() in entry.service_name.lower()):
+                    continue
+
+                yield entry
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+
+
+def run_query(argv: List[str]) -> int:
+    """`logviewer_standalone.py query ...`: print matches; exit 0 (found), 1 (none) or 2 (error)"""
+    parser = argparse.ArgumentParser(prog="logviewer_standalone.py query",
+                                     description="Print the matching entries of log files "
+                                                 "without loading them")
+    parser.add_argument("log_files", nargs="+", metavar="log_file",
+                        help="log files, read one after another")
+    parser.add_argument("--level", help="log level (case-insensitive)")
+    parser.add_argument("--method", help="HTTP method")
+    parser.add_argument("--status", type=int, help="HTTP status code")
+    parser.add_argument("--thread", help="thread name contains this text")
+    parser.add_argument("--service", help="service/controller name contains this text")
+    parser.add_argument("--search", help="raw line contains this text (case-insensitive)")
+    parser.add_argument("--since",
+                        help="start time: 10:00, 10:00:30, 2024-01-20 or an ISO datetime")
+    parser.add_argument("--until", help="end time, inclusive")
+    parser.add_argument("--format", choices=("raw", "jsonl"), default="raw",
+                        help="raw lines (default) or JSON lines")
+    parser.add_argument("--limit", type=int, help="stop after this many matching entries")
+    args = parser.parse_args(argv)
+
+    errors = Console(stderr=True)
+    paths = [Path(p.strip().strip('"\'')) for p in args.log_files]
+    for path in paths:
+        if not path.exists():
+            errors.print(f"[red]Error: File not found: {path}[/red]")
+            return 2
+    try:
+        since = parse_time_bound(args.since) if args.since else None
+        until = parse_time_bound(args.until, end=True) if args.until else None
+    except ValueError as e:
+        errors.print(f"[red]Error: {e}[/red]")
+        return 2
+
+    found = 0
+    try:
+        for entry in query_entries(paths, level=args.level, method=args.method,
+                                   status_code=args.status, search=args.search,
+                                   thread=args.thread, service=args.service,
+                                   since=since, until=until, limit=args.limit):
+            if args.format == "jsonl":
+                line = json.dumps({
+                    'line': entry.line_number,
+                    'timestamp': entry.timestamp.isoformat() if entry.timestamp else None,
+                    'level': entry.level,
+                    'method': entry.method,
+                    'endpoint': entry.endpoint,
+                    'status': entry.status_code,
+                    'response_time': entry.response_time,
+                    'thread': entry.thread,
+                    'service': entry.service_name,
+                    'message': entry.message,
+                    'raw': entry.raw_line,
+                }, ensure_ascii=False, default=str)
+            else:
+                line = entry.raw_line
+            sys.stdout.write(line + '\n')
+            found += 1
+        sys.stdout.flush()
+    except BrokenPipeError:
+        sys.stderr.close()
+    except OSError as e:
+        errors.print(f"[red]Error reading logs: {e}[/red]")
+        return 2
+    return 0 if found else 1
+
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
@@ -581,6 +822,9 @@ def show_help():
 **Export:** export <path>
 **Other:** help | quit/exit
 
+**Batch mode** (no interactive session):
+  python logviewer_standalone.py query app.log --level ERROR --since 10:00 --format jsonl
+
 **Examples:**
   › filter level ERROR
   › filter thread http-nio
@@ -597,9 +841,17 @@ def show_help():
 
 def main():
     """Main application entry point"""
+    if sys.argv[1:2] == ['query']:
+        sys.exit(run_query(sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(description="API Log Viewer")
+    parser.add_argument("log_file", nargs="?", help="path to the log file (or drag & drop it)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="worker processes used to parse large files (0 = one per CPU core)")
+    args = parser.parse_args()
 
     # Check if file was drag-and-dropped or passed as argument
-    if len(sys.argv) < 2:
+    if not args.log_file:
         console.print(Panel.fit(
             "[bold yellow]API Log Viewer[/bold yellow]\n\n" +
             "[dim]Drag & drop a log file onto this application\n" +
@@ -613,7 +865,7 @@ def main():
             console.print("[red]No file provided. Exiting.[/red]")
             sys.exit(1)
     else:
-        file_path = sys.argv[1].strip().strip('"\'')
+        file_path = args.log_file.strip().strip('"\'')
 
     # Display banner
     console.print(Panel.fit(
@@ -623,7 +875,7 @@ def main():
     ))
     console.print()
 
-    viewer = LogViewer(file_path)
+    viewer = LogViewer(file_path, workers=args.workers)
     viewer.load()
     viewer.display_summary()
 
@@ -706,4 +958,6 @@ def main():
 
 
 if __name__ == '__main__':
+    import multiprocessing
+    multiprocessing.freeze_support()  # Needed for worker processes in frozen executables
     main()
\ No newline at end of file
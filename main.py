@@ -5,6 +5,7 @@ A feature-rich tool for viewing and editing API logs
 Enhanced for Java/Spring application logs with Unicode support
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -15,16 +16,125 @@ from rich.markdown import Markdown
 
 from src.log_viewer import LogViewer
 from src.utils.helpers import show_help
+from src.utils.export import EXPORT_FORMATS
+from src.utils.query import FORMAT_RAW, QUERY_FORMATS, QueryFilter, format_entry, iter_query
+from src.utils.reader import expand_paths
 
 console = Console()
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="A feature-rich tool for viewing and editing API logs",
+        epilog="Example: python main.py examples/sample_api_format.log --workers 8",
+    )
+    parser.add_argument(
+        "log_files", nargs="+", metavar="log_file",
+        help="path to the log file; several files or a quoted glob ('app.log*') are merged "
+             "by timestamp",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1,
+        help="worker processes used to parse large files (0 = one per CPU core, default: 1)",
+    )
+    parser.add_argument(
+        "-f", "--follow", action="store_true",
+        help="after loading, keep reading lines appended to the file "
+             "(Ctrl+C returns to the prompt)",
+    )
+    parser.add_argument(
+        "--mmap", dest="use_mmap", action="store_true",
+        help="memory-map the file and parse fields only when a summary or filter needs them",
+    )
+    parser.add_argument(
+        "--no-index-cache", dest="index_cache", action="store_false",
+        help="do not read or write the .lvidx index cache next to large log files",
+    )
+    parser.add_argument(
+        "--no-search-index", dest="search_index", action="store_false",
+        help="scan lines for 'filter search' instead of building a trigram index",
+    )
+    return parser.parse_args(argv)
+
+
+def parse_query_args(argv=None) -> argparse.Namespace:
+    """Parse the arguments of `main.py query`"""
+    parser = argparse.ArgumentParser(
+        prog="main.py query",
+        description="Print the matching entries of log files without loading them "
+                    "(for scripts and cron jobs)",
+        epilog="Example: python main.py query 'app.log*' --level ERROR --since 10:00 "
+               "--format jsonl --limit 100",
+    )
+    parser.add_argument("log_files", nargs="+", metavar="log_file",
+                        help="log files or quoted globs, read one after another "
+                             "(compressed files too)")
+    parser.add_argument("--level", help="log level (case-insensitive)")
+    parser.add_argument("--method", help="HTTP method")
+    parser.add_argument("--status", type=int, help="HTTP status code")
+    parser.add_argument("--thread", help="thread name contains this text")
+    parser.add_argument("--service", help="service/controller name contains this text")
+    parser.add_argument("--search", help="raw line contains this text (case-insensitive)")
+    parser.add_argument("--since",
+                        help="start time: 10:00, 10:00:30.5, 2024-01-20 or an ISO datetime")
+    parser.add_argument("--until",
+                        help="end time, inclusive at its own precision "
+                             "(--until 10:30 runs to 10:30:59)")
+    parser.add_argument("--format", choices=QUERY_FORMATS, default=FORMAT_RAW,
+                        help="raw lines (default; prefixed with the file name for several files) "
+                             "or JSON lines")
+    parser.add_argument("--limit", type=int, help="stop after this many matching entries")
+    return parser.parse_args(argv)
+
+
+def run_query(args: argparse.Namespace) -> int:
+    """
+    Stream the entries matching a query to stdout
+
+    Returns the exit status, like grep: 0 if something matched, 1 if
+    nothing did, 2 on errors.
+    """
+    errors = Console(stderr=True)
+    paths = expand_paths(args.log_files)
+    missing = [path for path in paths if not path.exists()]
+    if missing or not paths:
+        missing_path = missing[0] if missing else args.log_files[0]
+        errors.print(f"[red]Error: File not found: {missing_path}[/red]")
+        return 2
+
+    try:
+        query = QueryFilter(level=args.level, method=args.method, status_code=args.status,
+                            thread=args.thread, service=args.service, search=args.search,
+                            since=args.since, until=args.until)
+    except ValueError as e:
+        errors.print(f"[red]Error: {e}[/red]")
+        return 2
+
+    prefix = len(paths) > 1
+    out = sys.stdout
+    found = 0
+    try:
+        for path, entry in iter_query(paths, query, args.limit):
+            out.write(format_entry(path, entry, args.format, prefix) + "\n")
+            found += 1
+        out.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); stop quietly
+        sys.stderr.close()
+    except (OSError, EOFError) as e:
+        errors.print(f"[red]Error reading logs: {e}[/red]")
+        return 2
+    return 0 if found else 1
+
+
 def main():
     """Main application entry point"""
-    if len(sys.argv) < 2:
-        console.print("[yellow]Usage: python main.py <log_file_path>[/yellow]")
-        console.print("[dim]Example: python main.py examples/sample_api_format.log[/dim]")
-        sys.exit(1)
+    if sys.argv[1:2] == ['query']:
+        sys.exit(run_query(parse_query_args(sys.argv[2:])))
+
+    args = parse_args()
 
     # Display banner
     console.print(Panel.fit(
@@ -34,9 +144,17 @@ def main():
     ))
     console.print()
 
-    viewer = LogViewer(sys.argv[1])
+    viewer = LogViewer(args.log_files, workers=args.workers, search_index=args.search_index,
+                       use_mmap=args.use_mmap, index_cache=args.index_cache)
     viewer.load()
-    viewer.display_summary()
+    if args.use_mmap:
+        # The summary would parse every line; show the first page instead
+        viewer.display_entries()
+    else:
+        viewer.display_summary()
+
+    if args.follow:
+        viewer.follow()
 
     console.print("[dim]Type 'help' for available commands[/dim]\n")
 
@@ -64,18 +182,37 @@ def main():
                 viewer.display_summary()
 
             elif cmd == 'list':
-                limit = int(parts[1]) if len(parts) > 1 else 50
+                limit = int(parts[1]) if len(parts) > 1 else None
                 viewer.display_entries(limit)
 
+            elif cmd in ['next', 'n']:
+                viewer.next_page()
+
+            elif cmd in ['prev', 'p']:
+                viewer.prev_page()
+
+            elif cmd == 'goto':
+                if len(parts) == 3 and parts[1].lower() == 'line':
+                    viewer.goto_line(int(parts[2]))
+                elif len(parts) == 2:
+                    viewer.display_page(int(parts[1]) - 1)
+                else:
+                    console.print("[red]Usage: goto <page> or goto line <line_number>[/red]\n")
+
             elif cmd == 'view':
                 if len(parts) < 2:
-                    console.print("[red]Usage: view <line_number>[/red]\n")
+                    console.print("[red]Usage: view <line_number> or view <first>..<last>[/red]\n")
+                elif '..' in parts[1]:
+                    first, _, last = parts[1].partition('..')
+                    viewer.display_range(int(first), int(last))
                 else:
                     viewer.view_entry_detail(int(parts[1]))
 
             elif cmd == 'filter':
                 if len(parts) < 3:
-                    console.print("[red]Usage: filter <level|method|status|thread|service|search> <value>[/red]\n")
+                    console.print("[red]Usage: filter "
+                                  "<level|method|status|thread|service|search|time> "
+                                  "<value>[/red]\n")
                 else:
                     filter_type = parts[1].lower()
                     value = ' '.join(parts[2:])
@@ -92,9 +229,11 @@ def main():
                         viewer.filter_logs(service=value)
                     elif filter_type == 'search':
                         viewer.filter_logs(search=value)
+                    elif filter_type == 'time':
+                        viewer.filter_logs(time_range=value)
                     else:
-                        console.print(
-                            "[red]Unknown filter type. Use: level, method, status, thread, service, or search[/red]\n")
+                        console.print("[red]Unknown filter type. Use: level, method, status, "
+                                      "thread, service, search, or time[/red]\n")
 
                     viewer.display_entries()
 
@@ -102,6 +241,13 @@ def main():
                 viewer.clear_filters()
                 viewer.display_entries()
 
+            elif cmd in ['undo', 'pop']:
+                viewer.undo_filter()
+                viewer.display_entries()
+
+            elif cmd == 'follow':
+                viewer.follow()
+
             elif cmd == 'edit':
                 if len(parts) < 2:
                     console.print("[red]Usage: edit <line_number>[/red]\n")
@@ -117,9 +263,39 @@ def main():
 
             elif cmd == 'export':
                 if len(parts) < 2:
-                    console.print("[red]Usage: export <output_path>[/red]\n")
+                    console.print(
+                        "[red]Usage: export <output_path> [text|jsonl|csv|columnar][/red]\n")
+                elif len(parts) > 2 and parts[2].lower() not in EXPORT_FORMATS:
+                    console.print(f"[red]Unknown export format: {parts[2]} "
+                                  f"(text, jsonl, csv, columnar)[/red]\n")
+                else:
+                    viewer.export_filtered(parts[1], parts[2].lower() if len(parts) > 2 else None)
+
+            elif cmd == 'latency':
+                group = parts[1].lower() if len(parts) > 1 and not parts[1].isdigit() else None
+                limit = next((int(part) for part in parts[1:] if part.isdigit()), None)
+                if limit is not None:
+                    viewer.display_latency(group, limit)
+                else:
+                    viewer.display_latency(group)
+
+            elif cmd == 'requests':
+                if len(parts) > 1 and parts[1].isdigit():
+                    viewer.display_requests(int(parts[1]))
+                else:
+                    viewer.display_requests()
+
+            elif cmd == 'slow-requests':
+                try:
+                    limit = int(parts[1]) if len(parts) > 1 else None
+                    min_ms = float(parts[2]) if len(parts) > 2 else None
+                except ValueError:
+                    console.print("[red]Usage: slow-requests [N] [MIN_MS][/red]\n")
+                    continue
+                if limit is not None:
+                    viewer.display_slow_requests(limit, min_ms)
                 else:
-                    viewer.export_filtered(parts[1])
+                    viewer.display_slow_requests()
 
             elif cmd == 'stats':
                 # Additional statistics command
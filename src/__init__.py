@@ -13,8 +13,9 @@ Models package
 """
 
 from src.models.log_entry import LogEntry
+from src.models.entry_store import EntryStore, EntrySelection
 
-__all__ = ['LogEntry']
+__all__ = ['LogEntry', 'EntryStore', 'EntrySelection']
 
 
 # src/utils/__init__.py
@@ -6,6 +6,8 @@ Configuration settings for API Log Viewer
 DEFAULT_LIST_LIMIT = 50
 MAX_ENDPOINT_LENGTH = 30
 MAX_MESSAGE_LENGTH = 40
+LIST_MAX_PAGE_SIZE = 500  # Most rows rendered per page by list / next / prev / goto
+LIST_PAGE_CACHE = 3  # Rendered pages kept (previous, current and the prepared next one)
 
 # Color schemes
 LOG_LEVEL_COLORS = {
@@ -54,4 +56,50 @@ JSON_FIELD_MAPPINGS = {
     'status': ['status', 'status_code'],
     'response_time': ['response_time', 'duration'],
     'message': ['message', 'msg'],
-}
\ No newline at end of file
+}
+
+# Loading settings
+READ_BLOCK_SIZE = 1024 * 1024  # Bytes read per block while streaming a log file
+PREVIEW_THRESHOLD_BYTES = 16 * 1024 * 1024  # Show the first page early for files above this size
+PROGRESS_UPDATE_LINES = 10000  # Lines parsed between progress bar refreshes
+FORMAT_SNIFF_LINES = 200  # Lines sampled to detect a file's dominant log format
+FORMAT_SNIFF_MIN_SHARE = 0.8  # Share of sampled lines a format needs to be used directly
+TIMESTAMP_MEMO_SIZE = 4096  # Second-resolution timestamp prefixes remembered per file
+PARALLEL_CHUNK_BYTES = 32 * 1024 * 1024  # Target byte range parsed by one worker task
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024  # Files smaller than this are always parsed serially
+SEQUENTIAL_SCAN_RATIO = 16  # Read the file sequentially when a selection covers more than 1/N of it
+
+# Filter settings
+FILTER_CACHE_SIZE = 32  # Filter results kept in the LRU cache
+SEARCH_INDEX_ENABLED = True  # Build a trigram index on the first text search
+TRIGRAM_BLOCK_LINES = 32  # Entries per block in the trigram index
+TRIGRAM_MAX_POSTINGS = 20000000  # Memory cap: drop the trigram index beyond this many postings
+
+# Index cache settings
+INDEX_CACHE_ENABLED = True  # Keep parsed columns in a sidecar file next to large logs
+INDEX_CACHE_SUFFIX = '.lvidx'  # Sidecar file name suffix (app.log -> app.log.lvidx)
+INDEX_CACHE_MIN_BYTES = 8 * 1024 * 1024  # Smaller files are parsed again rather than cached
+INDEX_CACHE_HASH_BYTES = 64 * 1024  # Bytes hashed at the head and tail of the file
+
+# Follow settings
+FOLLOW_POLL_INTERVAL = 0.5  # Seconds between checks for appended lines
+FOLLOW_READ_BYTES = 8 * 1024 * 1024  # Most bytes ingested per poll
+
+# Compressed input settings
+COMPRESSED_BLOCK_SIZE = 256 * 1024  # Compressed bytes fed to the decompressor at a time
+COMPRESSED_CHECKPOINT_BYTES = 16 * 1024 * 1024  # Decompressed bytes between checkpoints
+PARALLEL_GZIP_CHUNK_BYTES = 4 * 1024 * 1024  # Compressed bytes per multi-member gzip task
+PARALLEL_BATCH_ENTRIES = 100000  # Entries per batch when decoding serially
+
+# Latency settings
+LATENCY_SKETCH_ACCURACY = 0.01  # Relative error of latency percentiles (1%)
+LATENCY_SKETCH_MAX_BUCKETS = 2048  # Bucket cap; lowest buckets fold beyond it
+LATENCY_TOP_N = 15  # Rows shown per table by the latency command
+SLOW_REQUESTS_TOP_N = 20  # Requests listed by the slow-requests command
+
+# Save settings
+SPLICE_CHUNK_BYTES = 1024 * 1024 * 1024  # Most bytes per kernel copy call on save
+
+# Export settings
+EXPORT_BUFFER_BYTES = 1024 * 1024  # Write buffer of an uncompressed export
+EXPORT_BATCH_LINES = 8192  # Entries encoded per write
@@ -3,85 +3,344 @@ Log Viewer Class
 Main log viewer application logic with enhanced display
 """
 
+import os
+import shutil
 import sys
 import json
+import heapq
+import time
+from array import array
+from bisect import bisect_left
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Sequence, Tuple, Union
 
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.syntax import Syntax
 from rich.text import Text
-from rich.progress import track
+from rich.progress import Progress, TaskID
 from rich import box
 
-from src.models.log_entry import LogEntry
+from src.config import (
+    DEFAULT_LIST_LIMIT, LIST_MAX_PAGE_SIZE, LIST_PAGE_CACHE, PREVIEW_THRESHOLD_BYTES,
+    PROGRESS_UPDATE_LINES, PARALLEL_MIN_BYTES, FILTER_CACHE_SIZE, SEARCH_INDEX_ENABLED,
+    INDEX_CACHE_ENABLED, INDEX_CACHE_MIN_BYTES, FOLLOW_POLL_INTERVAL,
+    LATENCY_SKETCH_ACCURACY, LATENCY_TOP_N, SLOW_REQUESTS_TOP_N,
+)
+from src.models.entry_store import EntrySelection, EntryStore, Ids
+from src.models.index_cache import read_index, write_index
+from src.models.log_entry import LogEntry, LogFormat, truncate_message
+from src.models.merge import merge_stores
+from src.models.sketch import QuantileSketch, merged
+from src.models.timestamps import from_epoch_micros, parse_time_range
+from src.utils.export import EXPORT_TEXT, export_format, write_export
+from src.utils.compression import (
+    GZIP, CompressedSource, DecompressedStream, Checkpoint, detect_compression, open_compressed,
+)
+from src.utils.follow import FileFollower
+from src.utils.splice import splice_lines
+from src.utils.parallel import (
+    iter_parallel_chunks, iter_parallel_gzip_chunks, iter_parsed_files, is_multi_member_gzip,
+    resolve_workers,
+)
+from src.utils.reader import expand_paths, iter_lines, split_lines, sniff_format
 
 console = Console()
 
 
+def _progress() -> Progress:
+    """A progress bar that is cleared when it finishes"""
+    return Progress(*Progress.get_default_columns(), console=console, transient=True)
+
+
 class LogViewer:
     """Main log viewer application"""
 
-    def __init__(self, file_path: str):
-        self.file_path = Path(file_path)
-        self.entries: List[LogEntry] = []
-        self.filtered_entries: List[LogEntry] = []
+    def __init__(self, file_path: Union[str, Sequence[str]], workers: int = 1,
+                 search_index: bool = SEARCH_INDEX_ENABLED, use_mmap: bool = False,
+                 index_cache: bool = INDEX_CACHE_ENABLED):
+        # A glob or a list of files is loaded as one time-ordered view
+        self.file_paths = expand_paths(file_path)
+        self.file_path = self.file_paths[0] if self.file_paths else Path(str(file_path))
+        self.workers = resolve_workers(workers)
+        self.search_index = search_index
+        self.use_mmap = use_mmap
+        self.index_cache = index_cache
+        self.entries = EntryStore(self.file_path)
+        self.filtered_entries = EntrySelection(self.entries)
         self.current_filter: Dict[str, Any] = {}
+        self.filter_stack: List[Tuple[Dict[str, Any], EntrySelection]] = []
+        self._filter_cache: 'OrderedDict[Tuple, Optional[Ids]]' = OrderedDict()
+        self._show_preview = False
+        self._follower: Optional[FileFollower] = None
+        self._loaded_end: Optional[Tuple[int, bool]] = None  # `end_offset()` when loaded
+        self._partial_id: Optional[int] = None  # Last entry, if its line had no newline yet
+
+        # Paged list: current page, and rendered rows by (first row, page size)
+        # for the selection they were rendered from
+        self.page_size = DEFAULT_LIST_LIMIT
+        self.page = 0
+        self._page_rows: 'OrderedDict[Tuple[int, int], List[tuple]]' = OrderedDict()
+        self._page_selection: Optional[EntrySelection] = None
 
-        if not self.file_path.exists():
-            console.print(f"[red]Error: File not found: {file_path}[/red]")
+        missing = [path for path in self.file_paths if not path.exists()]
+        if missing or not self.file_paths:
+            missing_path = missing[0] if missing else file_path
+            console.print(f"[red]Error: File not found: {missing_path}[/red]")
             sys.exit(1)
 
-    def load(self):
-        """Load and parse log file"""
-        console.print(f"[cyan]Loading log file: {self.file_path}[/cyan]")
+        self.compression = None if self.multi_file else detect_compression(self.file_path)
+
+    @property
+    def multi_file(self) -> bool:
+        return len(self.file_paths) > 1
+
+    def load(self, preview: bool = True):
+        """
+        Load and parse log file
+
+        Lines are streamed from disk in blocks and parsed as they arrive, so the
+        raw file is never held in memory. For large files the first page of
+        entries is shown as soon as it is parsed, while the rest is still loading.
+        With more than one worker, large files are split into newline-aligned
+        byte ranges that are parsed in a process pool.
+
+        With `use_mmap` the file is memory-mapped and only the line offsets are
+        indexed; fields are parsed on the first summary or field filter.
+
+        Large files keep their parsed columns in a sidecar index cache. A
+        valid cache is loaded instead of parsing, and if the file has grown
+        since, only the appended lines are parsed.
+
+        gzip, bzip2 and xz files (recognised by their magic bytes) are
+        decompressed as a stream; raw lines are read back through periodic
+        decompression checkpoints. Memory-mapping and the index cache do not
+        apply to them.
+
+        Several files (a glob or a list) are parsed one per worker and merged
+        into a single time-ordered view; see `_load_files`.
+        """
+        if self.multi_file:
+            try:
+                self._load_files()
+            except Exception as e:
+                console.print(f"[red]Error loading files: {e}[/red]")
+                sys.exit(1)
+            return
+
+        suffix = f" ({self.compression})" if self.compression else ""
+        console.print(f"[cyan]Loading log file: {self.file_path}{suffix}[/cyan]")
 
         try:
-            # Read with UTF-8 encoding for Unicode support
-            with open(self.file_path, 'r', encoding='utf-8', errors='replace') as f:
-                lines = f.readlines()
+            file_size = self.file_path.stat().st_size
+            if self._cache_enabled() and self._load_cached(file_size):
+                return
+
+            if self.use_mmap and self.compression:
+                console.print("[dim]Compressed file: memory-mapping skipped[/dim]")
+            elif self.use_mmap:
+                self._load_mapped()
+                return
+
+            self._show_preview = preview and file_size >= PREVIEW_THRESHOLD_BYTES
+            log_format = sniff_format(self.file_path, compression=self.compression)
+            self.entries.log_format = log_format
 
-            for i, line in track(enumerate(lines, 1), description="Parsing logs...", total=len(lines)):
-                if line.strip():
-                    self.entries.append(LogEntry(line, i))
+            with _progress() as progress:
+                task = progress.add_task("Parsing logs...", total=file_size or None)
 
-            self.filtered_entries = self.entries.copy()
+                if self.compression:
+                    self._load_compressed(log_format, progress, task, file_size)
+                elif self.workers > 1 and file_size >= PARALLEL_MIN_BYTES:
+                    self._load_parallel(log_format, progress, task)
+                else:
+                    self._load_serial(log_format, progress, task)
+
+                progress.update(task, completed=file_size)
+
+            self.filtered_entries = EntrySelection(self.entries)
+            self._loaded_end = self.entries.end_offset()
             console.print(f"[green]✓ Loaded {len(self.entries)} log entries[/green]\n")
 
+            if self._cache_enabled():
+                self._write_index_cache()
+
         except Exception as e:
             console.print(f"[red]Error loading file: {e}[/red]")
             sys.exit(1)
 
+    def _load_files(self):
+        """
+        Load several files into one view ordered by timestamp
+
+        Each file is parsed into a store of its own (in parallel with more than
+        one worker), then the stores are combined by a streaming k-way merge
+        on their timestamps. Entries are numbered in merged order and keep the
+        file and line they came from. Memory-mapping, the index cache and
+        `follow` only apply to single files.
+        """
+        console.print(f"[cyan]Loading {len(self.file_paths)} log files: "
+                      f"{', '.join(path.name for path in self.file_paths)}[/cyan]")
+        if self.use_mmap:
+            console.print("[dim]Several files: memory-mapping skipped[/dim]")
+
+        parts: List[Optional[EntryStore]] = [None] * len(self.file_paths)
+        with _progress() as progress:
+            task = progress.add_task("Parsing logs...", total=len(parts))
+            for index, part in iter_parsed_files(self.file_paths, self.workers):
+                parts[index] = part
+                progress.advance(task)
+
+        with console.status("[cyan]Merging by timestamp...[/cyan]"):
+            self.entries = merge_stores(parts)
+
+        self.filtered_entries = EntrySelection(self.entries)
+        console.print(f"[green]✓ Loaded {len(self.entries)} log entries "
+                      f"from {len(parts)} files[/green]\n")
+
+    def _load_mapped(self):
+        self.entries.log_format = sniff_format(self.file_path)
+        with console.status("[cyan]Indexing lines...[/cyan]"):
+            self.entries.index_source()
+
+        self.filtered_entries = EntrySelection(self.entries)
+        self._loaded_end = self.entries.end_offset()
+        console.print(f"[green]✓ Indexed {len(self.entries)} log entries[/green]\n")
+
+    def _load_cached(self, file_size: int) -> bool:
+        """Restore the entries from the index cache, parsing only appended lines"""
+        cached = read_index(self.file_path)
+        if cached is None:
+            return False
+
+        self.entries = store = cached.store
+        cached_count = len(store)
+        if file_size > cached.tail_start:
+            with _progress() as progress:
+                task = progress.add_task("Parsing appended lines...", total=file_size,
+                                         completed=cached.tail_start)
+                self._load_serial(store.log_format, progress, task, cached.tail_start,
+                                  cached.line_count)
+
+        if self.use_mmap:
+            store.map_source()
+
+        self.filtered_entries = EntrySelection(store)
+        self._loaded_end = store.end_offset()
+        appended = len(store) - cached_count
+        suffix = f", {appended} appended" if appended else ""
+        console.print(f"[green]✓ Loaded {len(store)} log entries from index cache"
+                      f"{suffix}[/green]\n")
+
+        if file_size > cached.tail_start:
+            self._write_index_cache()
+        return True
+
+    def _cache_enabled(self) -> bool:
+        return (self.index_cache and not self.compression and not self.multi_file
+                and self.file_path.stat().st_size >= INDEX_CACHE_MIN_BYTES)
+
+    def _write_index_cache(self):
+        try:
+            write_index(self.entries)
+        except (OSError, ValueError) as e:
+            console.print(f"[dim]Index cache not written: {e}[/dim]\n")
+
+    def _ensure_columns(self):
+        """Parse the fields of a memory-mapped file the first time they are needed"""
+        store = self.entries
+        if store.columns_loaded:
+            return
+
+        with _progress() as progress:
+            task = progress.add_task("Parsing logs...", total=len(store))
+            store.load_columns(lambda count: progress.update(task, completed=count))
+
+        if self._cache_enabled() and not store.edits:
+            self._write_index_cache()
+
+    def _load_serial(self, log_format: LogFormat, progress: Progress, task: TaskID,
+                     start: int = 0, lines_before: int = 0):
+        for line_number, offset, text in iter_lines(self.file_path, start=start):
+            if text.strip():
+                self.entries.append(LogEntry(text, lines_before + line_number, log_format), offset)
+                self._maybe_preview()
+
+            if line_number % PROGRESS_UPDATE_LINES == 0:
+                progress.update(task, completed=offset)
+
+    def _load_parallel(self, log_format: LogFormat, progress: Progress, task: TaskID):
+        chunks = iter_parallel_chunks(self.file_path, self.workers, log_format)
+        for end, lines_before, chunk in chunks:
+            self.entries.extend(chunk, lines_before)
+            self._maybe_preview()
+            progress.update(task, completed=end)
+
+    def _load_compressed(self, log_format: LogFormat, progress: Progress, task: TaskID,
+                         file_size: int):
+        """
+        Decompress and parse a compressed file
+
+        Multi-member gzip files (such as BGZF, or concatenated .gz files) are
+        split at member boundaries and decoded in a process pool; everything
+        else decodes as one stream. Either way the checkpoints recorded on the
+        way give raw-line access without decompressing from the start.
+        """
+        checkpoints: List[Checkpoint] = []
+        if (self.compression == GZIP and self.workers > 1 and file_size >= PARALLEL_MIN_BYTES
+                and is_multi_member_gzip(self.file_path)):
+            chunks = iter_parallel_gzip_chunks(self.file_path, self.workers, log_format,
+                                               checkpoints)
+            for end, lines_before, byte_offset, chunk in chunks:
+                self.entries.extend(chunk, lines_before, byte_offset)
+                self._maybe_preview()
+                progress.update(task, completed=end)
+        else:
+            with open(self.file_path, 'rb') as f:
+                stream = DecompressedStream(f, self.compression, checkpoints=checkpoints)
+                for line_number, offset, text in split_lines(stream):
+                    if text.strip():
+                        self.entries.append(LogEntry(text, line_number, log_format), offset)
+                        self._maybe_preview()
+
+                    if line_number % PROGRESS_UPDATE_LINES == 0:
+                        progress.update(task, completed=stream.compressed_offset)
+
+        self.entries.compressed = CompressedSource(self.file_path, self.compression, checkpoints)
+
+    def _maybe_preview(self):
+        """Show the first page once enough entries have been parsed"""
+        if self._show_preview and len(self.entries) >= DEFAULT_LIST_LIMIT:
+            self._show_preview = False
+            self.filtered_entries = EntrySelection(self.entries)
+            self.display_entries(DEFAULT_LIST_LIMIT)
+
     def display_summary(self):
         """Display log statistics summary"""
         table = Table(title="Log Summary", box=box.ROUNDED)
         table.add_column("Metric", style="cyan", width=20)
         table.add_column("Value", style="green")
 
-        # Count by level
-        levels = {}
-        methods = {}
-        status_codes = {}
+        # Counts come from the index sizes, or from the counts kept by a filtered selection
+        self._ensure_columns()
+        selection = self.filtered_entries
+        levels = selection.count_values('level')
+        methods = selection.count_values('method')
+        status_codes = selection.count_values('status_code')
+        services = selection.count_values('service_name')
+
         threads = {}
-        services = {}
-
-        for entry in self.filtered_entries:
-            if entry.level:
-                levels[entry.level] = levels.get(entry.level, 0) + 1
-            if entry.method:
-                methods[entry.method] = methods.get(entry.method, 0) + 1
-            if entry.status_code:
-                status_codes[entry.status_code] = status_codes.get(entry.status_code, 0) + 1
-            if entry.thread:
-                thread_name = entry.thread.split('-')[0]  # Group similar threads
-                threads[thread_name] = threads.get(thread_name, 0) + 1
-            if entry.service_name:
-                services[entry.service_name] = services.get(entry.service_name, 0) + 1
+        for thread, count in selection.count_values('thread').items():
+            thread_name = thread.split('-')[0]  # Group similar threads
+            threads[thread_name] = threads.get(thread_name, 0) + count
 
         table.add_row("Total Entries", str(len(self.filtered_entries)))
-        table.add_row("File Size", f"{self.file_path.stat().st_size / 1024:.2f} KB")
+        if self.multi_file:
+            table.add_row("Files", str(len(self.file_paths)))
+        file_size = sum(path.stat().st_size for path in self.file_paths)
+        table.add_row("File Size", f"{file_size / 1024:.2f} KB")
 
         if levels:
             top_levels = sorted(levels.items(), key=lambda x: x[1], reverse=True)[:5]
@@ -105,15 +364,252 @@ class LogViewer:
         console.print(table)
         console.print()
 
-    def display_entries(self, limit: int = 50):
-        """Display log entries in a table"""
+    # Latency groups: command name -> (field, column title)
+    LATENCY_GROUPS = {
+        'endpoint': ('endpoint', 'Endpoint'),
+        'service': ('service_name', 'Service'),
+        'method': ('method', 'Method'),
+    }
+
+    def display_latency(self, group: Optional[str] = None, limit: int = LATENCY_TOP_N):
+        """
+        Display response-time percentiles per endpoint, service and method
+
+        Percentiles come from DDSketch quantile sketches: the unfiltered view
+        uses the ones kept while loading, a filtered view is sketched from the
+        response-time column. Rows are sorted by p99, slowest first.
+        """
+        if group is not None and group not in self.LATENCY_GROUPS:
+            console.print(f"[red]Unknown latency group: {group} "
+                          f"(use endpoint, service or method)[/red]\n")
+            return
+
+        self._ensure_columns()
+        ids = self.filtered_entries.ids
+        groups = [group] if group else list(self.LATENCY_GROUPS)
+        accuracy = f"±{LATENCY_SKETCH_ACCURACY:.0%}"
+
+        for name in groups:
+            field, title = self.LATENCY_GROUPS[name]
+            sketches = self.entries.latency_sketches(field, ids)
+            overall = merged(sketches.values())
+            if not overall.count:
+                console.print("[yellow]No response times in the current entries[/yellow]\n")
+                return
+
+            table = Table(title=f"Latency by {title} (ms, {accuracy})", box=box.ROUNDED)
+            table.add_column(title, style="yellow", overflow="fold")
+            for column in ("Count", "p50", "p90", "p99", "Max"):
+                table.add_column(column, justify="right")
+
+            dictionary = self.entries.dictionaries[field]
+            rows = sorted(sketches.items(), key=lambda item: item[1].quantile(0.99) or 0,
+                          reverse=True)
+            for code, sketch in rows[:limit]:
+                if sketch.count:
+                    table.add_row(str(dictionary.decode(code) or "-"), *self._latency_cells(sketch))
+            table.add_row("[bold]All[/bold]", *self._latency_cells(overall), end_section=True)
+
+            console.print(table)
+            if len(rows) > limit:
+                console.print(f"[dim]{len(rows) - limit} more {name} values not shown[/dim]")
+            console.print()
+
+    @staticmethod
+    def _latency_cells(sketch: QuantileSketch) -> List[str]:
+        quantiles = [sketch.quantile(q) for q in (0.5, 0.9, 0.99)]
+        return [str(sketch.count)] + [f"{value:.1f}" for value in quantiles + [sketch.max]]
+
+    def display_requests(self, limit: int = LATENCY_TOP_N):
+        """
+        Display request durations per endpoint from paired START / STOP lines
+
+        Requests are counted when their START line is in the current view.
+        Also reports starts and stops left unpaired and the threads that ran
+        overlapping requests.
+        """
+        self._ensure_columns()
+        store = self.entries
+        pairs = store.request_pairs()
+        requests = pairs.select(self.filtered_entries.ids)
+        if not requests:
+            console.print("[yellow]No START/STOP request pairs in the current entries[/yellow]\n")
+            return
+
+        sketches: Dict[int, QuantileSketch] = {}
+        endpoints = store.codes['endpoint']
+        for n in requests:
+            code = endpoints[pairs.start_ids[n]]
+            sketch = sketches.get(code)
+            if sketch is None:
+                sketch = sketches[code] = QuantileSketch()
+            sketch.add(pairs.durations[n])
+        overall = merged(sketches.values())
+
+        table = Table(title=f"Requests by Endpoint (ms, ±{LATENCY_SKETCH_ACCURACY:.0%})",
+                      box=box.ROUNDED)
+        table.add_column("Endpoint", style="yellow", overflow="fold")
+        for column in ("Count", "p50", "p90", "p99", "Max"):
+            table.add_column(column, justify="right")
+
+        dictionary = store.dictionaries['endpoint']
+        rows = sorted(sketches.items(), key=lambda item: item[1].quantile(0.99) or 0,
+                      reverse=True)
+        for code, sketch in rows[:limit]:
+            if sketch.count:
+                table.add_row(str(dictionary.decode(code) or "-"), *self._latency_cells(sketch))
+        if overall.count:
+            table.add_row("[bold]All[/bold]", *self._latency_cells(overall), end_section=True)
+        console.print(table)
+
+        unstamped = len(requests) - overall.count
+        console.print(f"[cyan]{len(requests)}[/cyan] requests paired"
+                      + (f" ({unstamped} without timestamps)" if unstamped else "")
+                      + f", [yellow]{len(pairs.unmatched_starts())}[/yellow] starts without a stop"
+                      f", [yellow]{len(pairs.unmatched_stops())}[/yellow] stops without a start")
+
+        overlaps = pairs.overlaps(store.codes['thread'], store.source_ids, requests)
+        if overlaps:
+            threads = store.dictionaries['thread']
+            top = sorted(overlaps.items(), key=lambda item: item[1], reverse=True)[:limit]
+            names = []
+            for (source, thread), count in top:
+                name = threads.decode(thread) or "-"
+                if self.multi_file:
+                    name = f"{self.file_paths[source].name}:{name}"
+                names.append(f"{name} ({count})")
+            console.print(f"Overlapping requests per thread: {', '.join(names)}")
+        console.print()
+
+    def display_slow_requests(self, limit: int = SLOW_REQUESTS_TOP_N,
+                              min_ms: Optional[float] = None):
+        """Display the slowest paired requests in the current view, optionally above a threshold"""
+        self._ensure_columns()
+        store = self.entries
+        pairs = store.request_pairs()
+        durations = pairs.durations
+        requests = [n for n in pairs.select(self.filtered_entries.ids)
+                    if durations[n] >= (min_ms if min_ms is not None else 0)]
+        if not requests:
+            console.print("[yellow]No matching requests[/yellow]\n")
+            return
+
+        slowest = heapq.nlargest(limit, requests, key=durations.__getitem__)
+        title = f"Slowest Requests (showing {len(slowest)} of {len(requests)})"
+        table = Table(title=title, box=box.SIMPLE)
+        table.add_column("Start", style="dim", justify="right", no_wrap=True)
+        table.add_column("Stop", style="dim", justify="right", no_wrap=True)
+        table.add_column("Time", style="cyan", no_wrap=True)
+        table.add_column("Thread", style="blue", max_width=25, overflow="fold")
+        table.add_column("Endpoint", style="yellow", max_width=20, overflow="fold")
+        table.add_column("ms", justify="right", style="bold", no_wrap=True)
+
+        threads, endpoints = store.dictionaries['thread'], store.dictionaries['endpoint']
+        for n in slowest:
+            start, stop = pairs.start_ids[n], pairs.stop_ids[n]
+            started = from_epoch_micros(store.timestamps[start])
+            table.add_row(
+                str(store.line_numbers[start]),
+                str(store.line_numbers[stop]),
+                started.strftime("%H:%M:%S.%f")[:-3] if started else "-",
+                str(threads.decode(store.codes['thread'][start]) or "-"),
+                str(endpoints.decode(store.codes['endpoint'][start]) or "-"),
+                f"{durations[n]:.1f}",
+            )
+        console.print(table)
+        console.print("[dim]Use 'view <start>..<stop>' to see a request's lines[/dim]\n")
+
+    def display_entries(self, limit: Optional[int] = None):
+        """Display the first page of the current entries, `limit` rows per page (if given)"""
+        if limit is not None:
+            if limit > LIST_MAX_PAGE_SIZE:
+                console.print(f"[dim]Showing {LIST_MAX_PAGE_SIZE} entries per page; "
+                              f"use next / prev / goto for the rest[/dim]")
+            self.page_size = max(1, min(limit, LIST_MAX_PAGE_SIZE))
+        self.display_page(0)
+
+    def display_page(self, page: int):
+        """
+        Display one page of the current entries (pages are numbered from 0)
+
+        Only the rows on the page are read and formatted, so a page takes the
+        same time however many entries the view holds. Once it is printed the
+        rows of the following page are prepared, so `next` prints at once.
+        """
+        selection = self.filtered_entries
+        if self._page_selection is not selection:
+            self._page_selection = selection
+            self._page_rows.clear()
+
+        size = self.page_size
+        total = len(selection)
+        pages = max(1, -(-total // size))
+        self.page = page = min(max(page, 0), pages - 1)
+        start = page * size
+
+        rows = self._rows_at(start)
+        title = (f"Log Entries (page {page + 1} of {pages}, "
+                 f"entries {start + 1}-{start + len(rows)} of {total})"
+                 if total else "Log Entries (none)")
+        console.print(self._entries_table(title, rows))
+        if pages > 1:
+            console.print("[dim]next / prev / goto <page> / goto line <N>[/dim]\n")
+        else:
+            console.print()
+
+        if page + 1 < pages:
+            self._rows_at(start + size)
+
+    def next_page(self):
+        self.display_page(self.page + 1 if self._page_selection is self.filtered_entries else 0)
+
+    def prev_page(self):
+        self.display_page(self.page - 1 if self._page_selection is self.filtered_entries else 0)
+
+    def goto_line(self, line_number: int):
+        """Display the page holding the first current entry at or after a line number"""
+        ids = self.filtered_entries.id_list()
+        entry_id = bisect_left(self.entries.line_numbers, line_number)
+        self.display_page(bisect_left(ids, entry_id) // self.page_size)
+
+    def _rows_at(self, start: int) -> List[tuple]:
+        """Table rows for the page starting at `start`, rendered once per page"""
+        key = (start, self.page_size)
+        rows = self._page_rows.get(key)
+        if rows is None:
+            rows = self._entry_rows(self.filtered_entries[start:start + self.page_size])
+            self._page_rows[key] = rows
+            if len(self._page_rows) > LIST_PAGE_CACHE:
+                self._page_rows.popitem(last=False)
+        else:
+            self._page_rows.move_to_end(key)
+        return rows
+
+    def display_range(self, first: int, last: int, limit: int = 50):
+        """Display the entries on lines first..last of the file"""
+        ids = self.entries.line_range(first, last)
+        if not ids:
+            console.print(f"[red]No entries on lines {first}..{last}[/red]")
+            return
+
+        title = f"Log Entries (lines {first}..{last}, showing {min(limit, len(ids))} of {len(ids)})"
+        self._print_entries(EntrySelection(self.entries, ids[:limit]), title)
+
+    def _print_entries(self, entries: EntrySelection, title: str):
+        """Render entries as a table"""
+        console.print(self._entries_table(title, self._entry_rows(entries)))
+
+    def _entries_table(self, title: str, rows: Sequence[tuple]) -> Table:
+        """Build the entry table from prepared rows"""
         table = Table(
-            title=f"Log Entries (showing {min(limit, len(self.filtered_entries))} of {len(self.filtered_entries)})",
+            title=title,
             box=box.SIMPLE,
             show_lines=False
         )
 
         table.add_column("#", style="dim", width=6)
+        if self.multi_file:
+            table.add_column("Source", style="dim", width=18, overflow="fold")
         table.add_column("Time", style="cyan", width=12)
         table.add_column("Level", width=7)
         table.add_column("Thread", style="blue", width=25, overflow="fold")
@@ -123,13 +619,21 @@ class LogViewer:
         table.add_column("Status", width=6)
         table.add_column("Message", width=35, overflow="fold")
 
-        for entry in self.filtered_entries[:limit]:
+        for row in rows:
+            table.add_row(*row)
+        return table
+
+    def _entry_rows(self, entries: EntrySelection) -> List[tuple]:
+        """Format entries into table cells"""
+        rows = []
+        store = entries.store
+        for entry_id, entry in zip(entries.id_list(), entries):
             # Truncate long fields
             thread_display = (entry.thread[:22] + "...") if entry.thread and len(entry.thread) > 25 else (entry.thread or "-")
             service_display = (entry.service_name[:17] + "...") if entry.service_name and len(entry.service_name) > 20 else (entry.service_name or "-")
             endpoint_display = (entry.endpoint[:17] + "...") if entry.endpoint and len(entry.endpoint) > 20 else (entry.endpoint or "-")
 
-            msg_text = entry.get_display_message(35) or "-"
+            msg_text = truncate_message(store.display_message(entry_id, entry), 35) or "-"
 
             # Message coloring based on level
             if entry.level in ("ERROR", "FATAL", "CRITICAL"):
@@ -141,8 +645,10 @@ class LogViewer:
             else:
                 msg_style = "white"
 
-            table.add_row(
+            source = [entry.source or "-"] if self.multi_file else []
+            rows.append((
                 str(entry.line_number),
+                *source,
                 entry.timestamp.strftime("%H:%M:%S.%f")[:-3] if entry.timestamp else "-",
                 Text(entry.level or "-", style=entry.get_level_color()),
                 thread_display,
@@ -151,34 +657,22 @@ class LogViewer:
                 endpoint_display,
                 Text(str(entry.status_code) if entry.status_code else "-", style=entry.get_status_color()),
                 Text(msg_text, style=msg_style)
-            )
-
-
-            # table.add_row(
-            #     str(entry.line_number),
-            #     entry.timestamp.strftime("%H:%M:%S.%f")[:-3] if entry.timestamp else "-",
-            #     Text(entry.level or "-", style=entry.get_level_color()),
-            #     thread_display,
-            #     service_display,
-            #     entry.method or "-",
-            #     endpoint_display,
-            #     Text(str(entry.status_code) if entry.status_code else "-", style=entry.get_status_color()),
-            #     entry.get_display_message(35)
-            # )
-
-        console.print(table)
-        console.print()
+            ))
+        return rows
 
     def view_entry_detail(self, line_number: int):
         """View detailed information about a specific entry"""
-        entry = next((e for e in self.entries if e.line_number == line_number), None)
+        entry_id = self.entries.find_line(line_number)
 
-        if not entry:
+        if entry_id is None:
             console.print(f"[red]Entry #{line_number} not found[/red]")
             return
 
+        entry = self.entries.entry(entry_id)
+
+        source = f"[cyan]Source:[/cyan] {entry.source}\n" if entry.source else ""
         panel_content = f"""[cyan]Line Number:[/cyan] {entry.line_number}
-[cyan]Timestamp:[/cyan] {entry.timestamp or 'N/A'}
+{source}[cyan]Timestamp:[/cyan] {entry.timestamp or 'N/A'}
 [cyan]Level:[/cyan] [{entry.get_level_color()}]{entry.level or 'N/A'}[/{entry.get_level_color()}]
 [cyan]Thread:[/cyan] {entry.thread or 'N/A'}
 [cyan]Logger:[/cyan] {entry.logger or 'N/A'}
@@ -203,35 +697,136 @@ class LogViewer:
 
     def filter_logs(self, level: Optional[str] = None, method: Optional[str] = None,
                     status_code: Optional[int] = None, search: Optional[str] = None,
-                    thread: Optional[str] = None, service: Optional[str] = None):
-        """Filter log entries"""
-        self.filtered_entries = self.entries.copy()
-        self.current_filter = {}
+                    thread: Optional[str] = None, service: Optional[str] = None,
+                    time_range: Optional[str] = None):
+        """
+        Filter log entries
+
+        Filters stack: each call narrows the current result, and `undo_filter`
+        steps back to the previous one. Giving a new value for a criterion that
+        is already active replaces it. Results are cached by their normalized
+        criteria, so returning to an earlier combination does not rescan.
+
+        `time_range` is a range such as `10:02:00..10:07:30` or two ISO datetimes
+        (see `parse_time_range`), answered by binary search in the time index.
+        """
+        if time_range:
+            try:
+                parse_time_range(time_range)
+            except ValueError as e:
+                console.print(f"[red]{e}[/red]\n")
+                return
+
+        given = {key: value for key, value in (
+            ('level', level), ('method', method), ('status_code', status_code),
+            ('thread', thread), ('service', service), ('search', search), ('time', time_range),
+        ) if value}
+        combined = {**self.current_filter, **given}
+        cache_key = self._filter_key(combined)
+
+        ids = self._filter_cache.get(cache_key)
+        if ids is not None:
+            self._filter_cache.move_to_end(cache_key)
+        else:
+            if given.keys() & self.current_filter.keys():
+                ids = self._evaluate_filter(combined)
+            else:
+                ids = self._evaluate_filter(given, self.filtered_entries.ids)
+
+            self._filter_cache[cache_key] = ids
+            if len(self._filter_cache) > FILTER_CACHE_SIZE:
+                self._filter_cache.popitem(last=False)
+
+        self.filter_stack.append((self.current_filter, self.filtered_entries))
+        self.current_filter = combined
+        self.filtered_entries = EntrySelection(self.entries, ids)
+        self._print_filter_status()
+
+    def undo_filter(self):
+        """Return to the result of the previous filter step"""
+        if not self.filter_stack:
+            console.print("[yellow]No filter to undo[/yellow]\n")
+            return
+
+        self.current_filter, self.filtered_entries = self.filter_stack.pop()
+        self._print_filter_status()
+
+    def _evaluate_filter(self, filters: Dict[str, Any], ids: Optional[Ids] = None) -> Optional[Ids]:
+        """Return the ids (within `ids`, if given) matching a normalized filter dict"""
+        if any(value for name, value in filters.items() if name != 'search'):
+            self._ensure_columns()
+        store = self.entries
+        dictionaries = store.dictionaries
+        criteria = {}
+
+        # A time window narrows the ids first, so the other criteria only see it
+        if filters.get('time'):
+            start, end = parse_time_range(
+                filters['time'], store.first_timestamp(), store.utc_offset())
+            ids = store.where_time(start, end, ids)
 
+        level = filters.get('level')
         if level:
-            self.filtered_entries = [e for e in self.filtered_entries if e.level and e.level.upper() == level.upper()]
-            self.current_filter['level'] = level
+            criteria['level'] = dictionaries['level'].codes_where(
+                lambda v: str(v).upper() == level.upper())
 
+        method = filters.get('method')
         if method:
-            self.filtered_entries = [e for e in self.filtered_entries if e.method and e.method.upper() == method.upper()]
-            self.current_filter['method'] = method
+            criteria['method'] = dictionaries['method'].codes_where(
+                lambda v: str(v).upper() == method.upper())
 
-        if status_code:
-            self.filtered_entries = [e for e in self.filtered_entries if e.status_code == status_code]
-            self.current_filter['status_code'] = status_code
+        if filters.get('status_code'):
+            criteria['status_code'] = {filters['status_code']}
 
+        thread = filters.get('thread')
         if thread:
-            self.filtered_entries = [e for e in self.filtered_entries if e.thread and thread.lower() in e.thread.lower()]
-            self.current_filter['thread'] = thread
+            criteria['thread'] = dictionaries['thread'].codes_where(
+                lambda v: thread.lower() in v.lower())
 
+        service = filters.get('service')
         if service:
-            self.filtered_entries = [e for e in self.filtered_entries if e.service_name and service.lower() in e.service_name.lower()]
-            self.current_filter['service'] = service
+            criteria['service_name'] = dictionaries['service_name'].codes_where(
+                lambda v: service.lower() in v.lower())
 
-        if search:
-            self.filtered_entries = [e for e in self.filtered_entries if search.lower() in e.raw_line.lower()]
-            self.current_filter['search'] = search
+        # Field criteria are answered from the inverted indexes
+        if criteria:
+            ids = store.select(criteria, ids)
 
+        if filters.get('search'):
+            self._ensure_text_index()
+            ids = store.where_text(filters['search'], ids)
+
+        return ids
+
+    def _ensure_text_index(self):
+        """Build the trigram search index on the first text search"""
+        if not self.search_index or self.entries.text_index is not None:
+            return
+
+        with console.status("[cyan]Building search index...[/cyan]"):
+            index = self.entries.build_text_index()
+
+        if index.overflowed:
+            console.print(
+                "[yellow]Search index exceeded its memory cap; searching without it[/yellow]")
+            self.entries.text_index = None
+            self.search_index = False
+
+    @staticmethod
+    def _filter_key(filters: Dict[str, Any]) -> Tuple:
+        """Normalize filter criteria into a hashable cache key"""
+        key = []
+        for name, value in sorted(filters.items()):
+            if name in ('level', 'method'):
+                value = str(value).upper()
+            elif name in ('thread', 'service', 'search'):
+                value = str(value).lower()
+            elif name == 'time':
+                value = ''.join(str(value).split())
+            key.append((name, value))
+        return tuple(key)
+
+    def _print_filter_status(self):
         filter_msg = " | ".join(f"{k}={v}" for k, v in self.current_filter.items())
         console.print(f"[green]✓ Filtered to {len(self.filtered_entries)} entries[/green]" +
                      (f" [dim]({filter_msg})[/dim]" if filter_msg else ""))
@@ -239,42 +834,245 @@ class LogViewer:
 
     def clear_filters(self):
         """Clear all filters"""
-        self.filtered_entries = self.entries.copy()
+        self.filtered_entries = EntrySelection(self.entries)
         self.current_filter = {}
+        self.filter_stack.clear()
         console.print("[green]✓ Filters cleared[/green]\n")
 
-    def export_filtered(self, output_path: str):
-        """Export filtered entries to a new file"""
+    def follow(self, interval: float = FOLLOW_POLL_INTERVAL, limit: int = DEFAULT_LIST_LIMIT):
+        """
+        Watch the file for appended lines until interrupted (Ctrl+C)
+
+        New lines are parsed into the store as they are written, and the ones
+        matching the active filter are printed.
+        """
+        if self.compression:
+            console.print(f"[yellow]Cannot follow a {self.compression} compressed file[/yellow]\n")
+            return
+        if self.multi_file:
+            console.print("[yellow]Follow works on a single file[/yellow]\n")
+            return
+
+        console.print(f"[cyan]Following {self.file_path} (Ctrl+C to stop)...[/cyan]\n")
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                for entry in self.filtered_entries:
-                    f.write(entry.raw_line + '\n')
+            while True:
+                added = self.poll_appended()
+                if added:
+                    title = f"New Entries (showing {min(limit, len(added))} of {len(added)})"
+                    self._print_entries(added[-limit:], title)
+                else:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        console.print(f"[green]✓ Stopped following; {len(self.filtered_entries)} entries "
+                      f"match[/green]\n")
+
+    def poll_appended(self) -> EntrySelection:
+        """
+        Ingest the lines appended since the last poll
+
+        Entries are added to the store and its indexes, and every step of the
+        filter stack is extended with the new entries it matches; no existing
+        entry is parsed or filtered again, except a last line that had no
+        newline yet when it was loaded: it is parsed again once the rest of it
+        arrives. If the file was rotated or truncated it is loaded again from
+        the start. Returns the new entries that match the active filter.
+        """
+        if self._follower is None:
+            # Where the loaded lines ended when they were read: the file may have grown since
+            end, terminated = self._loaded_end or self.entries.end_offset()
+            self._loaded_end = None
+            last_line = self.entries.line_numbers[-1] if len(self.entries) else 0
+            self._partial_id = None
+            if not terminated:
+                # The last line was loaded before its newline was written:
+                # read it again once it is complete
+                end, last_line = self.entries.offsets[-1], last_line - 1
+                self._partial_id = len(self.entries) - 1
+            self._follower = FileFollower(self.file_path, end, last_line)
+
+        if self._follower.check_reset():
+            console.print(
+                "[yellow]Log file was rotated or truncated; reading it from the start[/yellow]\n")
+            self._reset_entries()
+            self._partial_id = None
+
+        store = self.entries
+        first_id = len(store)
+        completed = None
+        for line_number, offset, text in self._follower.poll():
+            if self._partial_id is not None:
+                # The first complete line is the rest of the partial one
+                partial, self._partial_id = self._partial_id, None
+                if self._complete_line(partial, text):
+                    completed = partial
+            elif text.strip():
+                store.append_line(text, line_number, offset)
+
+        if len(store) == first_id and completed is None:
+            return EntrySelection(store, range(first_id, first_id))
+
+        store.refresh_map()
+        self._filter_cache.clear()
+        self._page_rows.clear()
+        new_ids = range(first_id if completed is None else completed, len(store))
+        extended = set()
+        for filters, selection in self.filter_stack:
+            self._extend_selection(selection, self._evaluate_filter(filters, new_ids), extended)
+
+        matched = self._evaluate_filter(self.current_filter, new_ids)
+        self._extend_selection(self.filtered_entries, matched, extended)
+        return EntrySelection(store, matched)
 
-            console.print(f"[green]✓ Exported {len(self.filtered_entries)} entries to {output_path}[/green]\n")
+    def _complete_line(self, entry_id: int, text: str) -> bool:
+        """
+        Parse a line that was partial when loaded again from its complete text,
+        taking it out of the filter results so it is matched again with the
+        new entries. An edit made in the meantime is kept instead (False).
+        """
+        store = self.entries
+        if entry_id in store.edits:
+            return False
+
+        for _, selection in self.filter_stack:
+            selection.drop_last(entry_id)
+        self.filtered_entries.drop_last(entry_id)
+        store.update(entry_id, text)
+        del store.edits[entry_id]  # The file holds this text now
+        return True
+
+    @staticmethod
+    def _extend_selection(selection: EntrySelection, new_ids: Ids, extended: set):
+        """Append ids to a selection, copying its id array only if it is shared"""
+        selection.extend(new_ids, copy=id(selection.ids) in extended)
+        extended.add(id(selection.ids))
+
+    def _reset_entries(self):
+        """Replace the entries with an empty store for the new file, keeping the filters"""
+        self.entries.close()
+        self.entries = store = EntryStore(self.file_path, sniff_format(self.file_path))
+        self._filter_cache.clear()
+
+        def empty(selection: EntrySelection) -> EntrySelection:
+            return EntrySelection(store, None if selection.ids is None else array('I'))
+
+        self.filter_stack = [(filters, empty(selection))
+                             for filters, selection in self.filter_stack]
+        self.filtered_entries = empty(self.filtered_entries)
+
+    def export_filtered(self, output_path: str, output_format: Optional[str] = None):
+        """
+        Export filtered entries to a new file
+
+        The format (raw text, jsonl, csv or columnar) and compression (.gz,
+        .bz2, .xz) follow the file name unless a format is given.
+        """
+        inferred, compression = export_format(output_path)
+        output_format = output_format or inferred
+        try:
+            if output_format != EXPORT_TEXT:
+                self._ensure_columns()
+            count = write_export(self.entries, output_path, output_format, compression,
+                                 self.filtered_entries.id_list())
+
+            details = output_format + (f", {compression}" if compression else "")
+            console.print(f"[green]✓ Exported {count} entries to {output_path}[/green] "
+                          f"[dim]({details})[/dim]\n")
         except Exception as e:
             console.print(f"[red]Error exporting: {e}[/red]\n")
 
     def edit_entry(self, line_number: int, new_content: str):
         """Edit a specific log entry"""
-        entry = next((e for e in self.entries if e.line_number == line_number), None)
+        entry_id = self.entries.find_line(line_number)
 
-        if not entry:
+        if entry_id is None:
             console.print(f"[red]Entry #{line_number} not found[/red]")
             return
 
-        entry.raw_line = new_content
-        entry._parse()
+        store = self.entries
+        old_codes = store.entry_codes(entry_id) if store.columns_loaded else None
+        store.update(entry_id, new_content)
+        self._filter_cache.clear()
+        self._page_rows.clear()
+
+        if old_codes is not None:
+            new_codes = store.entry_codes(entry_id)
+            for _, selection in self.filter_stack:
+                selection.recount(entry_id, old_codes, new_codes)
+            self.filtered_entries.recount(entry_id, old_codes, new_codes)
         console.print(f"[green]✓ Entry #{line_number} updated[/green]\n")
 
     def save(self, output_path: Optional[str] = None):
-        """Save modified logs to file"""
-        save_path = output_path or self.file_path
+        """
+        Save modified logs to file
+
+        The output goes to a temporary file that replaces the target at the
+        end. For a plain source, only the edited lines are written: the bytes
+        between them are copied from the source by the kernel (see
+        src.utils.splice), so unchanged lines stay byte-for-byte and nothing
+        is parsed. Compressed and merged sources are rewritten line by line,
+        and saving over a compressed source compresses the output the same way.
+        """
+        if self.multi_file and (not output_path or Path(output_path).resolve()
+                                in {path.resolve() for path in self.file_paths}):
+            console.print("[red]Several files are loaded: save to a new file (save <file>)[/red]\n")
+            return
+
+        save_path = Path(output_path) if output_path else self.file_path
+        tmp_path = save_path.with_name(save_path.name + '.tmp')
+        store = self.entries
+        over_source = save_path.resolve() == self.file_path.resolve()
+        compression = self.compression if over_source else None
+        if over_source and not store.edits:
+            console.print("[dim]No changes to save[/dim]\n")
+            return
+        splice = not self.multi_file and not self.compression
+        edited = len(store.edits)
 
         try:
-            with open(save_path, 'w', encoding='utf-8') as f:
-                for entry in sorted(self.entries, key=lambda e: e.line_number):
-                    f.write(entry.raw_line + '\n')
+            if splice:
+                replacements = [(store.offsets[entry_id], text)
+                                for entry_id, text in sorted(store.edits.items())]
+                with open(self.file_path, 'rb') as src, open(tmp_path, 'wb', buffering=0) as f:
+                    changes = splice_lines(src, f, replacements, os.fstat(src.fileno()).st_size)
+                    os.fsync(f.fileno())
+            else:
+                offsets = array('q')
+                position = 0
+                with (open_compressed(tmp_path, compression, 'wb') if compression
+                      else open(tmp_path, 'wb')) as f:
+                    for _, raw_line in store.iter_raw_lines():
+                        data = (raw_line.strip() + '\n').encode('utf-8')
+                        f.write(data)
+                        offsets.append(position)
+                        position += len(data)
+
+            if over_source:
+                shutil.copymode(save_path, tmp_path)
+            store.close()
+            os.replace(tmp_path, save_path)
+
+            if over_source:
+                # The source file now holds the edited lines at new offsets
+                if splice:
+                    store.shift_offsets(changes)
+                else:
+                    store.offsets = offsets
+                store.edits.clear()
+                if self._follower is not None:
+                    # Resume following from the new end of the last line
+                    self._follower.close()
+                    self._follower = None
+                if compression:
+                    store.compressed = CompressedSource(save_path, compression)
+            if self.use_mmap and splice:
+                store.map_source()
 
-            console.print(f"[green]✓ Saved to {save_path}[/green]\n")
+            details = ""
+            if splice:
+                details = f" [dim]({edited} edited line{'s' if edited != 1 else ''})[/dim]"
+            console.print(f"[green]✓ Saved to {save_path}[/green]{details}\n")
         except Exception as e:
-            console.print(f"[red]Error saving: {e}[/red]\n")
\ No newline at end of file
+            if tmp_path.exists():
+                tmp_path.unlink()
+            console.print(f"[red]Error saving: {e}[/red]\n")
@@ -0,0 +1,849 @@
+"""
+Entry Store
+Columnar, array-backed storage for parsed log entries
+
+Instead of keeping one LogEntry object per line, the store keeps every field
+in its own typed array:
+
+- level / method / thread / service / endpoint / operation are dictionary
+  encoded (one small integer code per line, each distinct value stored once)
+- status codes are int16, response times float32
+- timestamps are int64 epoch microseconds
+- line numbers and byte offsets locate the raw line in the source file
+
+Filterable fields also get an inverted index (value -> posting list of entry
+ids), maintained as entries are appended or edited.
+
+Full LogEntry objects are rebuilt on demand, from the raw line, only for the
+rows that are actually displayed.
+"""
+
+import math
+import mmap
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union,
+)
+
+from src.config import SEQUENTIAL_SCAN_RATIO, PROGRESS_UPDATE_LINES
+from src.models.indexes import PostingIndex, TimeIndex, intersect_sorted, restrict
+from src.models.lifecycle import PairKey, RequestPairs
+from src.models.log_entry import LogEntry, LogFormat
+from src.models.sketch import QuantileSketch
+from src.models.timestamps import NO_TIMESTAMP, to_epoch_micros
+from src.models.trigram import TrigramIndex
+from src.utils.compression import CompressedSource
+from src.utils.reader import decode_line, index_lines, iter_lines
+
+# Sentinel for a missing status (NO_TIMESTAMP comes from the timestamps module)
+NO_STATUS = 0
+
+# Dictionary-encoded fields (LogEntry attribute names)
+CODED_FIELDS = ('level', 'method', 'thread', 'service_name', 'endpoint', 'operation_type')
+
+# Fields with an inverted index (filter criteria)
+INDEXED_FIELDS = ('level', 'method', 'status_code', 'thread', 'service_name')
+
+# Fields counted by the summary
+SUMMARY_FIELDS = ('level', 'method', 'status_code', 'thread', 'service_name')
+
+# Fields with a response-time sketch per value (latency percentiles)
+LATENCY_FIELDS = ('endpoint', 'service_name', 'method')
+
+Ids = Union[range, Sequence[int]]
+
+
+def _status_value(status: Any) -> int:
+    # Only integer codes are stored; other JSON values count as missing
+    if isinstance(status, int) and not isinstance(status, bool) and -32768 <= status <= 32767:
+        return status
+    return NO_STATUS
+
+
+def _float_value(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return math.nan
+
+
+def _as_window(ids: Ids) -> Optional[range]:
+    """The ids as a range if they are consecutive, else None"""
+    if isinstance(ids, range):
+        return ids if ids.step == 1 else None
+    if len(ids) and ids[-1] - ids[0] + 1 == len(ids):
+        return range(ids[0], ids[-1] + 1)
+    return None
+
+
+class ValueDictionary:
+    """Maps the distinct values of a field to integer codes; code 0 means 'no value'"""
+
+    def __init__(self):
+        self.values: List[Any] = [None]
+        self._codes: Dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: Any) -> int:
+        if not value:
+            return 0
+
+        try:
+            code = self._codes.get(value)
+        except TypeError:
+            # Unhashable JSON value (list / dict)
+            value = str(value)
+            code = self._codes.get(value)
+
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> Any:
+        return self.values[code]
+
+    def codes_where(self, predicate: Callable[[Any], bool]) -> Set[int]:
+        """Return the codes of all values matching a predicate"""
+        return {code for code, value in enumerate(self.values) if code and predicate(value)}
+
+
+class EntryStore:
+    """Columnar storage for the parsed entries of one log file"""
+
+    def __init__(self, source: Optional[Union[str, Path]] = None,
+                 log_format: Optional[LogFormat] = None):
+        self.source = Path(source) if source else None
+        self.log_format = log_format
+
+        self.line_numbers = array('q')
+        self.offsets = array('q')
+        self.timestamps = array('q')
+        self.status_codes = array('h')
+        self.response_times = array('f')
+        self.dictionaries: Dict[str, ValueDictionary] = {
+            name: ValueDictionary() for name in CODED_FIELDS}
+        self.codes: Dict[str, array] = {name: array('I') for name in CODED_FIELDS}
+        self.indexes: Dict[str, PostingIndex] = {name: PostingIndex() for name in INDEXED_FIELDS}
+        self.text_index: Optional[TrigramIndex] = None
+        # Timestamp order for time-range filters; None when it has to be rebuilt from the column
+        self.time_index: Optional[TimeIndex] = TimeIndex()
+
+        # Response-time sketches per field and code, updated as entries are
+        # added; None when they have to be rebuilt from the columns
+        self.latency: Optional[Dict[str, Dict[int, QuantileSketch]]] = {
+            name: {} for name in LATENCY_FIELDS}
+
+        # START / STOP pairs, built as entries are added; None when they have
+        # to be rebuilt from the columns
+        self.requests: Optional[RequestPairs] = RequestPairs()
+
+        # Cleaned display messages, filled in as entries are displayed:
+        # 0 = not computed yet, otherwise 1 + the message's dictionary code
+        self.display_codes = array('I')
+        self.display_messages = ValueDictionary()
+
+        # False while only line offsets are known (see index_source)
+        self.columns_loaded = True
+
+        # Raw lines changed by edit_entry, by entry id
+        self.edits: Dict[int, str] = {}
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+        # Set when the source is compressed: offsets are then decompressed offsets
+        self.compressed: Optional[CompressedSource] = None
+
+        # Set on a store merged from several files (see src.models.merge):
+        # readers for each file, and each entry's file and line in it
+        self.sources: List['EntryStore'] = []
+        self.source_ids = array('H')
+        self.source_lines = array('q')
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_file'] = None
+        state['_map'] = None
+        state['compressed'] = None
+        state['time_index'] = None  # Rebuilt by the receiving store from the timestamps
+        return state
+
+    # ======================================================
+    # Building
+    # ======================================================
+    def append(self, entry: LogEntry, offset: int) -> int:
+        """Add a parsed entry and return its id"""
+        entry_id = len(self.line_numbers)
+        self.line_numbers.append(entry.line_number)
+        self.offsets.append(offset)
+        self._append_columns(entry_id, entry)
+        return entry_id
+
+    def append_line(self, text: str, line_number: int, offset: int) -> int:
+        """
+        Add an entry from its raw text (e.g. a line appended to a followed file).
+
+        The line is parsed into the columns unless they have not been loaded
+        yet, and added to the text index if there is one.
+        """
+        if self.columns_loaded:
+            entry_id = self.append(LogEntry(text, line_number, self.log_format), offset)
+        else:
+            entry_id = len(self.line_numbers)
+            self.line_numbers.append(line_number)
+            self.offsets.append(offset)
+
+        if self.text_index is not None:
+            self.text_index.add(entry_id, text.strip())
+        return entry_id
+
+    def end_offset(self) -> Tuple[int, bool]:
+        """
+        Return the byte offset just past the last stored line, and whether that
+        line ends with a newline (so lines written later start exactly there).
+        """
+        if not len(self):
+            return 0, True
+
+        if self.compressed is not None:
+            last = next(self.compressed.read_lines([self.offsets[-1]]))
+        else:
+            with open(self.source, 'rb') as f:
+                f.seek(self.offsets[-1])
+                last = f.readline()
+        return self.offsets[-1] + len(last), last.endswith(b'\n')
+
+    def shift_offsets(self, changes: Sequence[Tuple[int, int]]):
+        """
+        Move the offsets of the lines after each (offset, size change), as
+        returned by `splice_lines` after rewriting some lines of the source
+        """
+        offsets = self.offsets
+        bounds = [bisect_right(offsets, offset) for offset, _ in changes] + [len(offsets)]
+        shift = 0
+        for (_, change), start, end in zip(changes, bounds, bounds[1:]):
+            shift += change
+            if shift and start < end:
+                offsets[start:end] = array('q', [offset + shift for offset in offsets[start:end]])
+
+    def index_source(self):
+        """
+        Memory-map the source file and record only where its lines start.
+
+        No line is decoded or parsed: raw lines are sliced from the map when
+        they are read, and the parsed columns stay empty until `load_columns`.
+        """
+        if self.map_source():
+            self.line_numbers, self.offsets = index_lines(self._map)
+        self.columns_loaded = not len(self.line_numbers)
+
+    def refresh_map(self):
+        """Remap the source file after it has grown"""
+        if self._map is not None:
+            self.map_source()
+
+    def map_source(self) -> bool:
+        """Read raw lines from a memory map of the source file (False if it is empty)"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+        f = self._open()
+        if os.fstat(f.fileno()).st_size:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map is not None
+
+    def load_columns(self, on_progress: Optional[Callable[[int], None]] = None):
+        """Parse every entry into the columns of a store built by `index_source`"""
+        for entry_id, raw_line in self.iter_raw_lines():
+            self._append_columns(entry_id, self.make_entry(entry_id, raw_line))
+            if on_progress is not None and entry_id % PROGRESS_UPDATE_LINES == 0:
+                on_progress(entry_id)
+        self.columns_loaded = True
+
+    def _append_columns(self, entry_id: int, entry: LogEntry):
+        status = _status_value(entry.status_code)
+        timestamp = to_epoch_micros(entry.timestamp)
+        self.timestamps.append(timestamp)
+        if self.time_index is not None:
+            self.time_index.add(None if timestamp == NO_TIMESTAMP else timestamp)
+        self.status_codes.append(status)
+        self.response_times.append(_float_value(entry.response_time))
+        self.indexes['status_code'].add(status, entry_id)
+
+        indexes = self.indexes
+        for name in CODED_FIELDS:
+            code = self.dictionaries[name].encode(getattr(entry, name))
+            self.codes[name].append(code)
+            if name in indexes:
+                indexes[name].add(code, entry_id)
+
+        if self.latency is not None:
+            self._add_latency(entry_id)
+        if self.requests is not None:
+            self._pair_request(entry_id)
+
+    def _pair_request(self, entry_id: int):
+        """Feed a START / STOP line to the request pairs"""
+        operation = self.codes['operation_type'][entry_id]
+        if operation:
+            operation_type = self.dictionaries['operation_type'].values[operation]
+            self.requests.add(entry_id, self._pair_key(entry_id), operation_type, self.timestamps)
+
+    def _pair_key(self, entry_id: int) -> PairKey:
+        source = self.source_ids[entry_id] if self.source_ids else 0
+        return source, self.codes['thread'][entry_id], self.codes['endpoint'][entry_id]
+
+    def _add_latency(self, entry_id: int, remove: bool = False):
+        """Add (or remove) an entry's response time to the sketches of its field values"""
+        response_time = self.response_times[entry_id]
+        if not response_time >= 0:
+            return
+        for name in LATENCY_FIELDS:
+            sketches = self.latency[name]
+            code = self.codes[name][entry_id]
+            sketch = sketches.get(code)
+            if sketch is None:
+                sketch = sketches[code] = QuantileSketch()
+            if remove:
+                sketch.remove(response_time)
+            else:
+                sketch.add(response_time)
+
+    def extend(self, other: 'EntryStore', line_offset: int = 0, byte_offset: int = 0):
+        """
+        Append all entries of another store, shifting its line numbers by
+        `line_offset` and its byte offsets by `byte_offset`
+        """
+        id_offset = len(self)
+        self.indexes['status_code'].extend(other.indexes['status_code'], id_offset)
+
+        self.line_numbers.extend(n + line_offset for n in other.line_numbers)
+        self.offsets.extend(n + byte_offset for n in other.offsets)
+        self.timestamps.extend(other.timestamps)
+        if self.time_index is not None:
+            add = self.time_index.add
+            for timestamp in other.timestamps:
+                add(None if timestamp == NO_TIMESTAMP else timestamp)
+        self.status_codes.extend(other.status_codes)
+        self.response_times.extend(other.response_times)
+
+        remaps = {}
+        for name in CODED_FIELDS:
+            encode = self.dictionaries[name].encode
+            remap = remaps[name] = [encode(value) for value in other.dictionaries[name].values]
+            self.codes[name].extend(map(remap.__getitem__, other.codes[name]))
+            if name in self.indexes:
+                self.indexes[name].extend(other.indexes[name], id_offset, remap)
+            if self.latency is not None and other.latency is not None and name in LATENCY_FIELDS:
+                self.merge_latency(name, other.latency[name], remap)
+
+        if other.latency is None:
+            self.latency = None
+
+        if self.requests is not None and other.requests is not None:
+            threads, endpoints = remaps['thread'], remaps['endpoint']
+            key_remap = {key: (key[0], threads[key[1]], endpoints[key[2]])
+                         for key in other.requests.keys}
+            self.requests.extend(other.requests, id_offset, key_remap, self.timestamps)
+        else:
+            self.requests = None
+
+    def merge_latency(self, field: str, sketches: Dict[int, QuantileSketch], remap: Sequence[int]):
+        """Merge another store's sketches for a field, translating its codes"""
+        own = self.latency[field]
+        for code, sketch in sketches.items():
+            target = own.get(remap[code])
+            if target is None:
+                target = own[remap[code]] = QuantileSketch()
+            target.merge(sketch)
+
+    def update(self, entry_id: int, raw_line: str) -> LogEntry:
+        """Replace the raw line of an entry and re-derive its columns"""
+        self.edits[entry_id] = raw_line
+        entry = self.entry(entry_id)
+        if self.text_index is not None:
+            self.text_index.insert(entry_id, entry.raw_line)
+        if entry_id < len(self.display_codes):
+            self.display_codes[entry_id] = 0
+        if not self.columns_loaded:
+            return entry
+
+        if self.latency is not None:
+            self._add_latency(entry_id, remove=True)
+        was_lifecycle = self.codes['operation_type'][entry_id]
+
+        status = _status_value(entry.status_code)
+        self.indexes['status_code'].move(entry_id, self.status_codes[entry_id], status)
+        timestamp = to_epoch_micros(entry.timestamp)
+        self.timestamps[entry_id] = timestamp
+        if self.time_index is not None:
+            self.time_index.set(entry_id, None if timestamp == NO_TIMESTAMP else timestamp)
+        self.status_codes[entry_id] = status
+        self.response_times[entry_id] = _float_value(entry.response_time)
+
+        for name in CODED_FIELDS:
+            code = self.dictionaries[name].encode(getattr(entry, name))
+            if name in self.indexes:
+                self.indexes[name].move(entry_id, self.codes[name][entry_id], code)
+            self.codes[name][entry_id] = code
+
+        if self.latency is not None:
+            self._add_latency(entry_id)
+        if was_lifecycle or self.codes['operation_type'][entry_id]:
+            self.requests = None  # A lifecycle line changed: pair again on the next query
+        return entry
+
+    # ======================================================
+    # Access
+    # ======================================================
+    def __len__(self) -> int:
+        return len(self.line_numbers)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return EntrySelection(self, range(len(self))[index])
+        return self.entry(range(len(self))[index])
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return iter(EntrySelection(self))
+
+    def entry(self, entry_id: int) -> LogEntry:
+        """Build a LogEntry view of one stored entry"""
+        return self.make_entry(entry_id, self.raw_line(entry_id))
+
+    def make_entry(self, entry_id: int, raw_line: str) -> LogEntry:
+        if not self.sources:
+            return LogEntry(raw_line, self.line_numbers[entry_id], self.log_format)
+
+        source = self.sources[self.source_ids[entry_id]]
+        label = f"{source.source.name}:{self.source_lines[entry_id]}"
+        return LogEntry(raw_line, self.line_numbers[entry_id], source.log_format, label)
+
+    def display_message(self, entry_id: int, entry: Optional[LogEntry] = None) -> str:
+        """
+        Return an entry's cleaned display message (see LogEntry.display_message).
+
+        Messages are computed the first time an entry is displayed and kept
+        in a dictionary-encoded column, so showing the entry again (after a
+        filter, `clear` or another `list`) does not clean its message again.
+        The column grows as needed and `update` resets the edited entry.
+        """
+        codes = self.display_codes
+        if entry_id >= len(codes):
+            codes.frombytes(bytes(codes.itemsize * (len(self) - len(codes))))
+        code = codes[entry_id]
+        if code:
+            return self.display_messages.decode(code - 1) or ''
+
+        if entry is None:
+            entry = self.entry(entry_id)
+        message = entry.display_message
+        codes[entry_id] = self.display_messages.encode(message) + 1
+        return message
+
+    def find_line(self, line_number: int) -> Optional[int]:
+        """
+        Return the id of the entry on a given line, if any.
+
+        Line numbers ascend with ids and only blank lines are skipped, so the
+        id of the entry on line n lies within (blank lines) of n - first line.
+        Without blank lines this is a single probe.
+        """
+        line_numbers = self.line_numbers
+        count = len(line_numbers)
+        if not count or not line_numbers[0] <= line_number <= line_numbers[-1]:
+            return None
+
+        first = line_numbers[0]
+        skipped = line_numbers[-1] - first + 1 - count
+        hi = min(line_number - first, count - 1)
+        lo = max(line_number - first - skipped, 0)
+        if line_numbers[hi] == line_number:
+            return hi
+        entry_id = bisect_left(line_numbers, line_number, lo, hi)
+        return entry_id if line_numbers[entry_id] == line_number else None
+
+    def line_range(self, first: int, last: int) -> range:
+        """Return the ids of the entries on lines first..last (inclusive)"""
+        return range(bisect_left(self.line_numbers, first), bisect_right(self.line_numbers, last))
+
+    def raw_line(self, entry_id: int) -> str:
+        """Return the raw text of an entry, read back from the source file"""
+        edited = self.edits.get(entry_id)
+        if edited is not None:
+            return edited
+
+        source = self.sources[self.source_ids[entry_id]] if self.sources else self
+        return source.read_line(self.offsets[entry_id])
+
+    def read_line(self, offset: int) -> str:
+        """Return the line starting at a byte offset of the source file"""
+        if self.compressed is not None:
+            return decode_line(next(self.compressed.read_lines([offset])))
+        if self._map is not None:
+            end = self._map.find(b'\n', offset)
+            return decode_line(self._map[offset:end if end >= 0 else len(self._map)])
+
+        f = self._open()
+        f.seek(offset)
+        return decode_line(f.readline())
+
+    def read_lines(self, offsets: Iterable[int], sequential: bool = False) -> Iterator[str]:
+        """
+        Yield the line starting at each of the ascending byte offsets.
+
+        With `sequential`, a plain file is read in one pass from the first
+        offset instead of seeking to every line. Compressed sources are
+        decompressed forward, resuming at the nearest checkpoint before each
+        wanted line.
+        """
+        if self.compressed is not None:
+            yield from map(decode_line, self.compressed.read_lines(offsets))
+            return
+
+        if self._map is not None or not sequential:
+            yield from map(self.read_line, offsets)
+            return
+
+        offsets = iter(offsets)
+        wanted = next(offsets, None)
+        if wanted is None:
+            return
+        for _, offset, text in iter_lines(self.source, start=wanted):
+            if offset == wanted:
+                yield text
+                wanted = next(offsets, None)
+                if wanted is None:
+                    return
+
+    def iter_raw_lines(self, ids: Optional[Ids] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (entry_id, raw_line) for ascending entry ids.
+
+        Large selections are served by one sequential pass over the file;
+        small ones, and all reads from a memory map, go to each line directly.
+        A merged store reads every source file forward in the same way and
+        interleaves their lines.
+        """
+        if ids is None:
+            ids = range(len(self))
+        if not len(ids):
+            return
+
+        offsets = self.offsets
+        sequential = len(ids) * SEQUENTIAL_SCAN_RATIO >= len(self)
+        if self.sources:
+            source_ids = self.source_ids
+
+            def source_offsets(n: int) -> Iterator[int]:
+                return (offsets[i] for i in ids if source_ids[i] == n)
+
+            streams = [source.read_lines(source_offsets(n), sequential)
+                       for n, source in enumerate(self.sources)]
+            lines = (next(streams[source_ids[i]]) for i in ids)
+        else:
+            lines = self.read_lines((offsets[i] for i in ids), sequential)
+
+        edits = self.edits
+        for entry_id, text in zip(ids, lines):
+            yield entry_id, edits.get(entry_id, text)
+
+    def close(self):
+        for source in self.sources:
+            source.close()
+        if self.compressed is not None:
+            self.compressed.close()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.source, 'rb')
+        return self._file
+
+    # ======================================================
+    # Column queries
+    # ======================================================
+    def column(self, field: str) -> array:
+        """Return the code (or status) column of a field"""
+        return self.status_codes if field == 'status_code' else self.codes[field]
+
+    def where(self, field: str, keys: Set[int], ids: Optional[Ids] = None) -> array:
+        """Return the ids whose code (or status) for `field` is one of `keys`"""
+        if ids is None:
+            return self.indexes[field].lookup(keys)
+
+        column = self.column(field)
+        if len(keys) == 1:
+            key = next(iter(keys))
+            return array('I', [i for i in ids if column[i] == key])
+        return array('I', [i for i in ids if column[i] in keys])
+
+    def select(self, criteria: Dict[str, Set[int]], ids: Optional[Ids] = None) -> array:
+        """
+        Return the ids matching every criterion ({field: allowed keys}).
+
+        The most selective criterion is answered from its posting lists; the
+        remaining ones are checked on the columns for those candidates only,
+        so the cost follows the smallest posting list, not the file size.
+        """
+        if not criteria:
+            return array('I', self.id_range() if ids is None else ids)
+
+        ordered = sorted(criteria.items(), key=lambda item: self.indexes[item[0]].total(item[1]))
+        field, keys = ordered[0]
+
+        if isinstance(ids, range):
+            # A contiguous window (e.g. a time range): slice the posting lists to it
+            result = self.indexes[field].lookup(keys, ids)
+            ordered = ordered[1:]
+        elif ids is None or self.indexes[field].total(keys) < len(ids):
+            result = self.where(field, keys)
+            if ids is not None:
+                result = intersect_sorted(result, ids)
+            ordered = ordered[1:]
+        else:
+            result = ids
+
+        for field, keys in ordered:
+            if not result:
+                break
+            result = self.where(field, keys, result)
+
+        return result if isinstance(result, array) else array('I', result)
+
+    def id_range(self) -> range:
+        return range(len(self))
+
+    def where_time(self, start: int, end: int, ids: Optional[Ids] = None) -> Ids:
+        """
+        Return the ids timestamped within [start, end] (epoch microseconds).
+
+        Lines without a timestamp count at the time of the line before them.
+        The window is found by binary search in the time index (rebuilt from
+        the timestamp column once if needed) and intersected with `ids`.
+        """
+        if self.time_index is None:
+            index = TimeIndex()
+            for timestamp in self.timestamps:
+                index.add(None if timestamp == NO_TIMESTAMP else timestamp)
+            self.time_index = index
+
+        window = self.time_index.lookup(start, end)
+        return window if ids is None else restrict(ids, window)
+
+    def first_timestamp(self) -> Optional[int]:
+        """Return the first timestamp of the file, if any line has one"""
+        return next((timestamp for timestamp in self.timestamps if timestamp != NO_TIMESTAMP), None)
+
+    def utc_offset(self) -> Optional[timedelta]:
+        """Return the UTC offset of the first timestamp (None if it is naive), from its raw line"""
+        for entry_id, timestamp in enumerate(self.timestamps):
+            if timestamp != NO_TIMESTAMP:
+                return self.entry(entry_id).timestamp.utcoffset()
+        return None
+
+    def build_text_index(self, **options) -> TrigramIndex:
+        """Build the trigram index used by `where_text` over every raw line"""
+        index = TrigramIndex(**options)
+        for entry_id, raw_line in self.iter_raw_lines():
+            index.add(entry_id, raw_line.strip())
+            if index.overflowed:
+                break
+        index.flush()
+
+        self.text_index = index
+        return index
+
+    def where_text(self, text: str, ids: Optional[Ids] = None) -> array:
+        """
+        Return the ids whose raw line contains `text` (case-insensitive).
+
+        With a text index only its candidates are read back and checked.
+        """
+        if self.text_index is not None:
+            candidates = self.text_index.candidates(text, len(self))
+            if candidates is not None:
+                if ids is not None:
+                    small, large = ((candidates, ids) if len(candidates) <= len(ids)
+                                    else (ids, candidates))
+                    candidates = intersect_sorted(small, large)
+                ids = candidates
+
+        needle = text.lower()
+        return array('I', [i for i, raw in self.iter_raw_lines(ids)
+                           if needle in raw.strip().lower()])
+
+    def count_codes(self, field: str, ids: Optional[Ids] = None) -> Counter:
+        """
+        Count entries per code (or status) of a field, leaving out missing values.
+
+        For an indexed field, all entries or a run of consecutive ids (a time
+        window, the lines appended while following) are counted from the
+        posting lists, which loading, appends and edits keep current: two
+        binary searches per value and nothing scanned. Other selections are
+        counted from the column, since intersecting them with every posting
+        list would probe at least as many ids as the selection holds.
+        """
+        if field in self.indexes:
+            if ids is None:
+                return Counter(self.indexes[field].counts())
+            window = _as_window(ids)
+            if window is not None:
+                return Counter(self.indexes[field].counts(window))
+
+        column = self.column(field)
+        counts = Counter(column) if ids is None else Counter(map(column.__getitem__, ids))
+        counts.pop(0, None)
+        return counts
+
+    def decode_counts(self, field: str, counts: Dict[int, int]) -> Dict[Any, int]:
+        """Turn per-code counts into per-value counts"""
+        if field == 'status_code':
+            return {status: count for status, count in counts.items() if count}
+        decode = self.dictionaries[field].decode
+        return {decode(code): count for code, count in counts.items() if count}
+
+    def entry_codes(self, entry_id: int, fields: Sequence[str] = SUMMARY_FIELDS) -> Dict[str, int]:
+        return {field: self.column(field)[entry_id] for field in fields}
+
+    def count_values(self, field: str, ids: Optional[Ids] = None) -> Dict[Any, int]:
+        """Count entries per value of a dictionary-encoded field"""
+        return self.decode_counts(field, self.count_codes(field, ids))
+
+    def count_status_codes(self, ids: Optional[Ids] = None) -> Dict[int, int]:
+        return self.decode_counts('status_code', self.count_codes('status_code', ids))
+
+    def latency_sketches(self, field: str, ids: Optional[Ids] = None) -> Dict[int, QuantileSketch]:
+        """
+        Return response-time sketches by code of `field` (one of LATENCY_FIELDS).
+
+        All entries are answered by the sketches kept during loading (rebuilt
+        from the columns once if the store came from the index cache); a
+        selection is sketched from the columns in one pass.
+        """
+        if ids is None:
+            if self.latency is None:
+                self.latency = {name: {} for name in LATENCY_FIELDS}
+                for entry_id in range(len(self)):
+                    self._add_latency(entry_id)
+            return self.latency[field]
+
+        sketches: Dict[int, QuantileSketch] = {}
+        codes = self.codes[field]
+        response_times = self.response_times
+        for entry_id in ids:
+            response_time = response_times[entry_id]
+            if response_time >= 0:
+                sketch = sketches.get(codes[entry_id])
+                if sketch is None:
+                    sketch = sketches[codes[entry_id]] = QuantileSketch()
+                sketch.add(response_time)
+        return sketches
+
+    def request_pairs(self) -> RequestPairs:
+        """Return the START / STOP pairs, pairing the columns once if they were dropped"""
+        if self.requests is None:
+            self.requests = RequestPairs()
+            for entry_id in range(len(self)):
+                self._pair_request(entry_id)
+        return self.requests
+
+
+class EntrySelection(Sequence):
+    """
+    An ordered subset of a store's entries (e.g. a filter result).
+
+    Behaves like a read-only list of LogEntry views; `ids` is None for
+    "every entry", which keeps following the store as it grows.
+    """
+
+    def __init__(self, store: EntryStore, ids: Optional[Ids] = None):
+        self.store = store
+        self.ids = ids
+        # Per-field code counts of `ids`, kept current by extend and recount
+        self._counts: Dict[str, Counter] = {}
+
+    def id_list(self) -> Ids:
+        return range(len(self.store)) if self.ids is None else self.ids
+
+    def __len__(self) -> int:
+        return len(self.store) if self.ids is None else len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return EntrySelection(self.store, self.id_list()[index])
+        return self.store.entry(self.id_list()[index])
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        make_entry = self.store.make_entry
+        for entry_id, raw_line in self.store.iter_raw_lines(self.id_list()):
+            yield make_entry(entry_id, raw_line)
+
+    def count_codes(self, field: str) -> Counter:
+        """Per-code counts of a field over the selection (computed once, then maintained)"""
+        if self.ids is None:
+            return self.store.count_codes(field)
+
+        counts = self._counts.get(field)
+        if counts is None:
+            counts = self._counts[field] = self.store.count_codes(field, self.ids)
+        return counts
+
+    def count_values(self, field: str) -> Dict[Any, int]:
+        return self.store.decode_counts(field, self.count_codes(field))
+
+    def extend(self, new_ids: Ids, copy: bool = False):
+        """Append ascending ids past the current ones, updating the cached counts"""
+        if self.ids is None:
+            return  # Already follows the store as it grows
+
+        if copy or not isinstance(self.ids, array):
+            self.ids = array('I', self.ids)
+        self.ids.extend(new_ids)
+        for field, counts in self._counts.items():
+            counts.update(self.store.count_codes(field, new_ids))
+
+    def drop_last(self, entry_id: int):
+        """Remove `entry_id` if it is the last id, updating the cached counts"""
+        ids = self.ids
+        if ids is None or not len(ids) or ids[-1] != entry_id:
+            return
+
+        # A new array: the old one may be shared with other selections
+        self.ids = array('I', ids[:-1])
+        for field, counts in self._counts.items():
+            code = self.store.column(field)[entry_id]
+            if code:
+                counts[code] -= 1
+
+    def recount(self, entry_id: int, old_codes: Dict[str, int], new_codes: Dict[str, int]):
+        """Move an edited entry's cached counts from its old codes to its new ones"""
+        if not self._counts or not self._contains(entry_id):
+            return
+
+        for field, counts in self._counts.items():
+            old, new = old_codes[field], new_codes[field]
+            if old != new:
+                if old:
+                    counts[old] -= 1
+                if new:
+                    counts[new] += 1
+
+    def _contains(self, entry_id: int) -> bool:
+        ids = self.ids
+        if isinstance(ids, range):
+            return entry_id in ids
+        i = bisect_left(ids, entry_id)
+        return i < len(ids) and ids[i] == entry_id
@@ -0,0 +1,174 @@
+"""
+Index Cache
+Sidecar file (`<log>.lvidx`) holding the parsed columns and indexes of a log
+"""
+
+import hashlib
+import json
+import os
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from src.config import INDEX_CACHE_SUFFIX, INDEX_CACHE_HASH_BYTES
+from src.models.entry_store import CODED_FIELDS, EntryStore, ValueDictionary
+from src.models.log_entry import LogFormat
+
+CACHE_MAGIC = b'LVIDX\x01'
+CACHE_VERSION = 1
+
+_COLUMNS = ('line_numbers', 'offsets', 'timestamps', 'status_codes', 'response_times')
+
+
+class CachedIndex(NamedTuple):
+    """A store restored from the cache, and where parsing should resume"""
+    store: EntryStore
+    tail_start: int  # Byte offset of the first line not in the store
+    line_count: int  # Lines before tail_start
+
+
+def cache_path(source: Union[str, Path]) -> Path:
+    source = Path(source)
+    return source.with_name(source.name + INDEX_CACHE_SUFFIX)
+
+
+def write_index(store: EntryStore, path: Optional[Path] = None) -> Path:
+    """
+    Write a store to its sidecar cache.
+
+    The file is a magic string, a JSON header (key, dictionaries, array
+    layout) and the raw bytes of every column and posting list. It is written
+    to a temporary file and swapped in, so readers never see a partial cache.
+    """
+    if store.edits or not store.columns_loaded:
+        raise ValueError("only an unedited, fully parsed store can be cached")
+
+    source = store.source
+    path = path or cache_path(source)
+    stat = source.stat()
+    covered, terminated = store.end_offset()
+
+    arrays: List[Tuple[str, array]] = [(name, getattr(store, name)) for name in _COLUMNS]
+    arrays += [(f'codes/{name}', store.codes[name]) for name in CODED_FIELDS]
+    for field, index in store.indexes.items():
+        arrays += [(f'index/{field}/{key}', posting) for key, posting in index.postings.items()]
+
+    header = {
+        'version': CACHE_VERSION,
+        'byteorder': sys.byteorder,
+        'file_size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'covered': covered,
+        'terminated': terminated,
+        'line_count': store.line_numbers[-1] if len(store) else 0,
+        'digest': _digest(source, covered),
+        'format': store.log_format.kind if store.log_format else None,
+        'dictionaries': {name: store.dictionaries[name].values[1:] for name in CODED_FIELDS},
+        'arrays': [(name, data.typecode, data.itemsize, len(data)) for name, data in arrays],
+    }
+    header_bytes = json.dumps(header).encode('utf-8')
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(CACHE_MAGIC)
+            f.write(len(header_bytes).to_bytes(8, 'little'))
+            f.write(header_bytes)
+            for _, data in arrays:
+                data.tofile(f)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path
+
+
+def read_index(source: Union[str, Path], path: Optional[Path] = None) -> Optional[CachedIndex]:
+    """
+    Restore the store of a log file from its sidecar cache.
+
+    Returns None when there is no usable cache: it is missing, corrupt, from
+    another version, or the log changed other than by appending lines.
+    """
+    source = Path(source)
+    path = path or cache_path(source)
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            if f.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+                return None
+            header = json.loads(f.read(int.from_bytes(f.read(8), 'little')).decode('utf-8'))
+            if not _is_current(source, header):
+                return None
+            store = _restore_store(source, header, f)
+            if f.read(1):
+                return None  # Trailing garbage
+    except (OSError, ValueError, KeyError, TypeError, EOFError):
+        return None
+
+    return CachedIndex(store, header['covered'], header['line_count'])
+
+
+def _is_current(source: Path, header: Dict[str, Any]) -> bool:
+    """Check that the log is the cached file, possibly with lines appended"""
+    if header.get('version') != CACHE_VERSION or header.get('byteorder') != sys.byteorder:
+        return False
+
+    stat = source.stat()
+    if stat.st_size == header['file_size']:
+        if stat.st_mtime_ns != header['mtime_ns']:
+            return False
+    elif stat.st_size < header['file_size'] or not header['terminated']:
+        # Truncated, or appended to a line that was still being written
+        return False
+
+    return _digest(source, header['covered']) == header['digest']
+
+
+def _digest(source: Path, size: int) -> str:
+    """Hash the first and last INDEX_CACHE_HASH_BYTES of the first `size` bytes"""
+    digest = hashlib.blake2b(size.to_bytes(8, 'little'), digest_size=16)
+    with open(source, 'rb') as f:
+        digest.update(f.read(min(size, INDEX_CACHE_HASH_BYTES)))
+        tail = max(size - INDEX_CACHE_HASH_BYTES, 0)
+        f.seek(tail)
+        digest.update(f.read(size - tail))
+    return digest.hexdigest()
+
+
+def _restore_store(source: Path, header: Dict[str, Any], f) -> EntryStore:
+    store = EntryStore(source, LogFormat(header['format']))
+    # Latency sketches and the time index are rebuilt from the columns when first needed
+    store.latency = None
+    store.time_index = None
+    store.requests = None
+
+    for name in CODED_FIELDS:
+        dictionary = ValueDictionary()
+        values = header['dictionaries'][name]
+        for value in values:
+            dictionary.encode(value)
+        if len(dictionary) != len(values) + 1:
+            raise ValueError(f"dictionary for {name} does not round-trip")
+        store.dictionaries[name] = dictionary
+
+    for name, typecode, itemsize, count in header['arrays']:
+        data = array(typecode)
+        if data.itemsize != itemsize:
+            raise ValueError(f"array item size mismatch for {name}")
+        data.fromfile(f, count)
+
+        if name in _COLUMNS:
+            setattr(store, name, data)
+        elif name.startswith('codes/'):
+            store.codes[name[len('codes/'):]] = data
+        else:
+            _, field, key = name.split('/')
+            store.indexes[field].postings[int(key)] = data
+
+    if len({len(getattr(store, name)) for name in _COLUMNS}) != 1:
+        raise ValueError("column lengths differ")
+    return store
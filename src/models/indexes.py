@@ -0,0 +1,192 @@
+"""
+Inverted Indexes
+Posting lists mapping field values to the entries that carry them
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from heapq import merge
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Union
+
+# Key of entries before the first timestamp of a file
+NO_TIME_KEY = -(2 ** 63)
+
+
+class PostingIndex:
+    """
+    Inverted index from an integer key (dictionary code or status code) to an
+    ascending array of entry ids.
+
+    Entries are added in id order during loading, so posting lists stay sorted
+    without any extra work; edits move a single id between lists.
+    """
+
+    def __init__(self):
+        self.postings: Dict[int, array] = {}
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.postings
+
+    def keys(self) -> Iterator[int]:
+        return iter(self.postings)
+
+    def add(self, key: int, entry_id: int):
+        """Append an id that is larger than every id already indexed"""
+        if key:
+            posting = self.postings.get(key)
+            if posting is None:
+                posting = self.postings[key] = array('I')
+            posting.append(entry_id)
+
+    def extend(self, other: 'PostingIndex', id_offset: int, remap=None):
+        """Append all postings of another index, shifting ids and optionally remapping keys"""
+        for key, posting in other.postings.items():
+            key = remap[key] if remap is not None else key
+            target = self.postings.get(key)
+            if target is None:
+                target = self.postings[key] = array('I')
+            target.extend(entry_id + id_offset for entry_id in posting)
+
+    def move(self, entry_id: int, old_key: int, new_key: int):
+        """Move an id from one posting list to another (after an edit)"""
+        if old_key == new_key:
+            return
+        if old_key:
+            posting = self.postings[old_key]
+            del posting[bisect_left(posting, entry_id)]
+            if not posting:
+                del self.postings[old_key]
+        if new_key:
+            posting = self.postings.get(new_key)
+            if posting is None:
+                posting = self.postings[new_key] = array('I')
+            insort(posting, entry_id)
+
+    def count(self, key: int) -> int:
+        posting = self.postings.get(key)
+        return len(posting) if posting is not None else 0
+
+    def counts(self, within: Optional[range] = None) -> Dict[int, int]:
+        """Number of ids under each key (and `within` a range of ids), by binary search"""
+        postings = self.postings
+        if within is None:
+            return {key: len(postings[key]) for key in sorted(postings)}
+        counts = {}
+        for key in sorted(postings):
+            posting = postings[key]
+            count = bisect_left(posting, within.stop) - bisect_left(posting, within.start)
+            if count:
+                counts[key] = count
+        return counts
+
+    def total(self, keys: Iterable[int]) -> int:
+        """Number of ids indexed under any of the keys"""
+        return sum(self.count(key) for key in keys)
+
+    def lookup(self, keys: Iterable[int], within: Optional[range] = None) -> array:
+        """Return the ascending ids indexed under any of the keys (and `within` a range of ids)"""
+        postings = [self.postings[key] for key in keys if key in self.postings]
+        if within is not None:
+            postings = [posting[bisect_left(posting, within.start):
+                                bisect_left(posting, within.stop)]
+                        for posting in postings]
+        if not postings:
+            return array('I')
+        if len(postings) == 1:
+            return postings[0][:]
+        return array('I', merge(*postings))
+
+
+def intersect_sorted(small: Sequence[int], large: Union[range, Sequence[int]]) -> array:
+    """Intersect two ascending id sequences, probing the larger one by binary search"""
+    if isinstance(large, range):
+        return array('I', [i for i in small if i in large])
+
+    result = array('I')
+    size = len(large)
+    lo = 0
+    for entry_id in small:
+        lo = bisect_left(large, entry_id, lo)
+        if lo == size:
+            break
+        if large[lo] == entry_id:
+            result.append(entry_id)
+    return result
+
+
+def restrict(ids: Union[range, Sequence[int]],
+             window: Union[range, Sequence[int]]) -> Union[range, Sequence[int]]:
+    """Intersect ascending ids with a window of ids, slicing by binary search where possible"""
+    if isinstance(window, range):
+        if isinstance(ids, range):
+            start = max(ids.start, window.start)
+            return range(start, max(min(ids.stop, window.stop), start))
+        return ids[bisect_left(ids, window.start):bisect_left(ids, window.stop)]
+    if len(window) <= len(ids):
+        return intersect_sorted(window, ids)
+    return intersect_sorted(ids, window)
+
+
+class TimeIndex:
+    """
+    Entry ids by timestamp, for time-range lookups by binary search.
+
+    A line without a timestamp takes the key of the line before it, so stack
+    traces and wrapped messages fall in the same window as their entry.
+    While keys arrive in order (the usual case for a log) they are already
+    sorted, and a lookup is two bisects returning a contiguous range of ids.
+    Once a line arrives out of order, lookups go through a permutation of
+    the ids sorted by key, built on the next lookup and extended in place
+    while later keys keep arriving in order.
+    """
+
+    def __init__(self):
+        self.keys = array('q')
+        self.in_order = True
+        self._order: Optional[array] = None  # Ids sorted by key (out-of-order keys only)
+        self._sorted_keys: Optional[array] = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, timestamp: Optional[int]):
+        """Add the key of the next entry id (None if the entry has no timestamp)"""
+        keys = self.keys
+        if timestamp is None:
+            timestamp = keys[-1] if keys else NO_TIME_KEY
+        elif keys and timestamp < keys[-1]:
+            self.in_order = False
+        keys.append(timestamp)
+
+        if self._order is not None:
+            if timestamp >= self._sorted_keys[-1]:
+                self._order.append(len(keys) - 1)
+                self._sorted_keys.append(timestamp)
+            else:
+                self._order = self._sorted_keys = None
+
+    def set(self, entry_id: int, timestamp: Optional[int]):
+        """Change the key of an entry (after an edit)"""
+        keys = self.keys
+        if timestamp is None:
+            timestamp = keys[entry_id - 1] if entry_id else NO_TIME_KEY
+        keys[entry_id] = timestamp
+
+        if ((entry_id and keys[entry_id - 1] > timestamp)
+                or (entry_id + 1 < len(keys) and keys[entry_id + 1] < timestamp)):
+            self.in_order = False
+        self._order = self._sorted_keys = None
+
+    def lookup(self, start: int, end: int) -> Union[range, array]:
+        """Return the ascending ids whose key is within [start, end]"""
+        if self.in_order:
+            return range(bisect_left(self.keys, start), bisect_right(self.keys, end))
+
+        if self._order is None:
+            keys = self.keys
+            self._order = array('I', sorted(range(len(keys)), key=keys.__getitem__))
+            self._sorted_keys = array('q', map(keys.__getitem__, self._order))
+
+        lo = bisect_left(self._sorted_keys, start)
+        hi = bisect_right(self._sorted_keys, end)
+        return array('I', sorted(self._order[lo:hi]))
@@ -0,0 +1,192 @@
+"""
+Request Lifecycles
+Pairs START / STOP lifecycle lines into requests with durations
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+OPERATION_START = 'START'
+OPERATION_STOP = 'STOP'
+
+# (source file, thread code, endpoint code)
+PairKey = Tuple[int, int, int]
+
+_NO_TIMESTAMP = -(2 ** 63)
+_DAY_US = 86400 * 1000000
+_DAY_MS = 86400 * 1000.0
+# Longest request taken to run past midnight when its STOP reads earlier than its START
+_MAX_ROLLOVER_MS = 12 * 3600 * 1000.0
+
+
+def duration_ms(start: int, stop: int) -> Optional[float]:
+    """
+    Milliseconds between two epoch-microsecond timestamps (NaN if either is missing).
+
+    A STOP stamped before its START is taken to be past midnight only for
+    times of day, which are all dated with the session date: both stamps
+    must fall on the same day, and the request must then have run for less
+    than 12 hours. Any other STOP before its START gives None: the two lines
+    do not pair.
+    """
+    if start == _NO_TIMESTAMP or stop == _NO_TIMESTAMP:
+        return math.nan
+    duration = (stop - start) / 1000.0
+    if duration >= 0:
+        return duration
+    if start // _DAY_US == stop // _DAY_US and duration + _DAY_MS < _MAX_ROLLOVER_MS:
+        return duration + _DAY_MS
+    return None
+
+
+class RequestPairs:
+    """
+    Requests derived from START / STOP lines, built while entries are added.
+
+    Each START is held open under its (file, thread, endpoint) key until the
+    STOP with the same key arrives, which turns it into a request: one dict
+    lookup per lifecycle line, so pairing is linear in the number of lines.
+    A START that finds its key already open replaces the earlier one, which
+    is counted as a start without a stop; a STOP with nothing open is a stop
+    without a start.
+
+    Requests are kept as columns (start id, stop id, duration in ms) in the
+    order their STOP arrived. Pairs built for separate chunks of a file are
+    joined with `extend`, which also pairs the STOPs at the head of the later
+    chunk with the STARTs still open at the end of the earlier one.
+    """
+
+    def __init__(self):
+        self.start_ids = array('q')
+        self.stop_ids = array('q')
+        self.durations = array('d')
+
+        self.open: Dict[PairKey, int] = {}  # Key -> id of its open START
+        self.orphan_starts = array('q')  # STARTs replaced before their STOP
+        self.orphan_stops = array('q')  # STOPs with no open START
+        # STOPs that came before any START of their key; they may still pair
+        # with a START from an earlier chunk (see extend)
+        self.leading_stops: Dict[PairKey, int] = {}
+        self.keys: Set[PairKey] = set()  # Every key seen so far
+
+    def __len__(self) -> int:
+        return len(self.start_ids)
+
+    def add(self, entry_id: int, key: PairKey, operation: str, timestamps: Sequence[int]):
+        """Pair a lifecycle line (START or STOP) given its key and the store's timestamps"""
+        if operation == OPERATION_START:
+            previous = self.open.get(key)
+            if previous is not None:
+                self.orphan_starts.append(previous)
+            self.open[key] = entry_id
+            self.keys.add(key)
+
+        elif operation == OPERATION_STOP:
+            start = self.open.pop(key, None)
+            if start is not None:
+                self._pair(start, entry_id, timestamps)
+            elif key in self.keys:
+                self.orphan_stops.append(entry_id)
+            else:
+                self.leading_stops[key] = entry_id
+                self.keys.add(key)
+
+    def extend(self, other: 'RequestPairs', id_offset: int, remap: Dict[PairKey, PairKey],
+               timestamps: Sequence[int]):
+        """
+        Append the pairs of the chunk that follows, whose ids start at
+        `id_offset` and whose keys translate through `remap`
+        """
+        for key in other.keys:
+            own_key = remap[key]
+            stop = other.leading_stops.get(key)
+            if stop is not None:
+                stop += id_offset
+                start = self.open.pop(own_key, None)
+                if start is not None:
+                    self._pair(start, stop, timestamps)
+                elif own_key in self.keys:
+                    self.orphan_stops.append(stop)
+                else:
+                    self.leading_stops[own_key] = stop
+            elif own_key in self.open:
+                # The chunk starts this key again before stopping it
+                self.orphan_starts.append(self.open.pop(own_key))
+            self.keys.add(own_key)
+
+        self.start_ids.extend(n + id_offset for n in other.start_ids)
+        self.stop_ids.extend(n + id_offset for n in other.stop_ids)
+        self.durations.extend(other.durations)
+        self.orphan_starts.extend(n + id_offset for n in other.orphan_starts)
+        self.orphan_stops.extend(n + id_offset for n in other.orphan_stops)
+        for key, start in other.open.items():
+            self.open[remap[key]] = start + id_offset
+
+    def _pair(self, start: int, stop: int, timestamps: Sequence[int]):
+        duration = duration_ms(timestamps[start], timestamps[stop])
+        if duration is None:
+            # Stamped out of order: both lines stay unmatched
+            self.orphan_starts.append(start)
+            self.orphan_stops.append(stop)
+            return
+        self.start_ids.append(start)
+        self.stop_ids.append(stop)
+        self.durations.append(duration)
+
+    # ======================================================
+    # Queries
+    # ======================================================
+    def unmatched_starts(self) -> List[int]:
+        """Ids of STARTs without a STOP (replaced, stamped after their STOP, or still open)"""
+        return sorted(list(self.orphan_starts) + list(self.open.values()))
+
+    def unmatched_stops(self) -> List[int]:
+        """Ids of STOPs without a START (or stamped before it)"""
+        return sorted(list(self.orphan_stops) + list(self.leading_stops.values()))
+
+    def select(self, ids: Optional[Union[range, Sequence[int]]] = None) -> List[int]:
+        """Return the request numbers whose START is among `ids` (all if None)"""
+        if ids is None:
+            return list(range(len(self)))
+        if isinstance(ids, range):
+            return [n for n, start in enumerate(self.start_ids) if start in ids]
+
+        selected = []
+        for n, start in enumerate(self.start_ids):
+            i = bisect_left(ids, start)
+            if i < len(ids) and ids[i] == start:
+                selected.append(n)
+        return selected
+
+    def overlaps(self, threads: Sequence[int], sources: Sequence[int] = (),
+                 requests: Optional[Sequence[int]] = None) -> Dict[Tuple[int, int], int]:
+        """
+        Count, per (source file, thread code), the requests that started
+        while another request of the same thread was still running.
+
+        `threads` and `sources` are the store's thread code and source id
+        columns; requests are ordered by their START line, so the count does
+        not depend on clock precision.
+        """
+        by_thread: Dict[Tuple[int, int], List[Tuple[int, int]]] = defaultdict(list)
+        start_ids, stop_ids = self.start_ids, self.stop_ids
+        for n in (range(len(self)) if requests is None else requests):
+            start = start_ids[n]
+            source = sources[start] if sources else 0
+            by_thread[source, threads[start]].append((start, stop_ids[n]))
+
+        counts: Dict[Tuple[int, int], int] = {}
+        for thread, spans in by_thread.items():
+            spans.sort()
+            running_until = -1
+            overlapping = 0
+            for start, stop in spans:
+                if start < running_until:
+                    overlapping += 1
+                running_until = max(running_until, stop)
+            if overlapping:
+                counts[thread] = overlapping
+        return counts
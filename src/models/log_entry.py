@@ -14,16 +14,177 @@ Supports:
 import json
 import re
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable
+
+from src.config import FORMAT_SNIFF_MIN_SHARE
+from src.models.timestamps import TimestampDecoder
+
+# Log format kinds recognised by the sniffer
+FORMAT_JSON = 'json'
+FORMAT_JAVA = 'java'
+FORMAT_GENERIC = 'generic'
+
+
+# ======================================================
+# Precompiled patterns
+# ======================================================
+# Every pattern is compiled once at import time. Each search is guarded by a
+# cheap literal check (``'x' in message``) that is a necessary condition for
+# the pattern to match, so most lines skip most regex scans entirely.
+
+_HTTP_METHODS = r'(GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS)'
+
+_JAVA_LINE_RE = re.compile(
+    r'^(\d{2}:\d{2}:\d{2}\.\d{3})\s+'
+    r'\[([^\]]+)\]\s+'
+    r'(DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\s+'
+    r'([^\s:]+)\s*::\s*(.+)$',
+    re.IGNORECASE
+)
+
+# Java / Spring message details
+_CONTROLLER_RE = re.compile(r'([A-Za-z]+(?:Cntr|Controller|Service)):\s*([A-Z0-9]+)')
+_LIFECYCLE_RE = re.compile(r'=+\s*/([A-Z0-9]+)\s+(START|STOP)')
+_ENDPOINT_RE = re.compile(r'/([A-Z0-9]+)')
+_METHOD_WORD_RE = re.compile(r'\b' + _HTTP_METHODS + r'\b')
+_RESPONSE_CODE_RE = re.compile(r'Response Code\s*:\s*(\d{3})')
+_STATUS_FIELD_RE = re.compile(r'status[:\s=]+(\d{3})')
+_RSLT_CD_RE = re.compile(r'RSLT_CD\[(\d+)\]')
+_MILLIS_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(ms|milliseconds?)')
+
+# Generic API log fields
+_ISO_TIMESTAMP_RE = re.compile(r'(\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}(?:\.\d+)?'
+                               r'(?:Z|[+-]\d{2}:?\d{2})?)')
+_CLOCK_TIME_RE = re.compile(r'(\d{2}:\d{2}:\d{2}(?:\.\d+)?)')
+_LEVEL_RE = re.compile(r'\b(DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\b', re.IGNORECASE)
+_METHOD_PATH_RE = re.compile(r'\b' + _HTTP_METHODS + r'\s+([^\s]+)')
+_STATUS_RE = re.compile(r'\b([1-5]\d{2})\b')
+_DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(ms|s)')
+_TRAILING_MESSAGE_RE = re.compile(
+    r'\b(?:GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS)\s+'
+    r'\S+\s+'  # endpoint
+    r'(?:status=)?[1-5]\d{2}'  # status
+    r'(?:\s+\d+(?:\.\d+)?(?:ms|s))?'  # optional time
+    r'\s+(.*)$',  # message
+    re.IGNORECASE
+)
+
+# Display message cleanup
+_RSLT_MSG_RE = re.compile(r'RSLT_MSG\[([^\]]+)\]')
+_EQUALS_RUN_RE = re.compile(r'=+')
+_RESPONSE_LOG_RE = re.compile(r'\(.*?response log.*?\)')
+
+
+class LogFormat:
+    """
+    Parsing profile shared by all entries of one log file.
+
+    Built by `detect_format` from a sample of the file's first lines. Entries
+    parsed with a profile go straight to the file's dominant format and only
+    fall back to the full JSON → Java → generic chain for lines that may
+    belong to another format. The profile also carries the file's
+    timestamp decoder, which learns the file's timestamp layout.
+    """
+
+    def __init__(self, kind: Optional[str] = None):
+        self.kind = kind
+        self.timestamps = TimestampDecoder()
+
+    def __repr__(self) -> str:
+        return f"LogFormat({self.kind!r})"
+
+
+def detect_format(lines: Iterable[str]) -> LogFormat:
+    """Pick the dominant format of a sample of lines"""
+    counts: Dict[str, int] = {}
+    total = 0
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith('{') and line.endswith('}'):
+            kind = FORMAT_JSON
+        elif _JAVA_LINE_RE.match(line):
+            kind = FORMAT_JAVA
+        else:
+            kind = FORMAT_GENERIC
+
+        counts[kind] = counts.get(kind, 0) + 1
+        total += 1
+
+    if not total:
+        return LogFormat()
+
+    kind, count = max(counts.items(), key=lambda x: x[1])
+    return LogFormat(kind if count / total >= FORMAT_SNIFF_MIN_SHARE else None)
+
+
+# Decoder for entries parsed without a file profile
+_DEFAULT_DECODER = TimestampDecoder()
+
+
+def _may_be_json(line: str) -> bool:
+    # Embedded JSON runs from the first '{' to the end of the line,
+    # so it can only parse if the line ends with a closing brace
+    return '{' in line and line.rstrip().endswith('}')
+
+
+def _may_be_java(line: str) -> bool:
+    return line[:1].isdigit() and '::' in line
+
+
+def truncate_message(message: str, max_length: int) -> str:
+    """Shorten a display message to `max_length` characters, ending with '...'"""
+    if len(message) > max_length:
+        return message[:max_length - 3] + "..."
+    return message
+
+
+# Fields filled in by LogEntry._parse
+_PARSED_FIELDS = frozenset((
+    'timestamp', 'level', 'method', 'endpoint', 'status_code', 'response_time', 'message',
+    'thread', 'logger', 'service_name', 'controller_name', 'operation_type', 'json_data',
+))
 
 
 class LogEntry:
-    """Represents a single parsed log entry"""
+    """
+    Represents a single parsed log entry
+
+    Entries are parsed lazily: construction only stores the raw line, and the
+    first access to any parsed field runs the parser once and caches every
+    field in its slot. Code that only needs `raw_line` (search, export, save)
+    never pays for parsing. `display_message` is derived the same way, on
+    first access.
+    """
 
-    def __init__(self, raw_line: str, line_number: int):
+    __slots__ = ('raw_line', 'line_number', 'log_format', 'source', 'display_message') + \
+        tuple(sorted(_PARSED_FIELDS))
+
+    def __init__(self, raw_line: str, line_number: int, log_format: Optional[LogFormat] = None,
+                 source: Optional[str] = None):
         self.raw_line = raw_line.strip()
         self.line_number = line_number
+        self.log_format = log_format
+        self.source = source  # "file:line" when the entry comes from one of several merged files
+
+    def __getattr__(self, name: str):
+        # Only reached while a slot is still empty, i.e. before the first parse
+        if name in _PARSED_FIELDS:
+            self._parse()
+            return object.__getattribute__(self, name)
+        if name == 'display_message':
+            self.display_message = self._clean_message()
+            return self.display_message
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
+    # ======================================================
+    # Main parsing dispatcher
+    # ======================================================
+    def _parse(self):
+        """Attempt parsing in safe priority order"""
         # Core fields (used by LogViewer / filters)
         self.timestamp: Optional[datetime] = None
         self.level: Optional[str] = None
@@ -31,7 +192,7 @@ class LogEntry:
         self.endpoint: Optional[str] = None
         self.status_code: Optional[int] = None
         self.response_time: Optional[float] = None
-        self.message: str = raw_line
+        self.message: str = self.raw_line
 
         # Extended fields (Java / Spring)
         self.thread: Optional[str] = None
@@ -43,16 +204,21 @@ class LogEntry:
         # JSON support
         self.json_data: Optional[Dict] = None
 
-        self._parse()
+        line = self.raw_line
+        kind = self.log_format.kind if self.log_format else None
 
-    # ======================================================
-    # Main parsing dispatcher
-    # ======================================================
-    def _parse(self):
-        """Attempt parsing in safe priority order"""
+        # Known file format: skip formats this line cannot belong to
+        if kind == FORMAT_JAVA and not _may_be_json(line):
+            if not self._parse_java_format(line):
+                self._parse_common_format()
+            return
+
+        if kind == FORMAT_GENERIC and not _may_be_json(line) and not _may_be_java(line):
+            self._parse_common_format()
+            return
 
         # 1️⃣ JSON (standalone or embedded)
-        if '{' in self.raw_line and '}' in self.raw_line:
+        if _may_be_json(line):
             if self._parse_json_embedded():
                 return
 
@@ -100,8 +266,6 @@ class LogEntry:
         if json_msg:
             # Ensure message is always a string
             self.message = str(json_msg) if not isinstance(json_msg, str) else json_msg
-        elif self.message == self.raw_line:
-            self.message = ""
 
         # if self.message == self.raw_line:
         #     self.message = data.get('message') or data.get('msg') or str(data)[:120]
@@ -110,27 +274,19 @@ class LogEntry:
     # Java / Spring parsing
     # ======================================================
     def _parse_java_format(self, line: str) -> bool:
-        pattern = (
-            r'^(\d{2}:\d{2}:\d{2}\.\d{3})\s+'
-            r'\[([^\]]+)\]\s+'
-            r'(DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\s+'
-            r'([^\s:]+)\s*::\s*(.+)$'
-        )
+        if not _may_be_java(line):
+            return False
 
-        match = re.match(pattern, line, re.IGNORECASE)
+        match = _JAVA_LINE_RE.match(line)
         if not match:
             return False
 
         time_str, thread, level, logger, message = match.groups()
 
-        try:
-            today = datetime.now().date()
-            self.timestamp = datetime.combine(
-                today,
-                datetime.strptime(time_str, '%H:%M:%S.%f').time()
-            )
-        except ValueError:
-            pass
+        # Time of day only: dated with the session date by the decoder
+        timestamp = self._parse_timestamp(time_str)
+        if timestamp is not None:
+            self.timestamp = timestamp
 
         self.thread = thread
         self.level = level.upper()
@@ -143,51 +299,54 @@ class LogEntry:
         self.message = message
 
         # Controller / service
-        ctrl_pattern = r'([A-Za-z]+(?:Cntr|Controller|Service)):\s*([A-Z0-9]+)'
-        m = re.search(ctrl_pattern, message)
-        if m:
-            self.controller_name = m.group(1)
-            self.endpoint = '/' + m.group(2)
-            self.service_name = self.controller_name
+        if ':' in message and ('Cntr' in message or 'Controller' in message
+                               or 'Service' in message):
+            m = _CONTROLLER_RE.search(message)
+            if m:
+                self.controller_name = m.group(1)
+                self.endpoint = '/' + m.group(2)
+                self.service_name = self.controller_name
+
+        has_slash = '/' in message
 
         # START / STOP
-        lifecycle = r'=+\s*/([A-Z0-9]+)\s+(START|STOP)'
-        m = re.search(lifecycle, message)
-        if m:
-            self.endpoint = '/' + m.group(1)
-            self.operation_type = m.group(2)
+        if has_slash and '=' in message and ('START' in message or 'STOP' in message):
+            m = _LIFECYCLE_RE.search(message)
+            if m:
+                self.endpoint = '/' + m.group(1)
+                self.operation_type = m.group(2)
 
         # Standalone endpoint
-        if not self.endpoint:
-            m = re.search(r'/([A-Z0-9]+)', message)
+        if not self.endpoint and has_slash:
+            m = _ENDPOINT_RE.search(message)
             if m:
                 self.endpoint = '/' + m.group(1)
 
         # HTTP method
-        m = re.search(r'\b(GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS)\b', message)
+        m = _METHOD_WORD_RE.search(message)
         if m:
             self.method = m.group(1)
 
         if not self.method and self.endpoint:
             self.method = 'POST'
 
-        # Status code
-        status_patterns = [
-            r'Response Code\s*:\s*(\d{3})',
-            r'status[:\s=]+(\d{3})',
-            r'RSLT_CD\[(\d+)\]'
-        ]
-        for p in status_patterns:
-            m = re.search(p, message)
-            if m:
-                code = int(m.group(1))
-                self.status_code = 404 if code == 719 else code
-                break
+        # Status code (first matching pattern wins)
+        m = None
+        if 'Response Code' in message:
+            m = _RESPONSE_CODE_RE.search(message)
+        if not m and 'status' in message:
+            m = _STATUS_FIELD_RE.search(message)
+        if not m and 'RSLT_CD[' in message:
+            m = _RSLT_CD_RE.search(message)
+        if m:
+            code = int(m.group(1))
+            self.status_code = 404 if code == 719 else code
 
         # Response time
-        m = re.search(r'(\d+(?:\.\d+)?)\s*(ms|milliseconds?)', message)
-        if m:
-            self.response_time = float(m.group(1))
+        if 'ms' in message or 'millisecond' in message:
+            m = _MILLIS_RE.search(message)
+            if m:
+                self.response_time = float(m.group(1))
 
         # Normalize message
         if self.operation_type and self.endpoint:
@@ -197,48 +356,40 @@ class LogEntry:
     # Generic API log parsing (v1)
     # ======================================================
     def _parse_common_format(self):
+        line = self.raw_line
+        has_colon = ':' in line
+
         # Timestamp
-        ts_patterns = [
-            r'(\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)',
-            r'(\d{2}:\d{2}:\d{2}(?:\.\d+)?)',
-        ]
-        for p in ts_patterns:
-            m = re.search(p, self.raw_line)
+        if has_colon:
+            m = _ISO_TIMESTAMP_RE.search(line) if '-' in line else None
+            if not m:
+                m = _CLOCK_TIME_RE.search(line)
             if m:
                 self.timestamp = self._parse_timestamp(m.group(1))
-                break
 
         # Level
-        m = re.search(r'\b(DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\b', self.raw_line, re.I)
+        m = _LEVEL_RE.search(line)
         if m:
             self.level = m.group(1).upper()
 
         # HTTP
-        m = re.search(r'\b(GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS)\s+([^\s]+)', self.raw_line)
+        m = _METHOD_PATH_RE.search(line)
         if m:
             self.method, self.endpoint = m.groups()
 
         # Status
-        m = re.search(r'\b([1-5]\d{2})\b', self.raw_line)
+        m = _STATUS_RE.search(line)
         if m:
             self.status_code = int(m.group(1))
 
         # Response time
-        m = re.search(r'(\d+(?:\.\d+)?)\s*(ms|s)', self.raw_line)
+        m = _DURATION_RE.search(line) if 's' in line else None
         if m:
             value = float(m.group(1))
             self.response_time = value if m.group(2) == 'ms' else value * 1000
 
         # Extract trailing free-text message (after status / time)
-        trailing_pattern = (
-            r'\b(?:GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS)\s+'
-            r'\S+\s+'  # endpoint
-            r'(?:status=)?[1-5]\d{2}'  # status
-            r'(?:\s+\d+(?:\.\d+)?(?:ms|s))?'  # optional time
-            r'\s+(.*)$'  # message
-        )
-
-        m = re.search(trailing_pattern, self.raw_line, re.IGNORECASE)
+        m = _TRAILING_MESSAGE_RE.search(line)
         if m:
             self.message = m.group(1).strip()
 
@@ -246,30 +397,8 @@ class LogEntry:
     # Helpers
     # ======================================================
     def _parse_timestamp(self, ts: Optional[str]) -> Optional[datetime]:
-        if not ts:
-            return None
-
-        formats = [
-            '%Y-%m-%dT%H:%M:%S.%fZ',
-            '%Y-%m-%dT%H:%M:%SZ',
-            '%Y-%m-%d %H:%M:%S.%f',
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%dT%H:%M:%S%z',
-            '%Y-%m-%dT%H:%M:%S.%f%z',
-            '%H:%M:%S.%f',
-            '%H:%M:%S',
-        ]
-
-        for fmt in formats:
-            try:
-                parsed = datetime.strptime(ts, fmt)
-                if fmt.startswith('%H'):
-                    parsed = datetime.combine(datetime.now().date(), parsed.time())
-                return parsed
-            except ValueError:
-                continue
-
-        return None
+        decoder = self.log_format.timestamps if self.log_format else _DEFAULT_DECODER
+        return decoder.decode(ts)
 
     # ======================================================
     # UI helpers (unchanged – used by viewer)
@@ -301,6 +430,10 @@ class LogEntry:
         Return a cleaned, user-friendly message for table display.
         Fully compatible with v2 behavior.
         """
+        return truncate_message(self.display_message, max_length)
+
+    def _clean_message(self) -> str:
+        """Compute `display_message` (untruncated)"""
         # Ensure message is always a string
         if isinstance(self.message, dict):
             msg = str(self.message)
@@ -324,18 +457,18 @@ class LogEntry:
                 msg = f"{self.operation_type} - operation"
 
         # RSLT_MSG cleanup
-        rslt_msg = re.search(r'RSLT_MSG\[([^\]]+)\]', msg)
-        if rslt_msg:
-            msg = rslt_msg.group(1)
+        if 'RSLT_MSG[' in msg:
+            rslt_msg = _RSLT_MSG_RE.search(msg)
+            if rslt_msg:
+                msg = rslt_msg.group(1)
 
         # Remove excessive '='
-        msg = re.sub(r'=+', '', msg).strip()
+        if '=' in msg:
+            msg = _EQUALS_RUN_RE.sub('', msg)
+        msg = msg.strip()
 
         # Remove noisy response-log markers
-        msg = re.sub(r'\(.*?response log.*?\)', '', msg).strip()
-
-        # Truncate safely
-        if len(msg) > max_length:
-            return msg[:max_length - 3] + "..."
+        if 'response log' in msg:
+            msg = _RESPONSE_LOG_RE.sub('', msg).strip()
 
         return msg
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Store Merging
+Combines the stores of several log files into one time-ordered store
+"""
+
+from heapq import merge
+from typing import Iterator, Sequence, Tuple
+
+from src.models.entry_store import CODED_FIELDS, LATENCY_FIELDS, NO_TIMESTAMP, EntryStore
+from src.models.log_entry import LogFormat
+
+
+def merge_order(parts: Sequence[EntryStore]) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (part index, entry id) for the entries of all parts in timestamp order.
+
+    This is a streaming k-way merge: each part is read in its own order and
+    only one pending entry per part is held at a time. An entry without a
+    timestamp takes the one of the entry before it, so continuation lines
+    (stack traces, wrapped messages) stay with the line they belong to. Equal
+    timestamps keep the order of the parts, then of the entries.
+    """
+    def keyed(part_index: int, part: EntryStore) -> Iterator[Tuple[int, int, int]]:
+        last = NO_TIMESTAMP
+        for entry_id, timestamp in enumerate(part.timestamps):
+            if timestamp != NO_TIMESTAMP:
+                last = timestamp
+            yield last, part_index, entry_id
+
+    for _, part_index, entry_id in merge(*(keyed(n, part) for n, part in enumerate(parts))):
+        yield part_index, entry_id
+
+
+def merge_stores(parts: Sequence[EntryStore]) -> EntryStore:
+    """
+    Build one store holding the entries of every part in timestamp order.
+
+    Entries are numbered 1..N in merged order (their `line_numbers`, used by
+    `view` and `edit`); `source_ids` and `source_lines` record the file and
+    line each one came from. Dictionary codes are re-encoded into shared
+    dictionaries, the filter indexes are rebuilt for the merged ids and the
+    latency sketches of the parts are merged. The parts are kept only as
+    line readers, without their columns.
+    """
+    kinds = {part.log_format.kind if part.log_format else None for part in parts}
+    store = EntryStore(log_format=LogFormat(kinds.pop() if len(kinds) == 1 else None))
+    store.sources = [_reader(part) for part in parts]
+    store.time_index = None  # Rebuilt from the merged timestamps on the first time filter
+    store.requests = None  # Paired per file on the first request query
+
+    remaps = []
+    for part in parts:
+        remaps.append({name: [store.dictionaries[name].encode(value)
+                              for value in part.dictionaries[name].values]
+                       for name in CODED_FIELDS})
+
+    indexes = store.indexes
+    coded = [(name, store.codes[name], indexes.get(name)) for name in CODED_FIELDS]
+    status_index = indexes['status_code']
+
+    for entry_id, (part_index, i) in enumerate(merge_order(parts)):
+        part = parts[part_index]
+        store.line_numbers.append(entry_id + 1)
+        store.offsets.append(part.offsets[i])
+        store.source_ids.append(part_index)
+        store.source_lines.append(part.line_numbers[i])
+        store.timestamps.append(part.timestamps[i])
+        store.response_times.append(part.response_times[i])
+
+        status = part.status_codes[i]
+        store.status_codes.append(status)
+        status_index.add(status, entry_id)
+
+        remap = remaps[part_index]
+        for name, codes, index in coded:
+            code = remap[name][part.codes[name][i]]
+            codes.append(code)
+            if index is not None:
+                index.add(code, entry_id)
+
+    if all(part.latency is not None for part in parts):
+        for part, remap in zip(parts, remaps):
+            for name in LATENCY_FIELDS:
+                store.merge_latency(name, part.latency[name], remap[name])
+    else:
+        store.latency = None
+
+    return store
+
+
+def _reader(part: EntryStore) -> EntryStore:
+    """An empty store over the same file, used to read lines back by offset"""
+    reader = EntryStore(part.source, part.log_format)
+    reader.compressed = part.compressed
+    return reader
@@ -0,0 +1,137 @@
+"""
+Quantile Sketches
+Mergeable, bounded-memory latency percentiles (DDSketch)
+"""
+
+import math
+from typing import Dict, Iterable, Optional
+
+from src.config import LATENCY_SKETCH_ACCURACY, LATENCY_SKETCH_MAX_BUCKETS
+
+
+class QuantileSketch:
+    """
+    DDSketch quantile sketch for non-negative values.
+
+    Values fall into logarithmic buckets (bucket k holds (gamma^(k-1),
+    gamma^k] with gamma = (1 + a) / (1 - a)), so every quantile is answered
+    within a relative error `a` of the true value. Only bucket counts are
+    stored: sketches of the same accuracy merge by adding counts, and a
+    value can be removed again exactly. Past `max_buckets` the lowest
+    buckets are collapsed into one, which only affects the low quantiles.
+    """
+
+    def __init__(self, relative_accuracy: float = LATENCY_SKETCH_ACCURACY,
+                 max_buckets: int = LATENCY_SKETCH_MAX_BUCKETS):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0  # Values too small to index (e.g. 0 ms)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float, count: int = 1):
+        """Add a value `count` times (negative and NaN values are ignored)"""
+        if not value >= 0:
+            return
+        if value < 1e-9:
+            self.zero_count += count
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+            if len(self.buckets) > self.max_buckets:
+                self._collapse()
+
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def remove(self, value: float):
+        """Remove one occurrence of a value added earlier (e.g. when an entry is edited)"""
+        if not value >= 0 or not self.count:
+            return
+        if value < 1e-9:
+            if not self.zero_count:
+                return
+            self.zero_count -= 1
+        else:
+            if not self.buckets:
+                return
+            key = math.ceil(math.log(value) / self._log_gamma)
+            if key not in self.buckets:
+                key = min(self.buckets)  # Collapsed into the lowest bucket
+            self.buckets[key] -= 1
+            if not self.buckets[key]:
+                del self.buckets[key]
+
+        self.count -= 1
+        self.total -= value
+        if not self.count:
+            self.min, self.max, self.total = math.inf, -math.inf, 0.0
+        elif value >= self.max:
+            self.max = self.quantile(1.0, exact_ends=False)
+        elif value <= self.min:
+            self.min = self.quantile(0.0, exact_ends=False)
+
+    def merge(self, other: 'QuantileSketch'):
+        """Add all values of another sketch with the same accuracy"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches of different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float, exact_ends: bool = True) -> Optional[float]:
+        """Return the value at quantile q (0..1), or None for an empty sketch"""
+        if not self.count:
+            return None
+        if exact_ends and q >= 1:
+            return self.max
+        if exact_ends and q <= 0:
+            return self.min
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max) if exact_ends else value
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def _collapse(self):
+        """Fold the lowest buckets together until `max_buckets` remain"""
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        self.buckets[target] += sum(self.buckets.pop(key) for key in keys[:excess])
+
+
+def merged(sketches: Iterable[QuantileSketch]) -> QuantileSketch:
+    """Return a new sketch holding the values of all the given sketches"""
+    result = QuantileSketch()
+    for sketch in sketches:
+        result.merge(sketch)
+    return result
@@ -0,0 +1,268 @@
+"""
+Timestamp Decoding
+Turns the timestamp strings found in log lines into datetimes without strptime,
+and time ranges (`10:02..10:07:30`) into bounds in epoch microseconds
+"""
+
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from src.config import TIMESTAMP_FORMATS, TIMESTAMP_MEMO_SIZE
+
+# Layouts recognised by the fast paths
+LAYOUT_DATETIME = 'datetime'  # 2024-01-20 10:00:01[.123], 2024-01-20T10:00:01[.123]Z, ...+02:00
+LAYOUT_CLOCK = 'clock'  # 10:00:01[.123], dated with the session date
+
+_DATETIME_RE = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})[T ]([0-9]{2}):([0-9]{2}):([0-9]{2})')
+_CLOCK_RE = re.compile(r'([0-9]{2}):([0-9]{2}):([0-9]{2})')
+_FRACTION_RE = re.compile(r'\.([0-9]{1,6})')
+_OFFSET_TAIL_RE = re.compile(r'(?:\.[0-9]{3}|\.[0-9]{6})?[+-][0-9]{2}:[0-9]{2}')
+
+# strptime fallback, in the order the formats have always been tried
+_FALLBACK_FORMATS = TIMESTAMP_FORMATS + ['%H:%M:%S.%f', '%H:%M:%S']
+
+# Time range bounds
+_TIME_OF_DAY_RE = re.compile(r'^(\d{1,2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,6}))?)?$')
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_DATETIME_PRECISION_RE = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}(:\d{2})?(:\d{2})?(?:[.,](\d+))?')
+
+_MIN_MICROS = -(2 ** 63)
+_MAX_MICROS = 2 ** 63 - 1
+
+# Sentinel for a missing timestamp in epoch-microsecond columns
+NO_TIMESTAMP = -(2 ** 63)
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_epoch_micros(ts: Optional[datetime]) -> int:
+    """Convert a timestamp to epoch microseconds (naive timestamps are taken as UTC)"""
+    if ts is None:
+        return NO_TIMESTAMP
+    delta = ts - (_EPOCH if ts.tzinfo is None else _EPOCH_UTC)
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def from_epoch_micros(micros: int) -> Optional[datetime]:
+    """Convert epoch microseconds back to a naive UTC datetime (None for NO_TIMESTAMP)"""
+    if micros == NO_TIMESTAMP:
+        return None
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+class TimestampDecoder:
+    """
+    Decoder for the timestamps of one log file.
+
+    The common layouts are decoded by fixed-offset slicing: the date and time
+    fields sit at known positions, so they are checked and read without a
+    format search. The second-resolution prefix (`2024-01-20 10:00:01`) is
+    memoized, so lines logged within the same second only parse their
+    fraction. Timestamps with a UTC offset go through `fromisoformat`. The
+    decoder learns which layout the file uses and tries it first; anything
+    else falls back to the strptime formats, with the same results as
+    before. Times of day are dated with the session date, read once.
+    """
+
+    def __init__(self, memo_size: int = TIMESTAMP_MEMO_SIZE):
+        self.layout: Optional[str] = None
+        self.memo_size = memo_size
+        self._seconds: Dict[str, datetime] = {}
+        self._today: Optional[date] = None
+
+    def __reduce__(self):
+        # Workers and the index cache get a fresh decoder, not the memo
+        return type(self), (self.memo_size,)
+
+    @property
+    def today(self) -> date:
+        """Date given to times of day, fixed for the session on first use"""
+        if self._today is None:
+            self._today = datetime.now().date()
+        return self._today
+
+    def decode(self, ts: Optional[str]) -> Optional[datetime]:
+        """Return the datetime of a timestamp string, or None if it is not one"""
+        if not ts:
+            return None
+
+        if self.layout == LAYOUT_CLOCK:
+            parsed = self._decode_clock(ts)
+            if parsed is None:
+                parsed = self._decode_datetime(ts)
+        else:
+            parsed = self._decode_datetime(ts)
+            if parsed is None:
+                parsed = self._decode_clock(ts)
+        if parsed is not None:
+            return parsed
+
+        return self._decode_fallback(ts)
+
+    def _decode_datetime(self, ts: str) -> Optional[datetime]:
+        if len(ts) < 19 or ts[4] != '-' or ts[13] != ':':
+            return None
+
+        tail = ts[19:]
+        separator = ts[10]
+        if separator == 'T':
+            # Only the UTC forms ('Z' or an offset) are accepted after a 'T'
+            if tail.endswith('Z'):
+                tail = tail[:-1]
+            elif _OFFSET_TAIL_RE.fullmatch(tail):
+                try:
+                    parsed = datetime.fromisoformat(ts)
+                except ValueError:
+                    return None
+                self.layout = LAYOUT_DATETIME
+                return parsed
+            else:
+                return None
+        elif separator != ' ':
+            return None
+
+        base = self._second(ts[:19], _DATETIME_RE)
+        if base is None:
+            return None
+        self.layout = LAYOUT_DATETIME
+        return self._with_fraction(base, tail)
+
+    def _decode_clock(self, ts: str) -> Optional[datetime]:
+        if len(ts) < 8 or ts[2] != ':' or ts[5] != ':':
+            return None
+
+        base = self._second(ts[:8], _CLOCK_RE)
+        if base is None:
+            return None
+        self.layout = LAYOUT_CLOCK
+        return self._with_fraction(base, ts[8:])
+
+    def _second(self, prefix: str, pattern) -> Optional[datetime]:
+        """Decode (or recall) a second-resolution prefix"""
+        memo = self._seconds
+        parsed = memo.get(prefix)
+        if parsed is not None:
+            return parsed
+
+        match = pattern.fullmatch(prefix)
+        if not match:
+            return None
+        fields = [int(field) for field in match.groups()]
+        try:
+            if len(fields) == 3:
+                today = self.today
+                parsed = datetime(today.year, today.month, today.day, *fields)
+            else:
+                parsed = datetime(*fields)
+        except ValueError:
+            return None
+
+        if len(memo) >= self.memo_size:
+            memo.clear()
+        memo[prefix] = parsed
+        return parsed
+
+    @staticmethod
+    def _with_fraction(base: datetime, tail: str) -> Optional[datetime]:
+        if not tail:
+            return base
+        match = _FRACTION_RE.fullmatch(tail)
+        if not match:
+            return None
+        return base.replace(microsecond=int(match.group(1).ljust(6, '0')))
+
+    def _decode_fallback(self, ts: str) -> Optional[datetime]:
+        for fmt in _FALLBACK_FORMATS:
+            try:
+                parsed = datetime.strptime(ts, fmt)
+            except ValueError:
+                continue
+            if fmt.startswith('%H'):
+                parsed = datetime.combine(self.today, parsed.time())
+            return parsed
+        return None
+
+
+def parse_time_range(spec: str, reference: Optional[int] = None,
+                     utc_offset: Optional[timedelta] = None) -> Tuple[int, int]:
+    """
+    Parse `start..end` into inclusive bounds in epoch microseconds.
+
+    Each side is a time of day (10:02, 10:02:00, 10:02:00.250), a date
+    (2024-01-20) or an ISO datetime; either side may be left out. A bound
+    covers its whole precision, so `..10:07` runs to 10:07:59.999999 and a
+    date covers the whole day. Times of day take the date of `reference`
+    (the log's first timestamp, in epoch microseconds; today if None), and
+    an end before the start rolls over to the next day.
+
+    Bounds without a UTC offset are read on the log's clock: `utc_offset` is
+    the offset its timestamps carry (None for a log of naive timestamps,
+    which are stored as written), so `10:05` on a +02:00 log means 08:05 UTC.
+    """
+    if '..' not in spec:
+        raise ValueError(f"time range must look like 10:02:00..10:07:30, got '{spec}'")
+    start_text, end_text = (part.strip() for part in spec.split('..', 1))
+    if not start_text and not end_text:
+        raise ValueError("time range needs a start or an end")
+
+    offset = utc_offset or timedelta(0)
+    if reference is not None:
+        day = (_EPOCH + timedelta(microseconds=reference) + offset).date()
+    else:
+        day = date.today()
+    start = _parse_time_bound(start_text, day) if start_text else None
+    end = _parse_time_bound(end_text, day) if end_text else None
+
+    if start and end and start[2] and end[2] and end[0] < start[0]:
+        end = (end[0] + timedelta(days=1), end[1], end[2])  # Past midnight
+
+    start_micros = _bound_micros(start[0], offset) if start else _MIN_MICROS
+    end_micros = _bound_micros(end[0] + end[1], offset) - 1 if end else _MAX_MICROS
+    if end_micros < start_micros:
+        raise ValueError(f"time range ends before it starts: '{spec}'")
+    return start_micros, end_micros
+
+
+def _bound_micros(moment: datetime, offset: timedelta) -> int:
+    """Epoch microseconds of a bound, reading a naive one on the log's clock"""
+    if moment.tzinfo is None:
+        moment -= offset
+    return to_epoch_micros(moment)
+
+
+def _parse_time_bound(text: str, day: date) -> Tuple[datetime, timedelta, bool]:
+    """Return (moment, span covered by its precision, whether it was a bare time of day)"""
+    match = _TIME_OF_DAY_RE.match(text)
+    if match:
+        hours, minutes, seconds, fraction = match.groups()
+        moment = datetime.combine(day, datetime.min.time()).replace(
+            hour=int(hours), minute=int(minutes), second=int(seconds or 0),
+            microsecond=int((fraction or '0').ljust(6, '0')))
+        return moment, _precision(seconds, fraction), True
+
+    if _DATE_RE.match(text):
+        return datetime.strptime(text, '%Y-%m-%d'), timedelta(days=1), False
+
+    match = _DATETIME_PRECISION_RE.match(text)
+    if not match:
+        raise ValueError(f"not a time, date or ISO datetime: '{text}'")
+    minutes, seconds, fraction = match.groups()
+    iso = text.replace(',', '.')
+    iso = iso[:-1] + '+00:00' if iso.endswith('Z') else iso
+    if fraction and len(fraction) not in (3, 6):
+        # Older fromisoformat versions only take milliseconds or microseconds
+        iso = iso.replace('.' + fraction, '.' + fraction[:6].ljust(6, '0'), 1)
+    try:
+        moment = datetime.fromisoformat(iso)
+    except ValueError:
+        raise ValueError(f"not a time, date or ISO datetime: '{text}'") from None
+    span = _precision(seconds, fraction) if minutes else timedelta(hours=1)
+    return moment, span, False
+
+
+def _precision(seconds: Optional[str], fraction: Optional[str]) -> timedelta:
+    if fraction:
+        return timedelta(microseconds=10 ** (6 - min(len(fraction), 6)))
+    return timedelta(seconds=1) if seconds else timedelta(minutes=1)
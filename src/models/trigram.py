@@ -0,0 +1,128 @@
+"""
+Trigram Index
+Substring search index over case-folded raw log lines
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.config import TRIGRAM_BLOCK_LINES, TRIGRAM_MAX_POSTINGS
+from src.models.indexes import intersect_sorted
+
+_EMPTY = array('I')
+
+Trigram = Tuple[str, str, str]
+
+
+def trigrams(text: str) -> Set[Trigram]:
+    """Return the set of 3-character windows of case-folded text"""
+    folded = text.lower()
+    return set(zip(folded, folded[1:], folded[2:]))
+
+
+class TrigramIndex:
+    """
+    Maps each trigram of the lower-cased raw lines to the blocks containing it.
+
+    Entries are grouped into blocks of `block_lines` consecutive ids, and a
+    posting list holds block numbers rather than entry ids. A query returns
+    every entry of the blocks containing all of its trigrams; callers confirm
+    those candidates with a real substring test. Blocks keep the index a
+    fraction of the size of a per-line index.
+
+    Once more than `max_postings` postings have been stored the index gives
+    up: it frees its postings, sets `overflowed` and answers no queries.
+    """
+
+    def __init__(self, block_lines: int = TRIGRAM_BLOCK_LINES,
+                 max_postings: int = TRIGRAM_MAX_POSTINGS):
+        self.block_lines = block_lines
+        self.max_postings = max_postings
+        self.postings: Dict[Trigram, array] = {}
+        self.size = 0
+        self.overflowed = False
+
+        self._pending_block = -1
+        self._pending: List[str] = []
+
+    def add(self, entry_id: int, text: str):
+        """Index an entry; ids must be added in ascending order"""
+        if self.overflowed:
+            return
+
+        block = entry_id // self.block_lines
+        if block != self._pending_block:
+            self.flush()
+            self._pending_block = block
+        self._pending.append(text)
+
+    def flush(self):
+        """Write the trigrams of the block being built to the posting lists"""
+        if not self._pending:
+            return
+
+        block = self._pending_block
+        postings = self.postings
+        # Joining the block's lines costs one trigram pass instead of one per line
+        for gram in trigrams('\n'.join(self._pending)):
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array('I')
+            if not posting or posting[-1] < block:
+                posting.append(block)
+                self.size += 1
+            else:
+                self._insert(posting, block)
+
+        self._pending = []
+        self._check_size()
+
+    def insert(self, entry_id: int, text: str):
+        """Index an entry out of order (e.g. after an edit)"""
+        if self.overflowed:
+            return
+
+        self.flush()
+        block = entry_id // self.block_lines
+        for gram in trigrams(text):
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = array('I')
+            self._insert(posting, block)
+        self._check_size()
+
+    def candidates(self, query: str, entry_count: int) -> Optional[array]:
+        """
+        Return the ascending ids that may contain `query`, or None when the
+        index cannot answer (query shorter than 3 characters, or overflowed).
+        """
+        grams = trigrams(query)
+        if self.overflowed or not grams:
+            return None
+
+        self.flush()
+        lists = sorted((self.postings.get(gram, _EMPTY) for gram in grams), key=len)
+        blocks = lists[0]
+        for posting in lists[1:]:
+            if not blocks:
+                break
+            blocks = intersect_sorted(blocks, posting)
+
+        size = self.block_lines
+        ids = array('I')
+        for block in blocks:
+            ids.extend(range(block * size, min(block * size + size, entry_count)))
+        return ids
+
+    def _insert(self, posting: array, block: int):
+        i = bisect_left(posting, block)
+        if i == len(posting) or posting[i] != block:
+            posting.insert(i, block)
+            self.size += 1
+
+    def _check_size(self):
+        if self.size > self.max_postings:
+            self.overflowed = True
+            self.postings = {}
+            self._pending = []
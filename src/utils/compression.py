@@ -0,0 +1,257 @@
+"""
+Compressed Logs
+Streaming decompression of gzip, bzip2 and xz logs, chosen by magic bytes
+"""
+
+import bz2
+import gzip
+import lzma
+import zlib
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from src.config import COMPRESSED_BLOCK_SIZE, COMPRESSED_CHECKPOINT_BYTES
+
+GZIP = 'gzip'
+BZIP2 = 'bz2'
+XZ = 'xz'
+
+_MAGIC = ((b'\x1f\x8b', GZIP), (b'BZh', BZIP2), (b'\xfd7zXZ\x00', XZ))
+GZIP_MEMBER_MAGIC = b'\x1f\x8b\x08'
+
+_OPENERS = {GZIP: gzip.open, BZIP2: bz2.open, XZ: lzma.open}
+
+
+def detect_compression(file_path: Union[str, Path]) -> Optional[str]:
+    """Return the compression of a file from its magic bytes, or None for plain text"""
+    with open(file_path, 'rb') as f:
+        head = f.read(6)
+    for magic, kind in _MAGIC:
+        if head.startswith(magic):
+            return kind
+    return None
+
+
+def open_compressed(file_path: Union[str, Path], kind: str, mode: str = 'rb') -> BinaryIO:
+    return _OPENERS[kind](file_path, mode)
+
+
+def new_decompressor(kind: str):
+    if kind == GZIP:
+        return zlib.decompressobj(wbits=31)
+    if kind == BZIP2:
+        return bz2.BZ2Decompressor()
+    return lzma.LZMADecompressor()
+
+
+class Checkpoint(NamedTuple):
+    """A point where decompression can resume without starting over"""
+    offset: int  # Decompressed offset
+    compressed_offset: int  # Next compressed byte to feed
+    state: Any = None  # Copy of a zlib decompressor, or None at a member start
+
+
+class DecompressedStream:
+    """
+    Iterates over the decompressed blocks of a file from a checkpoint.
+
+    Members (gzip) and streams (bzip2, xz) that follow each other are decoded
+    in turn, as `gzip.open` and friends do. When `checkpoints` is given, a
+    checkpoint is appended about every `spacing` decompressed bytes: at a
+    member start if one comes along, otherwise (gzip only) as a copy of the
+    zlib state. With `stop`, no member starting at or past that compressed
+    offset is decoded.
+
+    `offset` and `compressed_offset` track the progress of the iteration.
+    """
+
+    def __init__(self, f: BinaryIO, kind: str, start: Checkpoint = Checkpoint(0, 0),
+                 checkpoints: Optional[List[Checkpoint]] = None, stop: Optional[int] = None,
+                 spacing: int = COMPRESSED_CHECKPOINT_BYTES, copy_state: bool = True,
+                 block_size: int = COMPRESSED_BLOCK_SIZE):
+        self.f = f
+        self.kind = kind
+        self.start = start
+        self.checkpoints = checkpoints
+        self.stop = stop
+        self.spacing = spacing
+        self.copy_state = copy_state and kind == GZIP
+        self.block_size = block_size
+
+        self.offset = start.offset
+        self.compressed_offset = start.compressed_offset
+
+    def __iter__(self) -> Iterator[bytes]:
+        f = self.f
+        f.seek(self.start.compressed_offset)
+        decompressor = self.start.state.copy() if self.start.state is not None else None
+        last_checkpoint = self.offset
+        data = b''
+        in_member = decompressor is not None
+
+        while True:
+            if not data:
+                data = f.read(self.block_size)
+                if not data:
+                    if in_member:
+                        raise EOFError("Compressed file ended before the end-of-stream marker "
+                                       "was reached")
+                    return
+                self.compressed_offset += len(data)
+
+            if not in_member:
+                # Between members: skip zero padding, stop at `stop`, start the next member
+                stripped = data.lstrip(b'\x00')
+                if not stripped:
+                    data = b''
+                    continue
+                member_start = self.compressed_offset - len(stripped)
+                if self.stop is not None and member_start >= self.stop:
+                    self.compressed_offset = member_start
+                    return
+                data = stripped
+                decompressor = new_decompressor(self.kind)
+                in_member = True
+                if self.checkpoints is not None and self.offset - last_checkpoint >= self.spacing:
+                    self.checkpoints.append(Checkpoint(self.offset, member_start))
+                    last_checkpoint = self.offset
+
+            out = decompressor.decompress(data)
+            if decompressor.eof:
+                data = decompressor.unused_data
+                in_member = False
+            else:
+                data = b''
+
+            if out:
+                self.offset += len(out)
+                yield out
+
+            if (in_member and self.copy_state and self.checkpoints is not None
+                    and self.offset - last_checkpoint >= self.spacing):
+                # All input so far is consumed, so the state resumes at compressed_offset
+                self.checkpoints.append(Checkpoint(self.offset, self.compressed_offset,
+                                                   decompressor.copy()))
+                last_checkpoint = self.offset
+
+
+def find_gzip_member(f: BinaryIO, start: int, end: int,
+                     min_output: int = COMPRESSED_BLOCK_SIZE) -> Optional[int]:
+    """
+    Return the first offset in [start, end) where a gzip member decodes, or None.
+
+    The gzip magic can also occur inside compressed data; such false starts
+    fail to decode and are skipped. A candidate is accepted once its member
+    is complete (CRC checked) or has produced `min_output` bytes cleanly.
+    """
+    f.seek(start)
+    window = f.read(end - start + len(GZIP_MEMBER_MAGIC) - 1)
+    position = window.find(GZIP_MEMBER_MAGIC)
+    while 0 <= position < end - start:
+        candidate = start + position
+        stream = DecompressedStream(f, GZIP, Checkpoint(0, candidate), stop=candidate + 1)
+        try:
+            for _ in stream:
+                if stream.offset >= min_output:
+                    break
+            return candidate
+        except (zlib.error, EOFError):
+            position = window.find(GZIP_MEMBER_MAGIC, position + 1)
+    return None
+
+
+class CompressedSource:
+    """
+    Random access to the decompressed lines of a compressed file.
+
+    Checkpoints passed in (usually recorded while loading) are completed with
+    the ones recorded while reading, so a region that was decompressed once
+    can be reached again from a nearby checkpoint.
+    """
+
+    def __init__(self, file_path: Union[str, Path], kind: str,
+                 checkpoints: Optional[List[Checkpoint]] = None,
+                 spacing: int = COMPRESSED_CHECKPOINT_BYTES):
+        self.file_path = Path(file_path)
+        self.kind = kind
+        self.spacing = spacing
+        self.checkpoints = list(checkpoints or ())
+        if not self.checkpoints or self.checkpoints[0].offset > 0:
+            self.checkpoints.insert(0, Checkpoint(0, 0))
+        self._starts = [checkpoint.offset for checkpoint in self.checkpoints]
+        self._file = None
+
+    def read_lines(self, offsets: Iterable[int]) -> Iterator[bytes]:
+        """
+        Yield the raw line starting at each of the ascending decompressed offsets.
+
+        Decompression runs forward from the checkpoint before the first
+        offset, and restarts at a later checkpoint whenever that skips data.
+        """
+        if self._file is None:
+            self._file = open(self.file_path, 'rb')
+
+        blocks = None
+        buffer, buffer_start, position = b'', 0, 0
+        learned: List[Checkpoint] = []
+
+        try:
+            for offset in offsets:
+                checkpoint = self.checkpoints[bisect_right(self._starts, offset) - 1]
+                if (blocks is None or offset < buffer_start + position
+                        or checkpoint.offset > buffer_start + len(buffer)):
+                    self._learn(learned)
+                    blocks = iter(DecompressedStream(self._file, self.kind, checkpoint, learned,
+                                                     spacing=self.spacing))
+                    buffer, buffer_start, position = b'', checkpoint.offset, 0
+
+                buffer, buffer_start, position, line = self._read_line(blocks, buffer, buffer_start,
+                                                                       offset)
+                yield line
+        finally:
+            self._learn(learned)
+
+    @staticmethod
+    def _read_line(blocks: Iterator[bytes], buffer: bytes, buffer_start: int, offset: int):
+        """Advance the blocks to the line at `offset`; return the buffer state and line"""
+        # Skip to the line start
+        while buffer_start + len(buffer) <= offset:
+            buffer_start += len(buffer)
+            buffer = next(blocks, None)
+            if buffer is None:
+                buffer = b''
+                break
+        position = offset - buffer_start
+
+        # Read up to the end of the line
+        end = buffer.find(b'\n', position)
+        while end < 0:
+            block = next(blocks, None)
+            if block is None:
+                end = len(buffer) - 1
+                break
+            search_from = len(buffer)
+            buffer = buffer[position:] + block
+            buffer_start += position
+            search_from -= position
+            position = 0
+            end = buffer.find(b'\n', search_from)
+
+        return buffer, buffer_start, end + 1, buffer[position:end + 1]
+
+    def _learn(self, learned: List[Checkpoint]):
+        """Keep the checkpoints recorded while reading that are not close to a known one"""
+        for checkpoint in learned:
+            i = bisect_right(self._starts, checkpoint.offset)
+            gap = self.spacing // 2
+            if checkpoint.offset - self._starts[i - 1] >= gap and (
+                    i == len(self._starts) or self._starts[i] - checkpoint.offset >= gap):
+                self.checkpoints.insert(i, checkpoint)
+                self._starts.insert(i, checkpoint.offset)
+        learned.clear()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,252 @@
+"""
+Export
+Writes a selection of entries as raw text, JSON lines, CSV or a binary columnar file
+"""
+
+import csv
+import io
+import json
+import math
+import os
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from src.config import EXPORT_BATCH_LINES, EXPORT_BUFFER_BYTES
+from src.models.entry_store import CODED_FIELDS, NO_STATUS, EntryStore, Ids
+from src.models.timestamps import from_epoch_micros
+from src.utils.compression import BZIP2, GZIP, XZ, detect_compression, open_compressed
+
+EXPORT_TEXT = 'text'
+EXPORT_JSONL = 'jsonl'
+EXPORT_CSV = 'csv'
+EXPORT_COLUMNAR = 'columnar'
+EXPORT_FORMATS = (EXPORT_TEXT, EXPORT_JSONL, EXPORT_CSV, EXPORT_COLUMNAR)
+
+COLUMNAR_MAGIC = b'LVCOL\x01'
+COLUMNAR_VERSION = 1
+
+_FORMAT_SUFFIXES = {'.jsonl': EXPORT_JSONL, '.ndjson': EXPORT_JSONL, '.csv': EXPORT_CSV,
+                    '.lvcol': EXPORT_COLUMNAR}
+_COMPRESSION_SUFFIXES = {'.gz': GZIP, '.bz2': BZIP2, '.xz': XZ}
+
+# Dictionary-coded fields of the JSONL and CSV records, and the store field they come from
+_CODED_RECORD_FIELDS = (('level', 'level'), ('method', 'method'), ('endpoint', 'endpoint'),
+                        ('thread', 'thread'), ('service', 'service_name'),
+                        ('operation', 'operation_type'))
+
+# Store columns written to a columnar export
+_COLUMNS = ('line_numbers', 'timestamps', 'status_codes', 'response_times')
+
+
+def export_format(path: Union[str, Path]) -> Tuple[str, Optional[str]]:
+    """
+    Infer (format, compression) from an output file name: `errors.jsonl.gz`
+    is gzip-compressed JSON lines, anything unrecognised is raw text.
+    """
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    compression = _COMPRESSION_SUFFIXES.get(suffixes[-1]) if suffixes else None
+    if compression:
+        suffixes.pop()
+    output_format = _FORMAT_SUFFIXES.get(suffixes[-1], EXPORT_TEXT) if suffixes else EXPORT_TEXT
+    return output_format, compression
+
+
+def write_export(store: EntryStore, path: Union[str, Path], output_format: str = EXPORT_TEXT,
+                 compression: Optional[str] = None, ids: Optional[Ids] = None) -> int:
+    """
+    Write the entries `ids` (all if None) of a store to `path` and return how many were written.
+
+    Rows are built from the store's columns and raw lines read back in one
+    forward pass, and written in batches of `EXPORT_BATCH_LINES` through a
+    large buffer (or a compressor). The output goes to a temporary file
+    that replaces `path` at the end. The structured formats need the
+    columns loaded.
+    """
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"unknown export format: {output_format}")
+    if output_format != EXPORT_TEXT and not store.columns_loaded:
+        raise ValueError("the fields of this log are not parsed yet")
+    if ids is None:
+        ids = range(len(store))
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with _open_output(tmp_path, compression) as f:
+            if output_format == EXPORT_COLUMNAR:
+                _write_columnar(store, ids, f)
+            else:
+                for chunk in _text_chunks(store, ids, output_format):
+                    f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+    return len(ids)
+
+
+def _open_output(path: Path, compression: Optional[str]) -> BinaryIO:
+    if compression:
+        return open_compressed(path, compression, 'wb')
+    return open(path, 'wb', buffering=EXPORT_BUFFER_BYTES)
+
+
+def _raw_batches(store: EntryStore, ids: Ids) -> Iterator[List[Tuple[int, str]]]:
+    """(entry_id, stripped raw line) pairs in batches"""
+    batch: List[Tuple[int, str]] = []
+    for entry_id, raw_line in store.iter_raw_lines(ids):
+        batch.append((entry_id, raw_line.strip()))
+        if len(batch) >= EXPORT_BATCH_LINES:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _text_chunks(store: EntryStore, ids: Ids, output_format: str) -> Iterator[bytes]:
+    """Encoded output of the row formats, one batch of entries at a time"""
+    if output_format == EXPORT_TEXT:
+        for batch in _raw_batches(store, ids):
+            yield ''.join(raw_line + '\n' for _, raw_line in batch).encode('utf-8')
+        return
+
+    records = _RecordBuilder(store)
+    if output_format == EXPORT_JSONL:
+        dumps = json.JSONEncoder(ensure_ascii=False, default=str).encode
+        for batch in _raw_batches(store, ids):
+            yield ''.join(dumps(records.build(entry_id, raw_line)) + '\n'
+                          for entry_id, raw_line in batch).encode('utf-8')
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(records.fields)
+    for batch in _raw_batches(store, ids):
+        writer.writerows([value if value is not None else ''
+                          for value in records.build(entry_id, raw_line).values()]
+                         for entry_id, raw_line in batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+class _RecordBuilder:
+    """Builds the export record of an entry from the store's columns"""
+
+    def __init__(self, store: EntryStore):
+        self.store = store
+        self.values = [(name, store.codes[field], store.dictionaries[field].values)
+                       for name, field in _CODED_RECORD_FIELDS]
+        self.source_names = [str(source.source) for source in store.sources]
+        self.fields = (['line'] + (['file', 'file_line'] if store.sources else []) +
+                       ['timestamp', 'status', 'response_time'] +
+                       [name for name, _ in _CODED_RECORD_FIELDS] + ['raw'])
+
+    def build(self, entry_id: int, raw_line: str) -> Dict[str, Any]:
+        """The record of an entry, with its fields in `self.fields` order"""
+        store = self.store
+        record: Dict[str, Any] = {'line': store.line_numbers[entry_id]}
+        if self.source_names:
+            record['file'] = self.source_names[store.source_ids[entry_id]]
+            record['file_line'] = store.source_lines[entry_id]
+
+        timestamp = from_epoch_micros(store.timestamps[entry_id])
+        status = store.status_codes[entry_id]
+        response_time = store.response_times[entry_id]
+        record['timestamp'] = timestamp.isoformat() if timestamp else None
+        record['status'] = status if status != NO_STATUS else None
+        # Stored as float32: keep the digits it holds
+        record['response_time'] = (None if math.isnan(response_time)
+                                   else float(f'{response_time:.7g}'))
+        for name, codes, values in self.values:
+            record[name] = values[codes[entry_id]]
+        record['raw'] = raw_line
+        return record
+
+
+# ======================================================
+# Columnar format
+# ======================================================
+class ColumnarExport(NamedTuple):
+    """The contents of a columnar export"""
+    header: Dict[str, Any]
+    columns: Dict[str, array]  # Store column name (or `codes/<field>`) -> values
+    dictionaries: Dict[str, List[Any]]  # Coded field -> values by code (code 0 = None)
+    raw_lines: List[str]
+
+
+def _write_columnar(store: EntryStore, ids: Ids, f: BinaryIO):
+    """
+    Write a columnar export: a magic string, a JSON header (dictionaries,
+    array layout, source files), each column as raw array bytes, then the
+    raw lines, one per line. Columns use the store's encoding: epoch
+    microseconds, status 0 and NaN response times for missing values, and
+    dictionary codes for the coded fields.
+    """
+    names = list(_COLUMNS) + [f'codes/{name}' for name in CODED_FIELDS]
+    if store.sources:
+        names += ['source_ids', 'source_lines']
+
+    def full_column(name: str) -> array:
+        if name.startswith('codes/'):
+            return store.codes[name[len('codes/'):]]
+        return getattr(store, name)
+
+    def column(name: str) -> array:
+        data = full_column(name)
+        if isinstance(ids, range):
+            return data if len(ids) == len(data) else data[ids.start:ids.stop]
+        return array(data.typecode, (data[i] for i in ids))
+
+    header = {
+        'version': COLUMNAR_VERSION,
+        'byteorder': sys.byteorder,
+        'count': len(ids),
+        'dictionaries': {name: store.dictionaries[name].values[1:] for name in CODED_FIELDS},
+        'arrays': [(name, full_column(name).typecode, full_column(name).itemsize, len(ids))
+                   for name in names],
+        'sources': [str(source.source) for source in store.sources],
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, default=str).encode('utf-8')
+    f.write(COLUMNAR_MAGIC)
+    f.write(len(header_bytes).to_bytes(8, 'little'))
+    f.write(header_bytes)
+
+    # One column gathered at a time
+    for name in names:
+        f.write(memoryview(column(name)).cast('B'))
+    for batch in _raw_batches(store, ids):
+        f.write(''.join(raw_line + '\n' for _, raw_line in batch).encode('utf-8'))
+
+
+def read_columnar(path: Union[str, Path]) -> ColumnarExport:
+    """Read a columnar export back, compressed or not (raises ValueError if it is not one)"""
+    compression = detect_compression(path)
+    with (open_compressed(path, compression, 'rb') if compression else open(path, 'rb')) as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError("not a columnar export")
+        header = json.loads(f.read(int.from_bytes(f.read(8), 'little')).decode('utf-8'))
+        if header.get('version') != COLUMNAR_VERSION:
+            raise ValueError(f"unsupported columnar export version: {header.get('version')}")
+
+        columns: Dict[str, array] = {}
+        for name, typecode, itemsize, count in header['arrays']:
+            data = array(typecode)
+            if data.itemsize != itemsize:
+                raise ValueError(f"array item size mismatch for {name}")
+            data.frombytes(f.read(itemsize * count))
+            if len(data) != count:
+                raise ValueError(f"column {name} is truncated")
+            if header['byteorder'] != sys.byteorder:
+                data.byteswap()
+            columns[name] = data
+
+        raw_lines = f.read().decode('utf-8').split('\n')[:header['count']]
+
+    dictionaries = {name: [None] + values for name, values in header['dictionaries'].items()}
+    return ColumnarExport(header, columns, dictionaries, raw_lines)
@@ -0,0 +1,74 @@
+"""
+File Follower
+Incremental reader for a log file that is still being written (tail -f)
+"""
+
+import os
+from pathlib import Path
+from typing import List, Tuple, Union
+
+from src.config import FOLLOW_READ_BYTES
+from src.utils.reader import decode_line
+
+
+class FileFollower:
+    """
+    Reads the complete lines appended to a file since the last poll.
+
+    A trailing line without its newline is left for a later poll, so a line
+    is never split while the writer is in the middle of it. When the path
+    starts naming a different file (rotation) or the file shrinks below the
+    read position (truncation), `check_reset` starts over at the beginning.
+    """
+
+    def __init__(self, file_path: Union[str, Path], position: int = 0, line_count: int = 0):
+        self.file_path = Path(file_path)
+        self.position = position
+        self.line_count = line_count
+        self._file = None
+        self._inode = None
+        self._open()
+
+    def poll(self, max_bytes: int = FOLLOW_READ_BYTES) -> List[Tuple[int, int, str]]:
+        """Return (line_number, byte_offset, text) for the new complete lines"""
+        f = self._file
+        f.seek(self.position)
+        data = f.read(max_bytes)
+        end = data.rfind(b'\n')
+        if end < 0:
+            return []
+
+        lines = []
+        offset = self.position
+        for raw in data[:end].split(b'\n'):
+            self.line_count += 1
+            lines.append((self.line_count, offset, decode_line(raw)))
+            offset += len(raw) + 1
+
+        self.position += end + 1
+        return lines
+
+    def check_reset(self) -> bool:
+        """Return True, and rewind to the start, if the file was rotated or truncated"""
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return False  # Rotated away; the new file is not there yet
+
+        if stat.st_ino == self._inode and stat.st_size >= self.position:
+            return False
+
+        self.close()
+        self._open()
+        self.position = 0
+        self.line_count = 0
+        return True
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self):
+        self._file = open(self.file_path, 'rb')
+        self._inode = os.fstat(self._file.fileno()).st_ino
@@ -16,9 +16,16 @@ def show_help():
 
 ## Viewing
 - `summary` - Show log statistics summary
-- `list [limit]` - List log entries (default: 50)
+- `list [N]` - List log entries, N per page (default: 50)
+- `next` / `prev` - Show the next / previous page
+- `goto <page>` / `goto line <N>` - Jump to a page, or to the page holding a line
 - `view <line_number>` - View detailed entry information
+- `view <first>..<last>` - List the entries on a range of lines
 - `stats` - Alias for summary
+- `latency [endpoint|service|method] [N]` - Response-time p50/p90/p99/max, slowest first
+- `requests [N]` - Request durations per endpoint from paired START/STOP lines
+- `slow-requests [N] [MIN_MS]` - Slowest START/STOP requests, optionally above MIN_MS
+- `follow` - Show lines as they are appended to the file (Ctrl+C to stop)
 
 ## Filtering
 - `filter level <LEVEL>` - Filter by log level (DEBUG, INFO, WARN, ERROR)
@@ -27,14 +34,20 @@ def show_help():
 - `filter thread <NAME>` - Filter by thread name (e.g., http-nio, SimpleAsyncTaskExecutor)
 - `filter service <NAME>` - Filter by service/controller name
 - `filter search <TEXT>` - Search for text in logs (supports Unicode)
+- `filter time <START>..<END>` - Keep a time window, either end optional (10:02:00..10:07:30)
+- `undo` or `pop` - Remove the last filter step
 - `clear` - Clear all filters
 
+Filters stack: each `filter` narrows the current result.
+
 ## Editing
 - `edit <line_number>` - Edit a specific log entry
 - `save [path]` - Save changes to file
 
 ## Export
-- `export <path>` - Export filtered entries to new file
+- `export <path> [format]` - Export filtered entries to new file: raw text, or
+  `jsonl`, `csv` or `columnar` with parsed fields (chosen from the file name if
+  not given: .jsonl, .csv, .lvcol); a .gz, .bz2 or .xz ending compresses it
 
 ## Other
 - `help` - Show this help message
@@ -43,6 +56,8 @@ def show_help():
 ## Examples
 ```
 › filter level ERROR          # Show only errors
+› filter service Payment      # ...from Payment services only
+› undo                        # Back to all errors
 › filter thread http-nio      # Show HTTP request threads
 › filter service BackendInvoiceCntr  # Show specific service logs
 › filter status 404           # Show 404 errors
@@ -65,4 +80,4 @@ def truncate_text(text: str, max_length: int) -> str:
     """Truncate text to max length with ellipsis"""
     if len(text) <= max_length:
         return text
-    return text[:max_length - 3] + "..."
\ No newline at end of file
+    return text[:max_length - 3] + "..."
@@ -0,0 +1,269 @@
+"""
+Parallel Parsing
+Multi-process log parsing over newline-aligned byte ranges
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from src.config import (
+    PARALLEL_CHUNK_BYTES, PARALLEL_GZIP_CHUNK_BYTES, PARALLEL_BATCH_ENTRIES,
+    COMPRESSED_CHECKPOINT_BYTES,
+)
+from src.models.entry_store import EntryStore
+from src.models.log_entry import LogEntry, LogFormat
+from src.utils.compression import (
+    GZIP, Checkpoint, CompressedSource, DecompressedStream, detect_compression, find_gzip_member,
+)
+from src.utils.reader import decode_line, iter_lines, sniff_format, split_lines, split_ranges
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Return the worker count to use; 0 or None means one per CPU core"""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def parse_range(file_path: str, start: int, end: int,
+                kind: Optional[str]) -> Tuple[int, EntryStore]:
+    """
+    Parse one byte range of a file (runs inside a worker process).
+
+    Returns the number of lines in the range and a columnar store of its
+    non-blank entries, with line numbers relative to the start of the range.
+    Stores pickle as a handful of arrays, which keeps the transfer back to the
+    parent process cheap.
+    """
+    log_format = LogFormat(kind)
+    store = EntryStore()
+    line_count = 0
+
+    for line_count, offset, text in iter_lines(file_path, start=start, end=end):
+        if text.strip():
+            store.append(LogEntry(text, line_count, log_format), offset)
+
+    return line_count, store
+
+
+def iter_parallel_chunks(file_path: Union[str, Path], workers: int,
+                         log_format: LogFormat) -> Iterator[Tuple[int, int, EntryStore]]:
+    """
+    Parse a file in a process pool and yield (end_offset, lines_before, chunk) per range.
+
+    Ranges are yielded in file order; `lines_before` is the number of lines
+    preceding the range, so extending a store with each chunk shifted by it
+    gives the same entries as a serial load.
+    """
+    size = Path(file_path).stat().st_size
+    parts = max(workers * 4, -(-size // PARALLEL_CHUNK_BYTES))
+    ranges = split_ranges(file_path, parts)
+    path = str(file_path)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(parse_range, path, start, end, log_format.kind)
+                   for start, end in ranges]
+
+        lines_before = 0
+        for (_, end), future in zip(ranges, futures):
+            line_count, chunk = future.result()
+            yield end, lines_before, chunk
+            lines_before += line_count
+
+
+class GzipChunk(NamedTuple):
+    """The members of a gzip file decoded by one worker"""
+    member_start: int  # Compressed offset of the first member
+    compressed_end: int  # Compressed offset where decoding stopped
+    size: int  # Decompressed bytes
+    head: Optional[bytes]  # Bytes up to the first newline (None if there is none)
+    tail: bytes  # Bytes after the last newline
+    line_count: int  # Lines between head and tail
+    store: EntryStore  # Their entries; offsets relative to the chunk's decompressed start
+    checkpoints: List[Checkpoint]  # Member starts, relative to the chunk's decompressed start
+
+
+def parse_gzip_range(file_path: str, start: int, end: int,
+                     kind: Optional[str]) -> Optional[GzipChunk]:
+    """
+    Decode and parse the gzip members starting in a compressed byte range
+    (runs inside a worker process).
+
+    Members do not follow line boundaries, so the partial lines at both ends
+    are returned as bytes for the parent to join with the neighbouring chunks.
+    Returns None when no member starts in the range.
+    """
+    with open(file_path, 'rb') as f:
+        member = 0 if start == 0 else find_gzip_member(f, start, end)
+        if member is None:
+            return None
+
+        checkpoints = [Checkpoint(0, member)]
+        stream = DecompressedStream(f, GZIP, Checkpoint(0, member), checkpoints, stop=end,
+                                    copy_state=False)
+        blocks = iter(stream)
+
+        head = b''
+        for block in blocks:
+            newline = block.find(b'\n')
+            if newline >= 0:
+                head += block[:newline + 1]
+                rest = block[newline + 1:]
+                break
+            head += block
+        else:
+            return GzipChunk(member, stream.compressed_offset, stream.offset, None, head, 0,
+                             EntryStore(), checkpoints)
+
+        log_format = LogFormat(kind)
+        store = EntryStore()
+        partial: List[bytes] = []
+        line_count = 0
+        for line_count, offset, text in split_lines(chain([rest], blocks), len(head), partial):
+            if text.strip():
+                store.append(LogEntry(text, line_count, log_format), offset)
+
+        return GzipChunk(member, stream.compressed_offset, stream.offset, head, partial[0],
+                         line_count, store, checkpoints)
+
+
+def is_multi_member_gzip(file_path: Union[str, Path],
+                         probe_bytes: int = COMPRESSED_CHECKPOINT_BYTES) -> bool:
+    """Whether a second gzip member starts near the beginning (e.g. BGZF or concatenated files)"""
+    size = Path(file_path).stat().st_size
+    with open(file_path, 'rb') as f:
+        return find_gzip_member(f, 1, min(size, probe_bytes)) is not None
+
+
+def iter_parallel_gzip_chunks(file_path: Union[str, Path], workers: int, log_format: LogFormat,
+                              checkpoints: List[Checkpoint]
+                              ) -> Iterator[Tuple[int, int, int, EntryStore]]:
+    """
+    Parse a multi-member gzip file in a process pool and yield
+    (compressed_offset, lines_before, byte_offset, chunk) in file order.
+
+    Extending a store with each chunk shifted by `lines_before` and
+    `byte_offset` gives the same entries as a serial load. Each worker starts
+    at the first member in its compressed range; if the members found do not
+    chain up, the rest of the file is decoded serially. Random-access
+    checkpoints (decompressed offsets) are appended to `checkpoints`.
+    """
+    size = Path(file_path).stat().st_size
+    parts = max(workers * 4, -(-size // PARALLEL_GZIP_CHUNK_BYTES))
+    bounds = [size * i // parts for i in range(parts + 1)]
+    path = str(file_path)
+
+    expected = 0  # Compressed offset of the next member
+    decompressed = 0
+    lines_before = 0
+    pending = b''
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(parse_gzip_range, path, start, end, log_format.kind)
+                   for start, end in zip(bounds[:-1], bounds[1:]) if start < end]
+
+        for future in futures:
+            chunk = future.result()
+            if chunk is None:
+                continue
+            if chunk.member_start != expected:
+                break
+
+            checkpoints.extend(Checkpoint(decompressed + c.offset, c.compressed_offset)
+                               for c in chunk.checkpoints)
+            if chunk.head is None:
+                pending += chunk.tail
+            else:
+                joined = _single_line(pending + chunk.head, log_format)
+                yield chunk.compressed_end, lines_before, decompressed - len(pending), joined
+                yield chunk.compressed_end, lines_before + 1, decompressed, chunk.store
+                lines_before += 1 + chunk.line_count
+                pending = chunk.tail
+
+            decompressed += chunk.size
+            expected = chunk.compressed_end
+
+        for future in futures:
+            future.cancel()
+
+    if expected < size:
+        # Members did not chain up: decode the rest in this process
+        with open(file_path, 'rb') as f:
+            stream = DecompressedStream(f, GZIP, Checkpoint(decompressed, expected), checkpoints)
+            store = EntryStore()
+            lines = split_lines(chain([pending], stream), decompressed - len(pending))
+            for line_number, offset, text in lines:
+                if text.strip():
+                    store.append(LogEntry(text, line_number, log_format), offset)
+                if len(store) >= PARALLEL_BATCH_ENTRIES:
+                    yield stream.compressed_offset, lines_before, 0, store
+                    store = EntryStore()
+            yield size, lines_before, 0, store
+    elif pending:
+        yield size, lines_before, decompressed - len(pending), _single_line(pending, log_format)
+
+
+def _single_line(raw: bytes, log_format: LogFormat) -> EntryStore:
+    """A store holding one line (at offset 0, line 1), empty if the line is blank"""
+    store = EntryStore()
+    text = decode_line(raw)
+    if text.strip():
+        store.append(LogEntry(text, 1, log_format), 0)
+    return store
+
+
+def parse_file(file_path: str,
+               copy_state: bool = True) -> Tuple[EntryStore, Optional[str], List[Checkpoint]]:
+    """
+    Parse a whole file, plain or compressed, into a store of its own.
+
+    Returns the store, the file's compression and the decompression
+    checkpoints recorded on the way. Worker processes pass `copy_state=False`,
+    since zlib states cannot be sent back to the parent.
+    """
+    compression = detect_compression(file_path)
+    log_format = sniff_format(file_path, compression=compression)
+    store = EntryStore(file_path, log_format)
+    checkpoints: List[Checkpoint] = []
+
+    def add(lines: Iterator[Tuple[int, int, str]]):
+        for line_number, offset, text in lines:
+            if text.strip():
+                store.append(LogEntry(text, line_number, log_format), offset)
+
+    if compression:
+        with open(file_path, 'rb') as f:
+            add(split_lines(DecompressedStream(f, compression, checkpoints=checkpoints,
+                                               copy_state=copy_state)))
+    else:
+        add(iter_lines(file_path))
+
+    return store, compression, checkpoints
+
+
+def iter_parsed_files(file_paths: List[Path], workers: int) -> Iterator[Tuple[int, EntryStore]]:
+    """
+    Parse several files, one per worker process, and yield (index, store) as each finishes.
+
+    Compressed stores come back with a `CompressedSource` for reading their
+    lines, seeded with the checkpoints recorded while parsing.
+    """
+    def attach(result: Tuple[EntryStore, Optional[str], List[Checkpoint]]) -> EntryStore:
+        store, compression, checkpoints = result
+        if compression:
+            store.compressed = CompressedSource(store.source, compression, checkpoints)
+        return store
+
+    if workers <= 1 or len(file_paths) == 1:
+        for index, path in enumerate(file_paths):
+            yield index, attach(parse_file(str(path)))
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(file_paths))) as pool:
+        futures = {pool.submit(parse_file, str(path), False): index
+                   for index, path in enumerate(file_paths)}
+        for future in as_completed(futures):
+            yield futures[future], attach(future.result())
@@ -0,0 +1,150 @@
+"""
+Streaming Queries
+Filters log files in a single pass for batch use (cron jobs, shell pipelines)
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from src.models.log_entry import LogEntry
+from src.models.timestamps import parse_time_range, to_epoch_micros
+from src.utils.compression import detect_compression
+from src.utils.reader import iter_lines, sniff_format
+
+# Output formats of `main.py query`
+FORMAT_RAW = 'raw'
+FORMAT_JSONL = 'jsonl'
+QUERY_FORMATS = (FORMAT_RAW, FORMAT_JSONL)
+
+
+class QueryFilter:
+    """
+    Filter criteria checked against one entry at a time.
+
+    Matching follows the interactive `filter` command: level and method
+    compare case-insensitively, thread and service match a substring,
+    search matches a substring of the raw line, and a line without a
+    timestamp is in a time window when the line before it is. Cheap literal
+    checks on the raw text (`prefilter`) rule most lines out before they are
+    parsed.
+    """
+
+    def __init__(self, level: Optional[str] = None, method: Optional[str] = None,
+                 status_code: Optional[int] = None, thread: Optional[str] = None,
+                 service: Optional[str] = None, search: Optional[str] = None,
+                 since: Optional[str] = None, until: Optional[str] = None):
+        self.level = level.upper() if level else None
+        self.method = method.upper() if method else None
+        self.status_code = status_code
+        self.thread = thread.lower() if thread else None
+        self.service = service.lower() if service else None
+        self.search = search.lower() if search else None
+
+        # `since..until`, resolved per file against its first timestamp
+        self.time_range = f"{since or ''}..{until or ''}" if since or until else None
+        if self.time_range:
+            parse_time_range(self.time_range)  # Raise ValueError for a bad bound now
+
+        # Substrings every matching raw line contains (case-insensitive)
+        self._needles = [needle for needle in (self.search, self.level and self.level.lower())
+                         if needle]
+
+    def prefilter(self, text: str) -> bool:
+        """False when the raw line cannot match, without parsing it"""
+        if not self._needles:
+            return True
+        lowered = text.lower()
+        return all(needle in lowered for needle in self._needles)
+
+    def matches(self, entry: LogEntry) -> bool:
+        """Check the parsed fields of an entry (the time window is checked by `iter_query`)"""
+        if self.level and str(entry.level or '').upper() != self.level:
+            return False
+        if self.method and str(entry.method or '').upper() != self.method:
+            return False
+        if self.status_code and entry.status_code != self.status_code:
+            return False
+        if self.thread and not (entry.thread and self.thread in entry.thread.lower()):
+            return False
+        if self.service and not (entry.service_name and self.service in entry.service_name.lower()):
+            return False
+        return True
+
+
+def iter_query(paths: Iterable[Path], query: QueryFilter,
+               limit: Optional[int] = None) -> Iterator[Tuple[Path, LogEntry]]:
+    """
+    Yield (path, entry) for the matching entries of each file, in file order.
+
+    Files are read in blocks (decompressed on the fly if needed) and each
+    line is parsed, checked and dropped, so memory use does not grow with
+    the input. Reading stops as soon as `limit` entries have matched.
+    """
+    if limit is not None and limit <= 0:
+        return
+    found = 0
+
+    for path in paths:
+        compression = detect_compression(path)
+        log_format = sniff_format(path, compression=compression)
+        window: Optional[Tuple[int, int]] = None
+        key: Optional[int] = None  # Timestamp of the last line that had one
+
+        for line_number, _, text in iter_lines(path, compression=compression):
+            if not text.strip():
+                continue
+
+            if query.time_range:
+                # Every line is parsed to carry timestamps forward
+                entry = LogEntry(text, line_number, log_format)
+                if entry.timestamp is not None:
+                    key = to_epoch_micros(entry.timestamp)
+                    if window is None:
+                        # Bounds without an offset are read on the file's clock
+                        window = parse_time_range(query.time_range, key,
+                                                  entry.timestamp.utcoffset())
+                if key is None or not window[0] <= key <= window[1]:
+                    continue
+                if not query.prefilter(text):
+                    continue
+            else:
+                if not query.prefilter(text):
+                    continue
+                entry = LogEntry(text, line_number, log_format)
+
+            if query.search and query.search not in entry.raw_line.lower():
+                continue
+            if not query.matches(entry):
+                continue
+
+            yield path, entry
+            found += 1
+            if limit is not None and found >= limit:
+                return
+
+
+def entry_record(path: Path, entry: LogEntry) -> Dict[str, Any]:
+    """The JSON object written for an entry by `--format jsonl`"""
+    return {
+        'file': str(path),
+        'line': entry.line_number,
+        'timestamp': entry.timestamp.isoformat() if entry.timestamp else None,
+        'level': entry.level,
+        'method': entry.method,
+        'endpoint': entry.endpoint,
+        'status': entry.status_code,
+        'response_time': entry.response_time,
+        'thread': entry.thread,
+        'service': entry.service_name,
+        'message': entry.display_message,
+        'raw': entry.raw_line,
+    }
+
+
+def format_entry(path: Path, entry: LogEntry, output_format: str = FORMAT_RAW,
+                 prefix: bool = False) -> str:
+    """Render one query result as a line of output (without the newline)"""
+    if output_format == FORMAT_JSONL:
+        return json.dumps(entry_record(path, entry), ensure_ascii=False, default=str)
+    return f"{path}:{entry.raw_line}" if prefix else entry.raw_line
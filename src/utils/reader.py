@@ -0,0 +1,204 @@
+"""
+Log Reader
+Streaming, block-based line reader for large log files
+"""
+
+import glob
+import re
+from array import array
+from itertools import accumulate, chain, compress, count, islice
+from operator import add
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from src.config import READ_BLOCK_SIZE, FORMAT_SNIFF_LINES, INDEX_CACHE_SUFFIX
+from src.models.log_entry import LogEntry, LogFormat, detect_format
+from src.utils.compression import DecompressedStream
+
+# A line holding only whitespace, after the newline that ends the line before it
+_SPACE_LINE_RE = re.compile(rb'\n[ \t\r\f\v]+(?=\n|\Z)')
+
+
+def iter_lines(file_path: Union[str, Path], block_size: int = READ_BLOCK_SIZE,
+               start: int = 0, end: Optional[int] = None,
+               compression: Optional[str] = None) -> Iterator[Tuple[int, int, str]]:
+    """
+    Yield (line_number, byte_offset, text) for every line of a file.
+
+    The file is read in binary blocks of `block_size` bytes, so memory use is
+    bounded by the block size rather than the file size. Lines are decoded as
+    UTF-8 with replacement and lose their line terminator (LF or CRLF).
+
+    `start` and `end` restrict reading to a byte range, which should be aligned
+    to line starts (see `split_ranges`); line numbers then count from 1 at
+    `start`.
+
+    With `compression` the file is decompressed as it is read, and offsets
+    are positions in the decompressed data (ranges are not supported).
+    """
+    with open(file_path, 'rb') as f:
+        if compression:
+            blocks = DecompressedStream(f, compression)
+        else:
+            blocks = _iter_blocks(f, block_size, start, end)
+        yield from split_lines(blocks, start)
+
+
+def _iter_blocks(f: BinaryIO, block_size: int, start: int, end: Optional[int]) -> Iterator[bytes]:
+    remaining = None if end is None else end - start
+    f.seek(start)
+    while remaining is None or remaining > 0:
+        block = f.read(block_size if remaining is None else min(block_size, remaining))
+        if not block:
+            return
+        if remaining is not None:
+            remaining -= len(block)
+        yield block
+
+
+def split_lines(blocks: Iterable[bytes], offset: int = 0,
+                partial: Optional[List[bytes]] = None) -> Iterator[Tuple[int, int, str]]:
+    """
+    Split a stream of byte blocks into (line_number, byte_offset, text).
+
+    A last line without a newline is yielded too, unless a `partial` list is
+    given to receive its bytes instead.
+    """
+    line_number = 0
+    pending = b''
+
+    for block in blocks:
+        lines = (pending + block).split(b'\n') if pending else block.split(b'\n')
+        pending = lines.pop()
+
+        for raw in lines:
+            line_number += 1
+            yield line_number, offset, decode_line(raw)
+            offset += len(raw) + 1
+
+    if partial is not None:
+        partial.append(pending)
+    elif pending:
+        yield line_number + 1, offset, decode_line(pending)
+
+
+def index_lines(data, block_size: int = READ_BLOCK_SIZE) -> Tuple[array, array]:
+    """
+    Return (line_numbers, offsets) of the non-blank lines of a byte buffer.
+
+    Meant for a memory-mapped file: nothing is decoded, and no Python code
+    runs per line. The buffer is copied a block (cut after its last newline)
+    at a time and split in C; offsets are running sums of the line lengths,
+    and blank lines are dropped with `itertools.compress`.
+    """
+    line_numbers = array('q')
+    offsets = array('q')
+    size = len(data)
+    position = 0
+    line_number = 1
+
+    while position < size:
+        end = data.rfind(b'\n', position, position + block_size) + 1
+        if end <= position:
+            # A line longer than the block
+            end = data.find(b'\n', position + block_size) + 1 or size
+        block = data[position:end]
+        lengths = list(map(len, block.split(b'\n')))
+        if end < size or not lengths[-1]:
+            lengths.pop()  # Empty text after the last newline, not a line
+
+        # Empty lines are dropped by length; lines of only spaces are rare
+        keep = bytearray(map(bool, lengths))
+        if lengths and block[:lengths[0]].isspace():
+            keep[0] = 0
+        index = previous = 0
+        for match in _SPACE_LINE_RE.finditer(block):
+            index += block.count(b'\n', previous, match.end())
+            previous = match.end()
+            keep[index] = 0
+
+        starts = map(add, accumulate(chain((position,), lengths)), range(len(lengths)))
+        if 0 in keep:
+            line_numbers.extend(compress(count(line_number), keep))
+            offsets.extend(compress(starts, keep))
+        else:
+            line_numbers.extend(range(line_number, line_number + len(lengths)))
+            offsets.extend(starts)
+        line_number += len(lengths)
+        position = end
+
+    return line_numbers, offsets
+
+
+def split_ranges(file_path: Union[str, Path], parts: int) -> List[Tuple[int, int]]:
+    """Split a file into at most `parts` byte ranges that start at line boundaries"""
+    size = Path(file_path).stat().st_size
+    if size == 0:
+        return []
+
+    bounds = [0]
+    with open(file_path, 'rb') as f:
+        for i in range(1, parts):
+            guess = max(size * i // parts, bounds[-1], 1)
+            f.seek(guess - 1)
+            f.readline()  # Move to the start of the line after the guess
+            pos = f.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def expand_paths(patterns: Union[str, Path, Iterable[Union[str, Path]]]) -> List[Path]:
+    """
+    Expand file paths and glob patterns (e.g. `app.log*`) into a list of files.
+
+    Existing paths are taken as they are, so names containing glob characters
+    still work. Index cache sidecars and temporary save files matched by a
+    pattern are skipped, and a file named twice is listed once.
+    """
+    if isinstance(patterns, (str, Path)):
+        patterns = [patterns]
+
+    paths: List[Path] = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.exists() or not glob.has_magic(str(pattern)):
+            matches = [path]
+        else:
+            matches = [Path(match) for match in sorted(glob.glob(str(pattern)))
+                       if not match.endswith((INDEX_CACHE_SUFFIX, '.tmp'))
+                       and Path(match).is_file()]
+        paths.extend(match for match in matches if match not in paths)
+    return paths
+
+
+def sniff_format(file_path: Union[str, Path], sample_size: int = FORMAT_SNIFF_LINES,
+                 compression: Optional[str] = None) -> LogFormat:
+    """Detect the dominant log format from the first lines of a file"""
+    lines = iter_lines(file_path, block_size=64 * 1024, compression=compression)
+    sample = (text for _, _, text in lines)
+    try:
+        return detect_format(islice(sample, sample_size))
+    finally:
+        lines.close()
+
+
+def iter_entries(file_path: Union[str, Path],
+                 block_size: int = READ_BLOCK_SIZE) -> Iterator[LogEntry]:
+    """Yield a parsed LogEntry for every non-blank line of a file"""
+    log_format = sniff_format(file_path)
+
+    for line_number, _, text in iter_lines(file_path, block_size):
+        if text.strip():
+            yield LogEntry(text, line_number, log_format)
+
+
+def decode_line(raw: bytes) -> str:
+    """Decode one raw line, dropping its line terminator"""
+    if raw.endswith(b'\n'):
+        raw = raw[:-1]
+    if raw.endswith(b'\r'):
+        raw = raw[:-1]
+    return raw.decode('utf-8', errors='replace')
@@ -0,0 +1,106 @@
+"""
+Splicing
+Rewrites a file with some of its lines replaced, copying the rest in the kernel
+"""
+
+import errno
+import os
+from typing import BinaryIO, List, Sequence, Tuple
+
+from src.config import READ_BLOCK_SIZE, SPLICE_CHUNK_BYTES
+
+# Errors meaning a copy call cannot be used for these files (not that the copy failed)
+_UNSUPPORTED_ERRNOS = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP,
+                       getattr(errno, 'ENOTSOCK', errno.EINVAL),
+                       getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP)}
+
+# Copy calls found not to work here; tried again in the next process only
+_unsupported = set()
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    return os.copy_file_range(src_fd, dst_fd, count, offset)
+
+
+def _sendfile(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    return os.sendfile(dst_fd, src_fd, offset, count)
+
+
+def _read_write(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    if hasattr(os, 'pread'):
+        data = os.pread(src_fd, min(count, READ_BLOCK_SIZE), offset)
+    else:
+        # Leave the source position where it was, as the other calls do
+        position = os.lseek(src_fd, 0, os.SEEK_CUR)
+        os.lseek(src_fd, offset, os.SEEK_SET)
+        data = os.read(src_fd, min(count, READ_BLOCK_SIZE))
+        os.lseek(src_fd, position, os.SEEK_SET)
+    view = memoryview(data)
+    while view:
+        view = view[os.write(dst_fd, view):]
+    return len(data)
+
+
+_COPIERS = [copier for name, copier in (('copy_file_range', _copy_file_range),
+                                        ('sendfile', _sendfile))
+            if hasattr(os, name)] + [_read_write]
+
+
+def copy_range(src_fd: int, dst_fd: int, offset: int, count: int):
+    """
+    Copy `count` bytes at `offset` of one file to the current position of another.
+
+    `os.copy_file_range` copies inside the kernel (sharing extents on file
+    systems that support it); `os.sendfile` is next, and plain reads and
+    writes are the last resort. The bytes land at the destination's file
+    position, which moves past them; the source's position is left as is.
+    """
+    while count > 0:
+        copier = next(copier for copier in _COPIERS if copier not in _unsupported)
+        try:
+            copied = copier(src_fd, dst_fd, offset, min(count, SPLICE_CHUNK_BYTES))
+        except OSError as e:
+            if copier is _read_write or e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            copied = 0
+
+        if not copied:
+            if copier is _read_write:
+                raise EOFError(f"source ended {count} bytes early")
+            # Some file systems report 0 instead of an error: use the next call
+            _unsupported.add(copier)
+            continue
+        offset += copied
+        count -= copied
+
+
+def splice_lines(src: BinaryIO, dst: BinaryIO, replacements: Sequence[Tuple[int, str]],
+                 size: int) -> List[Tuple[int, int]]:
+    """
+    Write the first `size` bytes of `src` to `dst`, with the lines starting at
+    the given ascending offsets replaced by new text.
+
+    Only the replaced lines are read and encoded. Each one keeps the line
+    ending of the line it replaces, and everything between them is copied
+    with `copy_range`. `dst` must be unbuffered. Returns (offset, size
+    change) for each replaced line.
+    """
+    src_fd, dst_fd = src.fileno(), dst.fileno()
+    changes = []
+    position = 0
+
+    for offset, text in replacements:
+        src.seek(offset)
+        old = src.readline()
+        ending = old[len(old.rstrip(b'\r\n')):]
+        new = text.strip().encode('utf-8') + ending
+
+        copy_range(src_fd, dst_fd, position, offset - position)
+        view = memoryview(new)
+        while view:
+            view = view[dst.write(view):]
+        changes.append((offset, len(new) - len(old)))
+        position = offset + len(old)
+
+    copy_range(src_fd, dst_fd, position, size - position)
+    return changes
@@ -0,0 +1,145 @@
+"""
+Unit tests for reading compressed logs
+"""
+
+import bz2
+import gzip
+import lzma
+import pytest
+import src.log_viewer
+import src.utils.parallel
+from src.log_viewer import LogViewer
+from src.utils.compression import (
+    GZIP, BZIP2, XZ, CompressedSource, DecompressedStream, detect_compression, find_gzip_member,
+)
+
+LINES = [
+    f"2024-01-20 10:{i // 60:02d}:{i % 60:02d} {('INFO', 'WARNING', 'ERROR')[i % 3]} "
+    f"GET /api/items/{i} {(200, 404, 500)[i % 3]} {i % 97}ms"
+    for i in range(3000)
+]
+LINES[10] = ""
+DATA = ("\n".join(LINES) + "\n").encode("utf-8")
+
+
+def write_members(path, data, size):
+    """Write `data` as gzip members of `size` bytes each (like BGZF), ignoring line boundaries"""
+    with open(path, "wb") as f:
+        for start in range(0, len(data), size):
+            f.write(gzip.compress(data[start:start + size]))
+
+
+def load(path, workers=1):
+    viewer = LogViewer(str(path), workers=workers, index_cache=False)
+    viewer.load(preview=False)
+    return viewer
+
+
+def columns(viewer):
+    store = viewer.entries
+    return (list(store.line_numbers), list(store.offsets), list(store.timestamps),
+            list(store.status_codes), {name: list(codes) for name, codes in store.codes.items()})
+
+
+@pytest.fixture
+def plain(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(DATA)
+    return load(path)
+
+
+class TestDecompression:
+    """Test detection, streaming and random access"""
+
+    @pytest.mark.parametrize("kind, compress", [
+        (GZIP, gzip.compress), (BZIP2, bz2.compress), (XZ, lzma.compress),
+    ])
+    def test_detect_and_stream(self, tmp_path, kind, compress):
+        path = tmp_path / "app.log.z"
+        path.write_bytes(compress(DATA[:5000]) + compress(DATA[5000:]))
+        assert detect_compression(path) == kind
+
+        with open(path, "rb") as f:
+            assert b"".join(DecompressedStream(f, kind, block_size=1024)) == DATA
+
+    def test_plain_file_is_not_compressed(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_bytes(DATA)
+        assert detect_compression(path) is None
+
+    def test_truncated_file(self, tmp_path):
+        path = tmp_path / "app.log.gz"
+        path.write_bytes(gzip.compress(DATA)[:-20])
+        with open(path, "rb") as f, pytest.raises(EOFError):
+            for _ in DecompressedStream(f, GZIP):
+                pass
+
+    def test_find_gzip_member(self, tmp_path):
+        path = tmp_path / "app.log.gz"
+        write_members(path, DATA, 20000)
+        second = len(gzip.compress(DATA[:20000]))
+        with open(path, "rb") as f:
+            assert find_gzip_member(f, 1, path.stat().st_size) == second
+            assert find_gzip_member(f, 1, second) is None
+
+    @pytest.mark.parametrize("members", [False, True])
+    def test_random_access_through_checkpoints(self, tmp_path, members):
+        path = tmp_path / "app.log.gz"
+        if members:
+            write_members(path, DATA, 7000)
+        else:
+            path.write_bytes(gzip.compress(DATA))
+
+        checkpoints = []
+        with open(path, "rb") as f:
+            for _ in DecompressedStream(f, GZIP, checkpoints=checkpoints, spacing=10000,
+                                        block_size=512):
+                pass
+        assert len(checkpoints) > 5
+
+        source = CompressedSource(path, GZIP, checkpoints)
+        starts = [0] + [i + 1 for i, byte in enumerate(DATA) if byte == ord("\n")][:-1]
+        wanted = starts[5::400] + starts[-1:]
+        expected = [DATA[start:DATA.index(b"\n", start) + 1] for start in wanted]
+        assert list(source.read_lines(wanted)) == expected
+        assert [next(source.read_lines([start])) for start in reversed(wanted)] == expected[::-1]
+        source.close()
+
+
+class TestCompressedViewer:
+    """Test that compressed logs load exactly like the plain file"""
+
+    @pytest.mark.parametrize("suffix, compress", [(".gz", gzip.compress), (".bz2", bz2.compress),
+                                                  (".xz", lzma.compress)])
+    def test_load_matches_plain(self, tmp_path, plain, suffix, compress):
+        path = tmp_path / ("app.log" + suffix)
+        path.write_bytes(compress(DATA))
+        viewer = load(path)
+
+        assert columns(viewer) == columns(plain)
+        assert viewer.entries.raw_line(2000) == plain.entries.raw_line(2000)
+        assert (list(viewer.entries.where_text("items/2999"))
+                == list(plain.entries.where_text("items/2999")))
+
+    def test_parallel_gzip_members(self, tmp_path, plain, monkeypatch):
+        monkeypatch.setattr(src.log_viewer, "PARALLEL_MIN_BYTES", 0)
+        monkeypatch.setattr(src.utils.parallel, "PARALLEL_GZIP_CHUNK_BYTES", 2000)
+        path = tmp_path / "app.log.gz"
+        write_members(path, DATA, 3001)
+
+        viewer = load(path, workers=2)
+        assert columns(viewer) == columns(plain)
+        assert len(viewer.entries.compressed.checkpoints) > 1
+        assert [raw for _, raw in viewer.entries.iter_raw_lines()] == \
+               [raw for _, raw in plain.entries.iter_raw_lines()]
+
+    def test_save_keeps_compression(self, tmp_path):
+        path = tmp_path / "app.log.gz"
+        path.write_bytes(gzip.compress(DATA))
+        viewer = load(path)
+        viewer.edit_entry(1, "2024-01-20 09:00:00 ERROR edited 500 1ms")
+        viewer.save()
+
+        saved = gzip.decompress(path.read_bytes()).decode("utf-8").splitlines()
+        assert saved[0] == "2024-01-20 09:00:00 ERROR edited 500 1ms"
+        assert viewer.entries.raw_line(1) == LINES[1]
@@ -0,0 +1,232 @@
+"""
+Unit tests for the columnar EntryStore
+"""
+
+import math
+import pytest
+from array import array
+from collections import Counter
+from src.models.entry_store import EntryStore, EntrySelection, NO_TIMESTAMP, to_epoch_micros
+from src.models.log_entry import LogEntry
+from src.utils.reader import iter_lines
+
+
+LINES = [
+    "10:30:45.123 [http-nio-8080-exec-1] INFO c.e.Cntr :: BackendInvoiceCntr: INV001 "
+    "Response Code : 200 took 35ms",
+    "",
+    "2024-01-20 10:30:46 ERROR POST /api/orders 500 120ms",
+    '{"level": "WARN", "method": "GET", "status": 404, "message": "missing"}',
+    "plain text without fields",
+]
+
+
+def build_store(path):
+    store = EntryStore(path)
+    for line_number, offset, text in iter_lines(path):
+        if text.strip():
+            store.append(LogEntry(text, line_number), offset)
+    return store
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+    return build_store(path)
+
+
+class TestEntryStore:
+    """Test column building and entry views"""
+
+    def test_columns(self, store):
+        assert len(store) == 4
+        assert list(store.line_numbers) == [1, 3, 4, 5]
+        assert list(store.status_codes) == [200, 500, 404, 0]
+        assert store.response_times[0] == 35.0 and math.isnan(store.response_times[2])
+        assert store.timestamps[2] == NO_TIMESTAMP
+        assert store.dictionaries['level'].decode(store.codes['level'][1]) == "ERROR"
+
+    def test_entry_views_match_direct_parse(self, store):
+        for entry, text in zip(store, [line for line in LINES if line]):
+            direct = LogEntry(text, entry.line_number)
+            assert entry.raw_line == direct.raw_line
+            assert entry.level == direct.level
+            assert entry.status_code == direct.status_code
+            assert entry.message == direct.message
+
+    def test_indexing_and_slicing(self, store):
+        assert store[-1].raw_line == "plain text without fields"
+        assert isinstance(store[1:3], EntrySelection)
+        assert [e.line_number for e in store[1:3]] == [3, 4]
+
+    def test_find_line(self, store):
+        assert store.find_line(4) == 2
+        assert store.find_line(2) is None
+
+    def test_find_line_across_blank_lines(self, tmp_path):
+        path = tmp_path / "gaps.log"
+        lines = ["", "first"] + ["", "", "x"] * 20 + ["last"]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        store = build_store(path)
+
+        for entry_id, line_number in enumerate(store.line_numbers):
+            assert store.find_line(line_number) == entry_id
+        assert store.find_line(1) is None
+        assert store.find_line(3) is None
+        assert store.find_line(len(lines) + 1) is None
+
+    def test_line_range(self, store):
+        assert list(store.line_range(1, 3)) == [0, 1]
+        assert list(store.line_range(2, 2)) == []
+        assert list(store.line_range(4, 100)) == [2, 3]
+
+    def test_update_rederives_columns(self, store):
+        entry = store.update(3, "2024-01-20 10:31:00 ERROR DELETE /api/items 503 5ms")
+
+        assert entry.method == "DELETE"
+        assert store.status_codes[3] == 503
+        assert store.raw_line(3).startswith("2024-01-20 10:31:00")
+        assert store.count_values('level') == {"INFO": 1, "ERROR": 2, "WARN": 1}
+
+    def test_display_messages_are_kept(self, store):
+        assert store.display_message(2) == "missing"
+        assert list(store.display_codes) == [0, 0, 2, 0]  # 1 + dictionary code
+        assert store.display_message(0, store.entry(0)) == store.entry(0).get_display_message(1000)
+
+        appended = LogEntry("2024-01-20 10:32:00 INFO GET /api/users 200 5ms", 7)
+        store.append(appended, 0)
+        assert store.display_message(4, appended) == appended.display_message
+        assert len(store.display_codes) == 5
+
+        store.update(2, '{"level": "WARN", "message": "edited"}')
+        assert store.display_codes[2] == 0
+        assert store.display_message(2) == "edited"
+
+    def test_extend_remaps_codes(self, store):
+        merged = EntryStore(store.source)
+        merged.extend(store)
+        merged.extend(store, line_offset=10)
+
+        assert len(merged) == 8
+        assert list(merged.line_numbers[4:]) == [11, 13, 14, 15]
+        assert merged.count_values('method') == {"POST": 4, "GET": 2}
+
+
+class TestColumnQueries:
+    """Test filters and counts evaluated on columns"""
+
+    def test_where_uses_index_and_columns(self, store):
+        codes = store.dictionaries['level'].codes_where(lambda v: v.upper() == "ERROR")
+        assert list(store.where('level', codes)) == [1]
+        assert list(store.where('status_code', {404, 200})) == [0, 2]
+        assert list(store.where('status_code', {404, 200}, ids=[2, 3])) == [2]
+
+    def test_select_intersects_criteria(self, store):
+        get = store.dictionaries['method'].codes_where(lambda v: v == "GET")
+        post = store.dictionaries['method'].codes_where(lambda v: v == "POST")
+
+        assert list(store.select({'method': get | post})) == [0, 1, 2]
+        assert list(store.select({'method': get | post, 'status_code': {500, 404}})) == [1, 2]
+        assert list(store.select({'method': get | post}, ids=[2, 3])) == [2]
+        assert list(store.select({'status_code': {999}})) == []
+
+    def test_indexes_follow_edits(self, store):
+        store.update(0, "2024-01-20 10:31:00 ERROR DELETE /api/items 500 5ms")
+
+        assert list(store.where('status_code', {500})) == [0, 1]
+        assert store.indexes['status_code'].count(200) == 0
+        error = store.dictionaries['level'].codes_where(lambda v: v == "ERROR")
+        assert list(store.select({'level': error})) == [0, 1]
+
+    def test_where_text_is_case_insensitive(self, store):
+        assert list(store.where_text("INV001")) == [0]
+        assert list(store.where_text("api/ORDERS", ids=[1, 2])) == [1]
+
+    def test_counts_on_selection(self, store):
+        assert store.count_status_codes([0, 1]) == {200: 1, 500: 1}
+        assert store.count_values('thread') == {"http-nio-8080-exec-1": 1}
+
+    @pytest.mark.parametrize("ids", [
+        range(0, 4), range(1, 3), array('I', [1, 2, 3]), array('I', [0, 3]), [2, 0], [], range(0),
+    ])
+    def test_count_codes_matches_column(self, store, ids):
+        for field in ('level', 'status_code', 'method'):
+            expected = Counter(store.column(field)[i] for i in ids)
+            expected.pop(0, None)
+            assert store.count_codes(field, ids) == expected
+
+    def test_counts_follow_edits_and_appends(self, store):
+        selection = EntrySelection(store, store.id_range()[:3])
+        assert selection.count_values('level') == {"INFO": 1, "ERROR": 1, "WARN": 1}
+
+        old_codes = store.entry_codes(1)
+        store.update(1, "2024-01-20 10:30:46 WARN GET /api/orders 200 1ms")
+        selection.recount(1, old_codes, store.entry_codes(1))
+        EntrySelection(store, [3]).recount(1, old_codes, store.entry_codes(1))
+        assert selection.count_values('level') == {"INFO": 1, "WARN": 2}
+        assert selection.count_values('status_code') == {200: 2, 404: 1}
+
+        selection.extend([3])
+        assert selection.count_values('level') == {"INFO": 1, "WARN": 2}
+        assert selection.count_values('method') == {"POST": 1, "GET": 2}
+        for field in ('level', 'method', 'status_code', 'thread'):
+            assert selection.count_values(field) == store.count_values(field, selection.ids)
+        assert (EntrySelection(store).count_values('level')
+                == store.count_values('level', store.id_range()))
+
+
+def test_epoch_micros():
+    from datetime import datetime, timezone
+    assert to_epoch_micros(datetime(1970, 1, 1, 0, 0, 1, 5)) == 1000005
+    assert to_epoch_micros(datetime(1970, 1, 1, 1, tzinfo=timezone.utc)) == 3600000000
+    assert to_epoch_micros(None) == NO_TIMESTAMP
+
+
+class TestEntryStoreTextIndex:
+    """Test text search through the trigram index"""
+
+    def test_where_text_matches_scan(self, store):
+        expected = {text: list(store.where_text(text))
+                    for text in ("orders", "INV001", "missing", "zzz", "ms")}
+        store.build_text_index(block_lines=1)
+        for text, ids in expected.items():
+            assert list(store.where_text(text)) == ids
+        assert list(store.where_text("error", ids=[0, 1])) == [1]
+
+    def test_where_text_after_update(self, store):
+        store.build_text_index(block_lines=1)
+        store.update(3, "plain text mentioning a timeout")
+        assert list(store.where_text("timeout")) == [3]
+        assert list(store.where_text("without")) == []
+
+
+class TestEntryStoreMapped:
+    """Test the memory-mapped, offsets-only store"""
+
+    def test_index_source(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+        parsed = build_store(path)
+        store = EntryStore(path)
+        store.index_source()
+
+        assert not store.columns_loaded
+        assert list(store.line_numbers) == list(parsed.line_numbers)
+        assert list(store.offsets) == list(parsed.offsets)
+        assert store.raw_line(3) == "plain text without fields"
+
+        store.update(0, "2024-01-20 10:31:00 WARN GET /api/items 200 5ms")
+        store.load_columns()
+        assert store.columns_loaded
+        assert store.count_values('level') == {'WARN': 2, 'ERROR': 1}
+        assert store.count_status_codes(None) == {200: 1, 500: 1, 404: 1}
+        store.close()
+
+    def test_index_empty_file(self, tmp_path):
+        path = tmp_path / "empty.log"
+        path.write_bytes(b"")
+        store = EntryStore(path)
+        store.index_source()
+        assert len(store) == 0
+        assert store.columns_loaded
@@ -0,0 +1,139 @@
+"""
+Unit tests for exporting entries
+"""
+
+import csv
+import gzip
+import json
+import math
+import pytest
+import src.utils.export
+from src.log_viewer import LogViewer
+from src.utils.compression import GZIP, XZ, detect_compression
+from src.utils.export import (
+    EXPORT_COLUMNAR, EXPORT_CSV, EXPORT_JSONL, EXPORT_TEXT, export_format, read_columnar,
+    write_export,
+)
+
+LINES = [
+    "2024-01-20 10:00:01 INFO GET /api/users 200 45ms",
+    "",
+    "2024-01-20 10:00:02 ERROR POST /api/orders 500 1200ms",
+    '{"timestamp": "2024-01-20T10:00:03Z", "level": "WARN", "method": "GET", "path": "/api/x", '
+    '"status": 404, "message": "tab\\there, \\"quoted\\""}',
+    "    at com.example.Handler.run(Handler.java:42)",
+    "2024-01-20 10:00:04 ERROR GET /api/orders 500 7ms",
+]
+
+
+@pytest.fixture
+def viewer(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+    viewer = LogViewer(str(path), index_cache=False)
+    viewer.load(preview=False)
+    return viewer
+
+
+class TestExportFormat:
+    """Test choosing the format from the file name"""
+
+    @pytest.mark.parametrize("name, expected", [
+        ("errors.log", (EXPORT_TEXT, None)),
+        ("errors.jsonl", (EXPORT_JSONL, None)),
+        ("errors.CSV", (EXPORT_CSV, None)),
+        ("errors.jsonl.gz", (EXPORT_JSONL, GZIP)),
+        ("errors.lvcol.xz", (EXPORT_COLUMNAR, XZ)),
+        ("errors.gz", (EXPORT_TEXT, GZIP)),
+        ("errors", (EXPORT_TEXT, None)),
+    ])
+    def test_suffixes(self, name, expected):
+        assert export_format(name) == expected
+
+
+class TestExport:
+    """Test each format against the parsed entries"""
+
+    def test_text_matches_raw_lines(self, viewer, tmp_path):
+        out = tmp_path / "out.log"
+        assert write_export(viewer.entries, out) == 5
+        expected = "".join(line.strip() + "\n" for line in LINES if line)
+        assert out.read_text(encoding="utf-8") == expected
+
+    def test_jsonl(self, viewer, tmp_path):
+        out = tmp_path / "out.jsonl"
+        write_export(viewer.entries, out, EXPORT_JSONL)
+        records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+        assert [record["line"] for record in records] == [1, 3, 4, 5, 6]
+        assert records[0]["timestamp"] == "2024-01-20T10:00:01"
+        first, third = records[0], records[2]
+        assert (first["status"], first["response_time"]) == (200, 45.0)
+        assert first["endpoint"] == "/api/users"
+        assert (third["level"], third["status"], third["response_time"]) == ("WARN", 404, None)
+        assert records[2]["raw"] == LINES[3]
+        assert records[3]["timestamp"] is None and records[3]["level"] is None
+
+    def test_csv_quotes_raw_lines(self, viewer, tmp_path):
+        out = tmp_path / "out.csv"
+        write_export(viewer.entries, out, EXPORT_CSV)
+        with open(out, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["raw"] for row in rows] == [line.strip() for line in LINES if line]
+        row = rows[1]
+        assert (row["level"], row["status"], row["response_time"]) == ("ERROR", "500", "1200.0")
+        assert rows[3]["status"] == "" and rows[3]["timestamp"] == ""
+
+    def test_columnar_round_trip(self, viewer, tmp_path):
+        store = viewer.entries
+        out = tmp_path / "out.lvcol.gz"
+        write_export(store, out, EXPORT_COLUMNAR, GZIP, ids=[0, 2, 4])
+        assert detect_compression(out) == GZIP
+
+        export = read_columnar(out)
+        assert export.header["count"] == 3
+        assert list(export.columns["line_numbers"]) == [1, 4, 6]
+        assert list(export.columns["timestamps"]) == [store.timestamps[i] for i in (0, 2, 4)]
+        levels = export.dictionaries["level"]
+        assert [levels[code] for code in export.columns["codes/level"]] == ["INFO", "WARN", "ERROR"]
+        assert math.isnan(export.columns["response_times"][1])
+        assert export.raw_lines == [LINES[0], LINES[3], LINES[5]]
+
+    def test_not_columnar(self, tmp_path):
+        path = tmp_path / "plain.lvcol"
+        path.write_bytes(b"hello\n")
+        with pytest.raises(ValueError):
+            read_columnar(path)
+
+    def test_batches_and_failure_keep_target(self, viewer, tmp_path, monkeypatch):
+        monkeypatch.setattr(src.utils.export, "EXPORT_BATCH_LINES", 2)
+        out = tmp_path / "out.jsonl"
+        write_export(viewer.entries, out, EXPORT_JSONL)
+        assert len(out.read_text(encoding="utf-8").splitlines()) == 5
+
+        def broken(*args, **kwargs):
+            yield b"partial"
+            raise OSError("disk full")
+
+        monkeypatch.setattr(src.utils.export, "_text_chunks", broken)
+        with pytest.raises(OSError):
+            write_export(viewer.entries, out, EXPORT_JSONL)
+        assert len(out.read_text(encoding="utf-8").splitlines()) == 5
+        assert not (tmp_path / "out.jsonl.tmp").exists()
+
+
+class TestExportCommand:
+    """Test exporting the filtered view"""
+
+    def test_exports_filtered_entries(self, viewer, tmp_path, capsys):
+        viewer.filter_logs(level="ERROR")
+        out = tmp_path / "errors.jsonl.gz"
+        viewer.export_filtered(str(out))
+        assert "Exported 2 entries" in capsys.readouterr().out
+        text = gzip.decompress(out.read_bytes()).decode("utf-8")
+        records = [json.loads(line) for line in text.splitlines()]
+        assert [record["line"] for record in records] == [3, 6]
+
+    def test_explicit_format(self, viewer, tmp_path):
+        out = tmp_path / "errors.txt"
+        viewer.export_filtered(str(out), EXPORT_CSV)
+        assert out.read_text(encoding="utf-8").startswith("line,timestamp,")
@@ -0,0 +1,147 @@
+"""
+Unit tests for following a growing log file
+"""
+
+import os
+import pytest
+from src.log_viewer import LogViewer
+from src.utils.follow import FileFollower
+
+
+def append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text(
+        "2024-01-20 10:30:45 INFO GET /api/users 200 45ms\n"
+        "2024-01-20 10:30:46 ERROR POST /api/orders 500 120ms\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+class TestFileFollower:
+    """Test reading appended lines, rotation and truncation"""
+
+    def test_reads_complete_lines_only(self, log_path):
+        follower = FileFollower(log_path, log_path.stat().st_size, 2)
+        assert follower.poll() == []
+
+        append(log_path, "third\n\nfou")
+        lines = follower.poll()
+        assert [(n, text) for n, _, text in lines] == [(3, "third"), (4, "")]
+
+        append(log_path, "rth\n")
+        [(line_number, offset, text)] = follower.poll()
+        assert (line_number, text) == (5, "fourth")
+        with open(log_path, "rb") as f:
+            f.seek(offset)
+            assert f.readline() == b"fourth\n"
+        follower.close()
+
+    def test_truncation(self, log_path):
+        follower = FileFollower(log_path, log_path.stat().st_size, 2)
+        log_path.write_text("new\n", encoding="utf-8")
+        assert follower.check_reset()
+        assert [text for _, _, text in follower.poll()] == ["new"]
+        follower.close()
+
+    def test_rotation(self, log_path):
+        follower = FileFollower(log_path, log_path.stat().st_size, 2)
+        os.rename(log_path, log_path.with_name("app.log.1"))
+        assert not follower.check_reset()
+
+        log_path.write_text("rotated line that is long enough\n", encoding="utf-8")
+        assert follower.check_reset()
+        lines = [(n, text) for n, _, text in follower.poll()]
+        assert lines == [(1, "rotated line that is long enough")]
+        follower.close()
+
+
+class TestLogViewerFollow:
+    """Test incremental ingestion into the viewer"""
+
+    def test_appended_lines_update_entries_and_filters(self, log_path):
+        viewer = LogViewer(str(log_path))
+        viewer.load()
+        viewer.filter_logs(level='ERROR')
+        viewer.filter_logs(method='DELETE')
+        assert len(viewer.poll_appended()) == 0
+
+        append(log_path, "\n2024-01-20 10:31:00 ERROR DELETE /api/items 503 5ms\n"
+                         "2024-01-20 10:31:01 ERROR GET /api/items 500 7ms\n"
+                         "2024-01-20 10:31:02 INFO DELETE /api/items 200 6ms")
+        added = viewer.poll_appended()
+
+        assert len(viewer.entries) == 4
+        assert [e.line_number for e in added] == [4]
+        assert [e.line_number for e in viewer.filtered_entries] == [4]
+        viewer.undo_filter()
+        assert [e.line_number for e in viewer.filtered_entries] == [2, 4, 5]
+        viewer.undo_filter()
+        assert len(viewer.filtered_entries) == 4
+
+        append(log_path, "\n")
+        assert [e.line_number for e in viewer.poll_appended()] == [6]
+        viewer.filter_logs(search='api/items')
+        assert len(viewer.filtered_entries) == 3
+
+    def test_truncated_file_is_reloaded(self, log_path):
+        viewer = LogViewer(str(log_path))
+        viewer.load()
+        viewer.filter_logs(level='ERROR')
+        viewer.poll_appended()
+
+        log_path.write_text("2024-01-20 11:00:00 ERROR GET /api/new 500 1ms\n", encoding="utf-8")
+        added = viewer.poll_appended()
+        assert len(viewer.entries) == 1
+        assert [e.endpoint for e in added] == ["/api/new"]
+        assert [e.line_number for e in viewer.filtered_entries] == [1]
+
+    def test_partial_last_line_is_completed(self, tmp_path):
+        """A line loaded before its newline is parsed again when the rest arrives"""
+        path = tmp_path / "app.log"
+        path.write_text("2024-01-20 10:00:00 ERROR GET /a 500 1ms\n"
+                        "2024-01-20 10:00:01 ERROR GET /b 5", encoding="utf-8")
+        viewer = LogViewer(str(path), index_cache=False)
+        viewer.load(preview=False)
+        viewer.filter_logs(level='ERROR')
+        viewer.filter_logs(status_code=500)
+        assert [e.line_number for e in viewer.filtered_entries] == [1]
+        assert viewer.filtered_entries.count_values('status_code') == {500: 1}
+
+        append(path, "00 7ms\n2024-01-20 10:00:02 ERROR GET /c 500 2ms\n")
+        added = viewer.poll_appended()
+
+        store = viewer.entries
+        assert len(store) == 3
+        assert [e.line_number for e in added] == [2, 3]
+        assert store.entry(1).status_code == 500 and store.status_codes[1] == 500
+        assert [raw for _, raw in store.iter_raw_lines()][1:] == [
+            "2024-01-20 10:00:01 ERROR GET /b 500 7ms", "2024-01-20 10:00:02 ERROR GET /c 500 2ms"]
+        assert not store.edits
+        assert [e.line_number for e in viewer.filtered_entries] == [1, 2, 3]
+        assert viewer.filtered_entries.count_values('status_code') == {500: 3}
+        viewer.undo_filter()
+        assert [e.line_number for e in viewer.filtered_entries] == [1, 2, 3]
+
+    def test_edited_partial_line_keeps_edit(self, tmp_path):
+        """An edit of the partial line wins over the text appended to it"""
+        path = tmp_path / "app.log"
+        path.write_text("2024-01-20 10:00:00 INFO GET /a 200 1ms\n"
+                        "2024-01-20 10:00:01 ERROR GET /b 5", encoding="utf-8")
+        viewer = LogViewer(str(path), index_cache=False)
+        viewer.load(preview=False)
+        viewer.poll_appended()
+        viewer.filter_logs(level='WARN')
+        viewer.edit_entry(2, "2024-01-20 10:00:01 WARN GET /b 404 1ms")
+
+        append(path, "00 7ms\n2024-01-20 10:00:02 WARN GET /c 404 2ms\n")
+        assert [e.line_number for e in viewer.poll_appended()] == [3]
+        assert len(viewer.entries) == 3
+        assert viewer.entries.raw_line(1) == "2024-01-20 10:00:01 WARN GET /b 404 1ms"
+        assert [e.line_number for e in viewer.filtered_entries] == [3]
@@ -0,0 +1,119 @@
+"""
+Unit tests for the sidecar index cache
+"""
+
+import os
+import pytest
+from src.models.entry_store import CODED_FIELDS, INDEXED_FIELDS, EntryStore
+from src.models.index_cache import cache_path, read_index, write_index
+from src.models.log_entry import LogEntry
+from src.utils.reader import iter_lines, sniff_format
+import src.log_viewer
+from src.log_viewer import LogViewer
+
+
+LINES = [
+    "2024-01-20 10:30:45 INFO GET /api/users 200 45ms",
+    "",
+    "2024-01-20 10:30:46 ERROR POST /api/orders 500 120ms",
+    '{"level": "WARN", "method": "GET", "status": 404, "message": "missing"}',
+    "10:30:47.123 [http-nio-8080-exec-1] INFO c.e.Cntr :: BackendInvoiceCntr: INV001 "
+    "Response Code : 200 took 35ms",
+]
+
+APPENDED = [
+    "2024-01-20 10:31:00 ERROR DELETE /api/items 503 5ms",
+    "",
+    "2024-01-20 10:31:01 INFO GET /api/items 200 7ms",
+]
+
+
+def build_store(path):
+    store = EntryStore(path, sniff_format(path))
+    for line_number, offset, text in iter_lines(path):
+        if text.strip():
+            store.append(LogEntry(text, line_number, store.log_format), offset)
+    return store
+
+
+def snapshot(store):
+    """Comparable view of every column and index of a store"""
+    return (
+        list(store.line_numbers), list(store.offsets), list(store.timestamps),
+        list(store.status_codes), [str(t) for t in store.response_times],
+        {name: [store.dictionaries[name].decode(c) for c in store.codes[name]]
+         for name in CODED_FIELDS},
+        {name: {key: list(p) for key, p in store.indexes[name].postings.items()}
+         for name in INDEXED_FIELDS},
+    )
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+    return path
+
+
+class TestIndexCache:
+    """Test writing, restoring and validating the cache"""
+
+    def test_round_trip(self, log_path):
+        store = build_store(log_path)
+        assert write_index(store) == cache_path(log_path)
+
+        cached = read_index(log_path)
+        assert cached is not None
+        assert snapshot(cached.store) == snapshot(store)
+        assert cached.store.log_format.kind == store.log_format.kind
+        assert cached.tail_start == log_path.stat().st_size
+        assert cached.line_count == 5
+
+    def test_missing_and_corrupt(self, log_path):
+        assert read_index(log_path) is None
+
+        write_index(build_store(log_path))
+        data = cache_path(log_path).read_bytes()
+        cache_path(log_path).write_bytes(data[:-3])
+        assert read_index(log_path) is None
+
+        cache_path(log_path).write_bytes(b"garbage")
+        assert read_index(log_path) is None
+
+    def test_rewritten_file_is_stale(self, log_path):
+        write_index(build_store(log_path))
+        stat = log_path.stat()
+        log_path.write_text("\n".join(LINES).replace("INFO", "WARN") + "\n", encoding="utf-8")
+        os.utime(log_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert read_index(log_path) is None
+
+    def test_truncated_file_is_stale(self, log_path):
+        write_index(build_store(log_path))
+        log_path.write_text(LINES[0] + "\n", encoding="utf-8")
+        assert read_index(log_path) is None
+
+    def test_appended_file_resumes_at_tail(self, log_path):
+        write_index(build_store(log_path))
+        size = log_path.stat().st_size
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(APPENDED) + "\n")
+
+        cached = read_index(log_path)
+        assert cached is not None
+        assert cached.tail_start == size
+
+    def test_viewer_parses_only_appended_lines(self, log_path, monkeypatch):
+        monkeypatch.setattr(src.log_viewer, "INDEX_CACHE_MIN_BYTES", 0)
+        LogViewer(str(log_path)).load()
+        assert cache_path(log_path).exists()
+
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(APPENDED) + "\n")
+
+        viewer = LogViewer(str(log_path))
+        viewer.load()
+        assert snapshot(viewer.entries) == snapshot(build_store(log_path))
+
+        viewer.filter_logs(method='DELETE')
+        assert [e.line_number for e in viewer.filtered_entries] == [6]
+        assert read_index(log_path).tail_start == log_path.stat().st_size
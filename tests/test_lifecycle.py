@@ -0,0 +1,115 @@
+"""
+Unit tests for START/STOP request pairing
+"""
+
+import math
+import pytest
+from src.log_viewer import LogViewer
+from src.models.entry_store import EntryStore
+from src.models.lifecycle import RequestPairs, duration_ms
+from src.models.log_entry import LogEntry, LogFormat
+
+LINES = [
+    "10:00:00.000 [exec-1] INFO c.e.Filter :: =========== /INV001 START ===========",
+    "10:00:00.010 [exec-2] INFO c.e.Filter :: =========== /INV002 START ===========",
+    "10:00:00.050 [exec-1] INFO c.e.InvoiceCntr: INV001 loading invoices",
+    "10:00:00.120 [exec-1] INFO c.e.Filter :: =========== /INV001 STOP ===========",
+    "10:00:00.200 [exec-3] INFO c.e.Filter :: =========== /INV003 STOP ===========",
+    "10:00:00.300 [exec-2] INFO c.e.Filter :: =========== /INV005 START ===========",
+    "10:00:00.900 [exec-2] INFO c.e.Filter :: =========== /INV002 STOP ===========",
+    "10:00:01.000 [exec-1] INFO c.e.Filter :: =========== /INV001 START ===========",
+    "10:00:01.100 [exec-1] INFO c.e.Filter :: =========== /INV001 START ===========",
+    "10:00:01.400 [exec-1] INFO c.e.Filter :: =========== /INV001 STOP ===========",
+    "10:00:01.500 [exec-1] INFO c.e.Filter :: =========== /INV001 STOP ===========",
+]
+
+
+def build(lines, first_line=1):
+    store = EntryStore(log_format=LogFormat('java'))
+    for line_number, text in enumerate(lines, first_line):
+        store.append(LogEntry(text, line_number, store.log_format), 0)
+    return store
+
+
+def summary(pairs):
+    requests = sorted(zip(pairs.start_ids, pairs.stop_ids, pairs.durations))
+    return requests, pairs.unmatched_starts(), pairs.unmatched_stops()
+
+
+class TestRequestPairs:
+    """Test pairing, unmatched lines and overlaps"""
+
+    def test_pairs_and_unmatched(self):
+        pairs = build(LINES).request_pairs()
+        requests, starts, stops = summary(pairs)
+        assert [(start, stop) for start, stop, _ in requests] == [(0, 3), (1, 6), (8, 9)]
+        assert [round(duration, 3) for _, _, duration in requests] == [120.0, 890.0, 300.0]
+        assert starts == [5, 7]
+        assert stops == [4, 10]
+
+    def test_overlaps(self):
+        store = build(LINES)
+        overlaps = store.request_pairs().overlaps(store.codes['thread'])
+        thread = store.dictionaries['thread'].encode("exec-2")
+        assert overlaps == {}
+        assert store.request_pairs().overlaps([thread] * len(store)) == {(0, thread): 1}
+
+    @pytest.mark.parametrize("split", range(1, len(LINES)))
+    def test_chunks_pair_like_one_pass(self, split):
+        store = build(LINES[:split])
+        store.extend(build(LINES[split:], split + 1))
+        assert summary(store.requests) == summary(build(LINES).requests)
+
+    def test_duration(self):
+        assert duration_ms(1_000_000, 1_250_000) == 250.0
+        assert duration_ms(86_399_000_000, 500_000) == 1500.0  # Past midnight
+        assert duration_ms(36_000_000_000, 35_999_000_000) is None  # A day less a second
+        assert duration_ms(86_400_500_000, 86_399_000_000) is None  # On the day before
+        assert math.isnan(duration_ms(-(2 ** 63), 0))
+
+    def test_dated_stop_before_start_stays_unmatched(self):
+        day = 86_400_000_000
+        timestamps = [19_742 * day + 36_001_000_000, 19_742 * day + 36_000_000_000,
+                      19_742 * day + 86_399_000_000, 19_743 * day + 500_000]
+        pairs = RequestPairs()
+        for entry_id, operation in enumerate(['START', 'STOP', 'START', 'STOP']):
+            pairs.add(entry_id, (0, 1, 1), operation, timestamps)
+        assert summary(pairs) == ([(2, 3, 1500.0)], [0], [1])
+
+
+class TestRequestCommands:
+    """Test pairing in the viewer"""
+
+    @pytest.fixture
+    def viewer(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+        viewer = LogViewer(str(path), index_cache=False)
+        viewer.load(preview=False)
+        return viewer
+
+    def test_filter_selects_requests_by_start(self, viewer):
+        pairs = viewer.entries.request_pairs()
+        viewer.filter_logs(time_range="10:00:01..")
+        assert [pairs.start_ids[n] for n in pairs.select(viewer.filtered_entries.ids)] == [8]
+
+    def test_edit_pairs_again(self, viewer):
+        viewer.edit_entry(11, "10:00:01.500 [exec-2] INFO c.e.Filter :: "
+                              "=========== /INV005 STOP ===========")
+        requests, starts, stops = summary(viewer.entries.request_pairs())
+        assert (starts, stops) == ([7], [4])
+        assert [(start, stop) for start, stop, _ in requests] == [(0, 3), (1, 6), (5, 10), (8, 9)]
+
+    def test_follow_appends_pairs(self, viewer):
+        viewer.entries.append_line(
+            "10:00:02.000 [exec-2] INFO c.e.Filter :: =========== /INV005 STOP ===========", 12, 0)
+        requests, starts, _ = summary(viewer.entries.requests)
+        assert (5, 11) in [(start, stop) for start, stop, _ in requests]
+        assert starts == [7]
+
+    def test_commands_render(self, viewer, capsys):
+        viewer.display_requests()
+        viewer.display_slow_requests(2, min_ms=100)
+        output = capsys.readouterr().out
+        assert "3 requests paired" in output and "2 starts without a stop" in output
+        assert "890.0" in output and "120.0" not in output
@@ -4,7 +4,7 @@ Unit tests for LogEntry model
 
 import pytest
 from datetime import datetime
-from src.models.log_entry import LogEntry
+from src.models.log_entry import LogEntry, LogFormat, detect_format, FORMAT_JAVA, FORMAT_JSON
 
 
 class TestLogEntryJSON:
@@ -30,6 +30,15 @@ class TestLogEntryJSON:
         assert entry.level == "ERROR"
         assert "Something went wrong" in entry.message
 
+    def test_parse_json_log_without_message(self):
+        """Test that a JSON line without a message keeps the raw line as its message"""
+        log_line = '{"level": "WARN", "method": "GET", "status": 404}'
+        for text in (log_line, log_line + "\n"):
+            entry = LogEntry(text, 1)
+            assert entry.status_code == 404
+            assert entry.message == log_line
+            assert entry.display_message == log_line
+
 
 class TestLogEntryText:
     """Test LogEntry with text format logs"""
@@ -85,4 +94,117 @@ class TestLogEntryColors:
         for status, expected_color in test_cases:
             log_line = f'{{"status": {status}}}'
             entry = LogEntry(log_line, 1)
-            assert entry.get_status_color() == expected_color
\ No newline at end of file
+            assert entry.get_status_color() == expected_color
+
+
+class TestLogEntryJava:
+    """Test LogEntry with Java/Spring format logs"""
+
+    def test_parse_controller_line(self):
+        """Test controller, endpoint, status mapping and response time"""
+        log_line = ("10:30:45.123 [http-nio-8080-exec-1] INFO c.e.BackendInvoiceCntr :: "
+                    "BackendInvoiceCntr: INV001 Response Code : 719 took 35ms")
+        entry = LogEntry(log_line, 1)
+
+        assert entry.thread == "http-nio-8080-exec-1"
+        assert entry.level == "INFO"
+        assert entry.logger == "c.e.BackendInvoiceCntr"
+        assert entry.service_name == "BackendInvoiceCntr"
+        assert entry.endpoint == "/INV001"
+        assert entry.method == "POST"
+        assert entry.status_code == 404
+        assert entry.response_time == 35.0
+
+    def test_parse_lifecycle_line(self):
+        """Test START / STOP lifecycle detection"""
+        log_line = "10:30:45.123 [main] debug c.e.Filter :: =========== /INV002 STOP ==========="
+        entry = LogEntry(log_line, 1)
+
+        assert entry.level == "DEBUG"
+        assert entry.operation_type == "STOP"
+        assert entry.endpoint == "/INV002"
+        assert entry.message == "STOP - /INV002"
+
+    def test_parse_rslt_code(self):
+        """Test RSLT_CD status extraction"""
+        log_line = "10:30:45.123 [main] ERROR c.e.Svc :: RSLT_CD[500] RSLT_MSG[DATA NOT FOUND]"
+        entry = LogEntry(log_line, 1)
+
+        assert entry.status_code == 500
+        assert entry.get_display_message() == "DATA NOT FOUND"
+
+
+class TestLogEntryLazy:
+    """Test lazy, slot-based parsing"""
+
+    def test_fields_parsed_on_first_access(self):
+        """Test that construction stores the line without parsing it"""
+        entry = LogEntry("  2024-01-20 10:30:45 ERROR POST /api/orders 500 120ms  ", 7)
+
+        assert entry.raw_line == "2024-01-20 10:30:45 ERROR POST /api/orders 500 120ms"
+        assert entry.line_number == 7
+        with pytest.raises(AttributeError):
+            object.__getattribute__(entry, 'level')
+
+        assert entry.level == "ERROR"
+        assert object.__getattribute__(entry, 'status_code') == 500
+
+    def test_no_instance_dict(self):
+        """Test that entries use slots"""
+        entry = LogEntry('{"level": "INFO"}', 1)
+        assert not hasattr(entry, '__dict__')
+        with pytest.raises(AttributeError):
+            entry.unknown_field
+
+    def test_display_message_is_memoized(self):
+        """Test that the cleaned message is computed once and truncated on request"""
+        entry = LogEntry("10:30:45.123 [main] INFO c.e.Filter :: Handled ==== (see response log)",
+                         1)
+        assert entry.display_message == "Handled"
+        assert object.__getattribute__(entry, 'display_message') == "Handled"
+
+        entry = LogEntry("10:30:45.123 [main] ERROR c.e.Svc :: "
+                         "RSLT_CD[500] RSLT_MSG[DATA NOT FOUND ON SERVER]", 1)
+        assert entry.get_display_message(12) == "DATA NOT ..."
+
+    def test_reparse_resets_fields(self):
+        """Test that re-parsing an edited line drops stale fields"""
+        entry = LogEntry("10:30:45.123 [main] ERROR c.e.Svc :: RSLT_CD[500] failed", 1)
+        assert entry.thread == "main"
+
+        entry.raw_line = "2024-01-20 10:30:45 INFO GET /api/users 200 45ms"
+        entry._parse()
+
+        assert entry.thread is None
+        assert entry.status_code == 200
+
+
+class TestLogFormat:
+    """Test per-file format detection"""
+
+    JAVA_LINES = [
+        "10:30:45.123 [main] INFO c.e.App :: Started application",
+        "10:30:46.001 [http-nio-8080-exec-1] ERROR c.e.Svc :: RSLT_CD[500] failed",
+        "10:30:47.002 [main] DEBUG c.e.Cli :: request payload {\"a\": 1}",
+    ]
+
+    def test_detect_dominant_format(self):
+        """Test sniffing Java and JSON files"""
+        assert detect_format(self.JAVA_LINES).kind == FORMAT_JAVA
+        assert detect_format(['{"level": "INFO"}', '', '{"level": "ERROR"}']).kind == FORMAT_JSON
+
+    def test_mixed_sample_has_no_format(self):
+        """Test that a sample without a dominant format uses the full chain"""
+        sample = self.JAVA_LINES[:1] + ['{"level": "INFO"}',
+                                        '2024-01-20 10:30:45 INFO GET /api 200']
+        assert detect_format(sample).kind is None
+
+    def test_format_hint_keeps_fallback(self):
+        """Test that lines of another format still parse under a format hint"""
+        java = LogFormat(FORMAT_JAVA)
+
+        json_entry = LogEntry('{"level": "WARN", "status": 404}', 1, java)
+        text_entry = LogEntry("2024-01-20 10:30:45 ERROR POST /api/orders 500 120ms", 2, java)
+
+        assert json_entry.level == "WARN" and json_entry.status_code == 404
+        assert text_entry.method == "POST" and text_entry.status_code == 500
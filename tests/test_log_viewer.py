@@ -66,4 +66,160 @@ class TestLogViewer:
         assert len(viewer.filtered_entries) == 1
 
         viewer.clear_filters()
-        assert len(viewer.filtered_entries) == 3
\ No newline at end of file
+        assert len(viewer.filtered_entries) == 3
+
+    def test_filter_by_search(self, sample_log_file):
+        """Test case-insensitive text search"""
+        viewer = LogViewer(sample_log_file)
+        viewer.load()
+        viewer.filter_logs(search='API/ORDERS')
+
+        assert [e.line_number for e in viewer.filtered_entries] == [2]
+
+    def test_edit_and_save(self, sample_log_file):
+        """Test that edits are visible immediately and written on save"""
+        viewer = LogViewer(sample_log_file)
+        viewer.load()
+        viewer.edit_entry(2, "2024-01-20 10:30:46 WARN POST /api/orders 503 120ms")
+
+        viewer.filter_logs(status_code=503)
+        assert [e.line_number for e in viewer.filtered_entries] == [2]
+
+        viewer.save()
+        saved = Path(sample_log_file).read_text().splitlines()
+        assert saved[1] == "2024-01-20 10:30:46 WARN POST /api/orders 503 120ms"
+        assert viewer.entries[2].status_code == 404
+
+    def test_filters_stack_and_undo(self, sample_log_file):
+        """Test that filters narrow the current result and can be undone"""
+        viewer = LogViewer(sample_log_file)
+        viewer.load()
+
+        viewer.filter_logs(method='GET')
+        viewer.filter_logs(status_code=404)
+        assert viewer.current_filter == {'method': 'GET', 'status_code': 404}
+        assert [e.line_number for e in viewer.filtered_entries] == [3]
+
+        viewer.undo_filter()
+        assert viewer.current_filter == {'method': 'GET'}
+        assert len(viewer.filtered_entries) == 2
+
+        viewer.undo_filter()
+        assert len(viewer.filtered_entries) == 3
+
+    def test_filter_replaces_same_criterion(self, sample_log_file):
+        """Test that a new value for an active criterion replaces it"""
+        viewer = LogViewer(sample_log_file)
+        viewer.load()
+
+        viewer.filter_logs(level='ERROR')
+        viewer.filter_logs(level='warn')
+
+        assert viewer.current_filter == {'level': 'warn'}
+        assert [e.line_number for e in viewer.filtered_entries] == [3]
+
+    def test_filter_results_are_cached(self, sample_log_file):
+        """Test that equivalent filters reuse the cached result"""
+        viewer = LogViewer(sample_log_file)
+        viewer.load()
+
+        viewer.filter_logs(level='ERROR', method='post')
+        first = viewer.filtered_entries.ids
+        viewer.clear_filters()
+        viewer.filter_logs(method='POST', level='error')
+
+        assert viewer.filtered_entries.ids is first
+
+    def test_view_range(self, sample_log_file, capsys):
+        """Test listing a range of lines"""
+        viewer = LogViewer(sample_log_file)
+        viewer.load()
+        viewer.display_range(2, 3)
+
+        output = capsys.readouterr().out
+        assert "lines 2..3, showing 2 of 2" in output
+
+        viewer.display_range(10, 20)
+        assert "No entries on lines 10..20" in capsys.readouterr().out
+
+    def test_mmap_mode(self, sample_log_file):
+        """Test filtering a memory-mapped file parsed on demand"""
+        viewer = LogViewer(sample_log_file, use_mmap=True)
+        viewer.load()
+        assert len(viewer.entries) == 3
+        assert not viewer.entries.columns_loaded
+        assert viewer.filtered_entries[1].level == 'ERROR'
+
+        viewer.filter_logs(method='GET')
+        assert viewer.entries.columns_loaded
+        assert [e.line_number for e in viewer.filtered_entries] == [1, 3]
+
+    def test_summary_counts_track_edits(self, sample_log_file):
+        """Test that filtered summary counts follow edits"""
+        viewer = LogViewer(sample_log_file)
+        viewer.load()
+        viewer.filter_logs(method='GET')
+        assert viewer.filtered_entries.count_values('level') == {'INFO': 1, 'WARN': 1}
+
+        viewer.edit_entry(1, "2024-01-20 10:30:45 ERROR GET /api/users 500 45ms")
+        assert viewer.filtered_entries.count_values('level') == {'ERROR': 1, 'WARN': 1}
+        assert viewer.filtered_entries.count_values('status_code') == {500: 1, 404: 1}
+        viewer.clear_filters()
+        assert viewer.filtered_entries.count_values('level') == {'ERROR': 2, 'WARN': 1}
+
+
+class TestPagedList:
+    """Test paging through the current entries"""
+
+    @pytest.fixture
+    def viewer(self, tmp_path):
+        path = tmp_path / "app.log"
+        lines = [f"2024-01-20 10:00:{i % 60:02d} {'ERROR' if i % 4 == 0 else 'INFO'} "
+                 f"GET /api/items/{i} 200 5ms\n" for i in range(250)]
+        path.write_text("".join(lines), encoding="utf-8")
+        viewer = LogViewer(str(path), index_cache=False)
+        viewer.load(preview=False)
+        return viewer
+
+    @staticmethod
+    def page_lines(viewer):
+        rows = viewer._page_rows[viewer.page * viewer.page_size, viewer.page_size]
+        return [int(row[0]) for row in rows]
+
+    def test_pages(self, viewer, capsys):
+        """Test moving between pages and preparing the next one"""
+        viewer.display_entries(100)
+        assert "page 1 of 3, entries 1-100 of 250" in capsys.readouterr().out
+        assert list(viewer._page_rows) == [(0, 100), (100, 100)]  # Next page prepared
+
+        viewer.next_page()
+        viewer.next_page()
+        viewer.next_page()
+        assert "page 3 of 3, entries 201-250 of 250" in capsys.readouterr().out
+        assert self.page_lines(viewer) == list(range(201, 251))
+
+        viewer.prev_page()
+        assert "page 2 of 3" in capsys.readouterr().out
+        assert len(viewer._page_rows) == 3
+
+    def test_goto_and_filter(self, viewer, capsys):
+        """Test jumping to a line, and starting over on a new filter"""
+        viewer.display_entries(10)
+        viewer.goto_line(125)
+        assert "page 13 of 25, entries 121-130" in capsys.readouterr().out
+
+        viewer.filter_logs(level="ERROR")
+        capsys.readouterr()
+        viewer.next_page()  # A new view starts again from its first page
+        assert "page 1 of 7, entries 1-10 of 63" in capsys.readouterr().out
+        assert self.page_lines(viewer) == list(range(1, 41, 4))
+
+        viewer.display_page(100)
+        assert "page 7 of 7, entries 61-63 of 63" in capsys.readouterr().out
+
+    def test_edit_renders_again(self, viewer):
+        """Test that an edited entry is shown with its new text"""
+        viewer.display_entries(10)
+        viewer.edit_entry(1, "2024-01-20 10:00:00 ERROR GET /api/edited 500 5ms")
+        viewer.display_page(0)
+        assert viewer._page_rows[0, 10][0][6] == "/api/edited"
@@ -0,0 +1,100 @@
+"""
+Unit tests for loading several log files as one time-ordered view
+"""
+
+import gzip
+import pytest
+from src.log_viewer import LogViewer
+from src.models.merge import merge_order, merge_stores
+from src.utils.parallel import parse_file
+from src.utils.reader import expand_paths
+
+POD_A = [
+    "2024-01-20 10:00:01 INFO GET /api/users 200 45ms",
+    "2024-01-20 10:00:04 ERROR POST /api/orders 500 120ms",
+    "    at com.example.Orders.create(Orders.java:42)",
+    "2024-01-20 10:00:09 INFO GET /api/users 200 30ms",
+]
+POD_B = [
+    "2024-01-20 10:00:02 WARNING GET /api/items 404 12ms",
+    "",
+    "2024-01-20 10:00:04 INFO PUT /api/items 201 80ms",
+    "2024-01-20 10:00:07 ERROR DELETE /api/items 500 5ms",
+]
+
+
+@pytest.fixture
+def pods(tmp_path):
+    (tmp_path / "pod-a.log").write_text("\n".join(POD_A) + "\n", encoding="utf-8")
+    packed = gzip.compress(("\n".join(POD_B) + "\n").encode("utf-8"))
+    (tmp_path / "pod-b.log.gz").write_bytes(packed)
+    (tmp_path / "pod-a.log.lvidx").write_bytes(b"not a log")
+    return tmp_path
+
+
+def load(paths, workers=1):
+    viewer = LogViewer(paths, workers=workers, index_cache=False)
+    viewer.load(preview=False)
+    return viewer
+
+
+class TestMerge:
+    """Test the k-way merge of parsed stores"""
+
+    def test_expand_paths_skips_sidecars(self, pods):
+        names = [path.name for path in expand_paths(str(pods / "pod-*"))]
+        assert names == ["pod-a.log", "pod-b.log.gz"]
+        assert expand_paths([pods / "pod-a.log", str(pods / "pod-a.log")]) == [pods / "pod-a.log"]
+
+    def test_merge_order(self, pods):
+        parts = [parse_file(str(pods / "pod-a.log"))[0], parse_file(str(pods / "pod-b.log.gz"))[0]]
+        # The stack trace line has no timestamp and stays after its error line
+        assert list(merge_order(parts)) == [(0, 0), (1, 0), (0, 1), (0, 2), (1, 1), (1, 2), (0, 3)]
+
+        store = merge_stores(parts)
+        assert list(store.line_numbers) == list(range(1, 8))
+        assert list(store.source_ids) == [0, 1, 0, 0, 1, 1, 0]
+        assert list(store.source_lines) == [1, 1, 2, 3, 3, 4, 4]
+        assert sum(sketch.count for sketch in store.latency_sketches("endpoint").values()) == 6
+
+
+class TestMultiFileViewer:
+    """Test filters, summary and export across several files"""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_time_ordered_view(self, pods, workers):
+        viewer = load(str(pods / "pod-*"), workers)
+
+        raw = [raw for _, raw in viewer.entries.iter_raw_lines()]
+        assert raw == [POD_A[0], POD_B[0], POD_A[1], POD_A[2], POD_B[2], POD_B[3], POD_A[3]]
+        assert viewer.entries.raw_line(5) == POD_B[3]
+
+        entry = viewer.entries.entry(4)
+        assert (entry.line_number, entry.source, entry.status_code) == (5, "pod-b.log.gz:3", 201)
+
+    def test_filters_and_export(self, pods, tmp_path):
+        viewer = load([str(pods / "pod-a.log"), str(pods / "pod-b.log.gz")])
+        levels = viewer.filtered_entries.count_values("level")
+        assert levels == {"INFO": 3, "WARNING": 1, "ERROR": 2}
+
+        viewer.filter_logs(level="ERROR")
+        sources = [entry.source for entry in viewer.filtered_entries]
+        assert sources == ["pod-a.log:2", "pod-b.log.gz:4"]
+        viewer.filter_logs(search="delete")
+        assert len(viewer.filtered_entries) == 1
+
+        output = tmp_path / "errors.log"
+        viewer.export_filtered(str(output))
+        assert output.read_text(encoding="utf-8") == POD_B[3] + "\n"
+
+    def test_edit_and_save(self, pods, tmp_path):
+        viewer = load(str(pods / "pod-*"))
+        viewer.edit_entry(2, "2024-01-20 10:00:02 INFO GET /api/items 200 12ms")
+
+        viewer.save()
+        assert (pods / "pod-b.log.gz").read_bytes()[:2] == b"\x1f\x8b"
+
+        output = tmp_path / "merged.log"
+        viewer.save(str(output))
+        lines = output.read_text(encoding="utf-8").splitlines()
+        assert lines[:3] == [POD_A[0], "2024-01-20 10:00:02 INFO GET /api/items 200 12ms", POD_A[1]]
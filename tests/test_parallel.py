@@ -0,0 +1,51 @@
+"""
+Unit tests for multi-process parsing
+"""
+
+import pytest
+from src.models.entry_store import EntryStore
+from src.models.log_entry import LogFormat
+from src.utils.parallel import iter_parallel_chunks
+from src.utils.reader import iter_entries, split_ranges
+
+
+FIELDS = ['line_number', 'raw_line', 'timestamp', 'level', 'method', 'endpoint',
+          'status_code', 'response_time', 'message', 'thread', 'json_data']
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    lines = []
+    for i in range(300):
+        lines.append(f"2024-01-20 10:{i % 60:02d}:45 INFO GET /api/users/{i} 200 {i}ms")
+        lines.append(f"10:30:45.{i % 1000:03d} [http-nio-8080-exec-{i % 4}] ERROR c.e.Svc :: "
+                     f"RSLT_CD[500]")
+        if i % 7 == 0:
+            lines.append("")
+        lines.append(f'{{"level": "WARN", "method": "POST", "status": 404, "message": "m{i}"}}')
+    path = tmp_path / "app.log"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_split_ranges_align_to_lines(log_file):
+    """Ranges cover the whole file and every range starts a line"""
+    data = log_file.read_bytes()
+    ranges = split_ranges(log_file, 7)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start and data[start - 1:start] == b"\n"
+
+
+def test_parallel_matches_serial(log_file):
+    """Parallel chunks concatenate to the serial result"""
+    serial = list(iter_entries(log_file))
+    store = EntryStore(log_file, LogFormat())
+    for _, lines_before, chunk in iter_parallel_chunks(log_file, 3, LogFormat()):
+        store.extend(chunk, lines_before)
+    parallel = list(store)
+
+    assert len(parallel) == len(serial)
+    for a, b in zip(serial, parallel):
+        assert [getattr(a, f) for f in FIELDS] == [getattr(b, f) for f in FIELDS]
@@ -0,0 +1,96 @@
+"""
+Unit tests for streaming queries
+"""
+
+import gzip
+import json
+import pytest
+import src.utils.query
+from src.utils.query import FORMAT_JSONL, QueryFilter, format_entry, iter_query
+
+LINES = [
+    "2024-01-20 10:00:01 INFO GET /api/a 200 5ms",
+    "2024-01-20 10:05:01 ERROR POST /api/b 500 50ms",
+    "    at com.example.Handler.run(Handler.java:42)",
+    "",
+    '{"timestamp": "2024-01-20T10:06:00Z", "level": "error", "method": "GET", "status": 500, '
+    '"message": "boom"}',
+    "2024-01-20 10:40:00 ERROR GET /api/c 500 5ms",
+]
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+    return path
+
+
+def lines_of(results):
+    return [entry.line_number for _, entry in results]
+
+
+class TestQuery:
+    """Test filtering, time windows and limits"""
+
+    def test_fields(self, log_file):
+        assert lines_of(iter_query([log_file], QueryFilter(level="error"))) == [2, 5, 6]
+        assert lines_of(iter_query([log_file], QueryFilter(level="ERROR", method="get"))) == [5, 6]
+        assert lines_of(iter_query([log_file], QueryFilter(status_code=200))) == [1]
+        assert lines_of(iter_query([log_file], QueryFilter(search="HANDLER"))) == [3]
+        assert lines_of(iter_query([log_file], QueryFilter(level="none"))) == []
+
+    def test_time_window_keeps_continuation_lines(self, log_file):
+        query = QueryFilter(since="10:05", until="10:30")
+        assert lines_of(iter_query([log_file], query)) == [2, 3, 5]
+        query = QueryFilter(search="handler", since="10:05:30")
+        assert lines_of(iter_query([log_file], query)) == []
+
+    def test_time_window_on_offset_stamped_log(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_text("\n".join([
+            "2024-01-20T09:58:00.000+02:00 INFO GET /api/a 200 5ms",
+            "2024-01-20T10:05:00.000+02:00 ERROR POST /api/b 500 50ms",
+            "2024-01-20T10:09:00.000+02:00 INFO GET /api/c 200 5ms",
+        ]) + "\n", encoding="utf-8")
+        assert lines_of(iter_query([path], QueryFilter(since="10:04", until="10:06"))) == [2]
+
+    def test_bad_time_range(self):
+        with pytest.raises(ValueError):
+            QueryFilter(since="25:00")
+
+    def test_limit_stops_reading(self, log_file, monkeypatch):
+        read = []
+
+        def counting(*args, **kwargs):
+            for line in iter_lines(*args, **kwargs):
+                read.append(line[0])
+                yield line
+
+        iter_lines = src.utils.query.iter_lines
+        monkeypatch.setattr(src.utils.query, "iter_lines", counting)
+        errors = QueryFilter(level="error")
+        assert lines_of(iter_query([log_file, log_file], errors, limit=1)) == [2]
+        assert read == [1, 2]
+        assert lines_of(iter_query([log_file, log_file], errors, limit=4)) == [2, 5, 6, 2]
+        assert lines_of(iter_query([log_file], QueryFilter(), limit=0)) == []
+
+    def test_compressed_input(self, log_file, tmp_path):
+        packed = tmp_path / "app.log.1.gz"
+        packed.write_bytes(gzip.compress(log_file.read_bytes()))
+        results = list(iter_query([packed, log_file], QueryFilter(status_code=500)))
+        assert [(path.name, entry.line_number) for path, entry in results] == [
+            ("app.log.1.gz", 2), ("app.log.1.gz", 5), ("app.log.1.gz", 6),
+            ("app.log", 2), ("app.log", 5), ("app.log", 6),
+        ]
+
+    def test_output(self, log_file):
+        (path, entry), = iter_query([log_file], QueryFilter(method="POST"))
+        assert format_entry(path, entry) == LINES[1]
+        assert format_entry(path, entry, prefix=True) == f"{log_file}:{LINES[1]}"
+
+        record = json.loads(format_entry(path, entry, FORMAT_JSONL))
+        assert record["file"] == str(log_file) and record["line"] == 2
+        assert record["timestamp"] == "2024-01-20T10:05:01"
+        assert (record["level"], record["status"], record["response_time"]) == ("ERROR", 500, 50.0)
+        assert record["raw"] == LINES[1]
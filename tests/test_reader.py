@@ -0,0 +1,90 @@
+"""
+Unit tests for the streaming log reader
+"""
+
+import pytest
+from src.models.log_entry import FORMAT_JAVA
+from src.utils.reader import index_lines, iter_lines, iter_entries, sniff_format
+
+
+class TestIterLines:
+    """Test block-based line streaming"""
+
+    @pytest.fixture
+    def log_file(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_bytes(
+            b"2024-01-20 10:30:45 INFO GET /api/users 200 45ms\r\n"
+            b"\n"
+            b"2024-01-20 10:30:46 ERROR POST /api/orders 500 120ms\n"
+            b"last line without newline"
+        )
+        return path
+
+    def test_lines_and_offsets(self, log_file):
+        """Line numbers are 1-based and offsets point at line starts"""
+        data = log_file.read_bytes()
+        lines = list(iter_lines(log_file))
+
+        assert [n for n, _, _ in lines] == [1, 2, 3, 4]
+        assert lines[0][2] == "2024-01-20 10:30:45 INFO GET /api/users 200 45ms"
+        assert lines[1][2] == ""
+        assert lines[3][2] == "last line without newline"
+        for _, offset, text in lines:
+            assert data[offset:].startswith(text.encode('utf-8'))
+
+    def test_small_blocks_match_single_block(self, log_file):
+        """Lines split across block boundaries are reassembled"""
+        assert list(iter_lines(log_file, block_size=7)) == list(iter_lines(log_file))
+
+    def test_invalid_utf8_is_replaced(self, tmp_path):
+        """Undecodable bytes do not abort the stream"""
+        path = tmp_path / "bad.log"
+        path.write_bytes(b"ERROR \xff\xfe broken\n")
+
+        assert list(iter_lines(path)) == [(1, 0, "ERROR �� broken")]
+
+
+class TestIndexLines:
+    """Test indexing the lines of a buffer"""
+
+    @pytest.mark.parametrize("data", [
+        b"a\n\nbb\r\n  \t\n\r\nccc",
+        b"  \nfirst\n\n\n",
+        b"a much longer line than the block\n \nb \n",
+        b"",
+    ])
+    @pytest.mark.parametrize("block_size", [1, 4, 1024])
+    def test_matches_streamed_lines(self, tmp_path, data, block_size):
+        """Non-blank lines are indexed as the reader sees them, whatever the block size"""
+        path = tmp_path / "app.log"
+        path.write_bytes(data)
+        expected = [(n, offset) for n, offset, text in iter_lines(path) if text.strip()]
+
+        line_numbers, offsets = index_lines(data, block_size)
+        assert list(zip(line_numbers, offsets)) == expected
+
+
+class TestIterEntries:
+    """Test streaming entry parsing"""
+
+    def test_blank_lines_skipped(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_text("2024-01-20 10:30:45 INFO GET /api/users 200 45ms\n\n   \n"
+                        "2024-01-20 10:30:46 ERROR POST /api/orders 500 120ms\n")
+
+        entries = list(iter_entries(path))
+
+        assert [e.line_number for e in entries] == [1, 4]
+        assert entries[1].level == "ERROR"
+
+    def test_entries_share_sniffed_format(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_text("10:30:45.123 [main] INFO c.e.App :: Started\n"
+                        "10:30:46.001 [main] ERROR c.e.Svc :: RSLT_CD[500] failed\n")
+
+        entries = list(iter_entries(path))
+
+        assert sniff_format(path).kind == FORMAT_JAVA
+        assert all(e.log_format.kind == FORMAT_JAVA for e in entries)
+        assert entries[1].status_code == 500
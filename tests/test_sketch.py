@@ -0,0 +1,126 @@
+"""
+Unit tests for latency quantile sketches
+"""
+
+import random
+import pytest
+from src.log_viewer import LogViewer
+from src.models.entry_store import EntryStore
+from src.models.log_entry import LogEntry
+from src.models.sketch import QuantileSketch, merged
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+@pytest.fixture
+def values():
+    rng = random.Random(7)
+    return [rng.lognormvariate(4, 1.5) for _ in range(20000)] + [0.0] * 50
+
+
+class TestQuantileSketch:
+    """Test accuracy, merging and removal"""
+
+    def test_relative_accuracy(self, values):
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        assert sketch.count == len(values)
+        assert sketch.max == max(values)
+        assert sketch.quantile(0.001) == 0.0
+        for q in (0.1, 0.5, 0.9, 0.99, 0.999):
+            exact = exact_quantile(values, q)
+            assert abs(sketch.quantile(q) - exact) <= 0.01 * exact
+
+    def test_merge_equals_single_sketch(self, values):
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for i, value in enumerate(values):
+            whole.add(value)
+            (left if i % 3 else right).add(value)
+
+        combined = merged([left, right])
+        assert combined.buckets == whole.buckets
+        assert combined.count == whole.count and combined.zero_count == whole.zero_count
+        assert combined.max == whole.max
+
+    def test_remove(self):
+        sketch = QuantileSketch()
+        for value in (10.0, 20.0, 500.0):
+            sketch.add(value)
+        sketch.remove(500.0)
+        assert sketch.count == 2
+        assert sketch.quantile(1.0) == pytest.approx(20.0, rel=0.01)
+
+        sketch.remove(10.0)
+        sketch.remove(20.0)
+        assert sketch.count == 0 and sketch.buckets == {}
+        assert sketch.quantile(0.5) is None
+
+    def test_bucket_cap(self, values):
+        sketch = QuantileSketch(max_buckets=256)
+        for value in values:
+            sketch.add(value)
+        assert len(sketch.buckets) <= 256
+        assert sketch.quantile(0.99) == pytest.approx(exact_quantile(values, 0.99), rel=0.01)
+
+    def test_ignores_missing_values(self):
+        sketch = QuantileSketch()
+        sketch.add(float("nan"))
+        sketch.add(-1.0)
+        assert sketch.count == 0
+
+
+class TestStoreLatency:
+    """Test that stores keep their sketches current"""
+
+    LINES = [
+        "2024-01-20 10:00:01 INFO GET /api/users 200 45ms",
+        "2024-01-20 10:00:02 ERROR POST /api/orders 500 1200ms",
+        "2024-01-20 10:00:03 INFO GET /api/users 200 55ms",
+        "2024-01-20 10:00:04 INFO GET /api/orders 200 70ms",
+        "2024-01-20 10:00:05 INFO no timing here",
+    ]
+
+    def build(self, lines):
+        store = EntryStore()
+        for line_number, text in enumerate(lines, 1):
+            store.append(LogEntry(text, line_number), 0)
+        return store
+
+    def test_sketches_per_value(self):
+        store = self.build(self.LINES)
+        by_endpoint = {store.dictionaries["endpoint"].decode(code): sketch
+                       for code, sketch in store.latency_sketches("endpoint").items()}
+        assert by_endpoint["/api/users"].count == 2
+        assert by_endpoint["/api/orders"].max == 1200.0
+        assert sum(sketch.count for sketch in by_endpoint.values()) == 4
+
+        ids = store.where("level", {store.dictionaries["level"].encode("ERROR")})
+        [sketch] = store.latency_sketches("method", ids).values()
+        assert (sketch.count, sketch.max) == (1, 1200.0)
+
+    def test_extend_merges_sketches(self):
+        store = self.build(self.LINES[:2])
+        store.extend(self.build(self.LINES[2:]))
+        whole = self.build(self.LINES)
+        for field in ("endpoint", "service_name", "method"):
+            decode = store.dictionaries[field].decode
+            buckets = {decode(code): sketch.buckets
+                       for code, sketch in store.latency_sketches(field).items()}
+            assert buckets == {whole.dictionaries[field].decode(code): sketch.buckets
+                               for code, sketch in whole.latency_sketches(field).items()}
+
+    def test_edit_moves_latency(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_text("\n".join(self.LINES) + "\n", encoding="utf-8")
+        viewer = LogViewer(str(path), index_cache=False)
+        viewer.load(preview=False)
+
+        viewer.edit_entry(2, "2024-01-20 10:00:02 INFO POST /api/orders 201 30ms")
+        store = viewer.entries
+        post = store.latency_sketches("method")[store.dictionaries["method"].encode("POST")]
+        assert (post.count, post.max) == (1, 30.0)
@@ -0,0 +1,138 @@
+"""
+Unit tests for saving edits by splicing
+"""
+
+import os
+import stat
+import pytest
+import src.utils.splice
+from src.log_viewer import LogViewer
+from src.utils.splice import copy_range, splice_lines
+
+LINES = [
+    "2024-01-20 10:00:01 INFO GET /api/a 200 5ms",
+    "",
+    "2024-01-20 10:00:02 ERROR POST /api/b 500 50ms   ",
+    "    at com.example.Handler.run(Handler.java:42)",
+    "2024-01-20 10:00:03 WARN GET /api/c 404 7ms",
+]
+DATA = "\r\n".join(LINES).encode("utf-8")  # CRLF endings, no newline at the end
+
+
+@pytest.fixture(params=["copy_file_range", "sendfile", "read_write"])
+def copier(request, monkeypatch):
+    """Force one copy call by marking the ones before it unsupported"""
+    unsupported = set()
+    for copier in src.utils.splice._COPIERS:
+        if copier.__name__.lstrip("_") == request.param:
+            break
+        unsupported.add(copier)
+    else:
+        pytest.skip(f"os.{request.param} is not available")
+    monkeypatch.setattr(src.utils.splice, "_unsupported", unsupported)
+    return request.param
+
+
+class TestSplice:
+    """Test copying ranges and replacing lines"""
+
+    def test_copy_range(self, tmp_path, copier, monkeypatch):
+        monkeypatch.setattr(src.utils.splice, "SPLICE_CHUNK_BYTES", 7)
+        src_path, dst_path = tmp_path / "src", tmp_path / "dst"
+        src_path.write_bytes(DATA)
+        with open(src_path, "rb") as source, open(dst_path, "wb", buffering=0) as target:
+            target.write(b">")
+            copy_range(source.fileno(), target.fileno(), 5, 40)
+            target.write(b"<")
+        assert dst_path.read_bytes() == b">" + DATA[5:45] + b"<"
+
+    def test_short_source(self, tmp_path):
+        src_path, dst_path = tmp_path / "src", tmp_path / "dst"
+        src_path.write_bytes(b"abc")
+        with open(src_path, "rb") as source, open(dst_path, "wb", buffering=0) as target:
+            with pytest.raises(EOFError):
+                copy_range(source.fileno(), target.fileno(), 1, 10)
+
+    def test_replacements_keep_line_endings(self, tmp_path, copier):
+        src_path, dst_path = tmp_path / "src", tmp_path / "dst"
+        src_path.write_bytes(DATA)
+        second = DATA.index(b"2024-01-20 10:00:02")
+        last = DATA.rindex(b"2024")
+        with open(src_path, "rb") as source, open(dst_path, "wb", buffering=0) as target:
+            replacements = [(0, " first "), (second, "second"), (last, "last")]
+            changes = splice_lines(source, target, replacements, len(DATA))
+
+        expected = "\r\n".join(["first", "", "second", LINES[3], "last"]).encode("utf-8")
+        assert dst_path.read_bytes() == expected
+        assert changes == [
+            (0, 5 - len(LINES[0])), (second, 6 - len(LINES[2])), (last, 4 - len(LINES[4])),
+        ]
+
+
+class TestSave:
+    """Test saving edits over the source"""
+
+    @pytest.fixture
+    def log_file(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_bytes(DATA)
+        os.chmod(path, 0o640)
+        return path
+
+    @pytest.mark.parametrize("use_mmap", [False, True])
+    def test_only_edited_lines_change(self, log_file, use_mmap):
+        viewer = LogViewer(str(log_file), use_mmap=use_mmap, index_cache=False)
+        viewer.load(preview=False)
+        viewer.edit_entry(3, "2024-01-20 10:00:02 INFO POST /api/b 201 50ms")
+        viewer.save()
+
+        lines = LINES.copy()
+        lines[2] = "2024-01-20 10:00:02 INFO POST /api/b 201 50ms"
+        assert log_file.read_bytes() == "\r\n".join(lines).encode("utf-8")
+        assert stat.S_IMODE(log_file.stat().st_mode) == 0o640
+        assert not viewer.entries.edits
+
+        # Offsets after the edit moved with it
+        raw_lines = [raw for _, raw in viewer.entries.iter_raw_lines()]
+        assert raw_lines == [line for line in lines if line]
+        assert viewer.entries.raw_line(viewer.entries.find_line(5)) == LINES[4]
+
+    def test_follow_after_save(self, log_file):
+        log_file.write_bytes(DATA + b"\r\n")
+        viewer = LogViewer(str(log_file), index_cache=False)
+        viewer.load(preview=False)
+        viewer.poll_appended()
+        viewer.edit_entry(1, "2024-01-20 10:00:01 INFO GET /api/a 200 5000ms")
+        viewer.save()
+
+        with open(log_file, "ab") as f:
+            f.write(b"2024-01-20 10:00:04 ERROR GET /api/d 500 9ms\n")
+        viewer.poll_appended()
+        assert len(viewer.entries) == 5
+        assert viewer.entries.raw_line(4) == "2024-01-20 10:00:04 ERROR GET /api/d 500 9ms"
+
+    def test_failed_save_keeps_source(self, log_file, monkeypatch, capsys):
+        viewer = LogViewer(str(log_file), index_cache=False)
+        viewer.load(preview=False)
+        viewer.edit_entry(1, "edited")
+
+        def broken(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(src.utils.splice, "_COPIERS", [broken])
+        viewer.save()
+        assert "disk full" in capsys.readouterr().out
+        assert log_file.read_bytes() == DATA
+        assert not (log_file.parent / "app.log.tmp").exists()
+        assert viewer.entries.edits
+
+    def test_save_to_new_file(self, log_file, tmp_path):
+        viewer = LogViewer(str(log_file), index_cache=False)
+        viewer.load(preview=False)
+        viewer.edit_entry(5, "edited")
+        output = tmp_path / "copy.log"
+        viewer.save(str(output))
+
+        assert output.read_bytes() == DATA[:DATA.rindex(b"2024")] + b"edited"
+        assert log_file.read_bytes() == DATA
+        assert viewer.entries.raw_line(3) == "edited"
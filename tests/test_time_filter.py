@@ -0,0 +1,125 @@
+"""
+Unit tests for time-range filtering
+"""
+
+from datetime import datetime, timedelta
+import pytest
+from src.log_viewer import LogViewer
+from src.models.indexes import TimeIndex
+from src.models.timestamps import parse_time_range, to_epoch_micros
+
+LINES = [
+    "2024-01-20 10:00:01 INFO GET /api/users 200 45ms",
+    "2024-01-20 10:02:00 ERROR POST /api/orders 500 120ms",
+    "    at com.example.Orders.create(Orders.java:42)",
+    "2024-01-20 10:05:30 INFO GET /api/users 200 30ms",
+    "2024-01-20 10:07:30 ERROR GET /api/items 500 15ms",
+    "2024-01-20 10:07:31 INFO GET /api/items 200 10ms",
+]
+
+
+def micros(text):
+    return to_epoch_micros(datetime.fromisoformat(text))
+
+
+@pytest.fixture
+def viewer(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+    viewer = LogViewer(str(path), index_cache=False)
+    viewer.load(preview=False)
+    return viewer
+
+
+class TestTimeIndex:
+    """Test window lookups over in-order and out-of-order keys"""
+
+    def test_in_order(self):
+        index = TimeIndex()
+        for key in (10, None, 20, 20, 30):
+            index.add(key)
+        assert index.in_order
+        assert index.lookup(10, 20) == range(0, 4)
+        assert index.lookup(21, 29) == range(4, 4)
+
+    def test_out_of_order(self):
+        index = TimeIndex()
+        for key in (10, 30, None, 20, 40):
+            index.add(key)
+        assert not index.in_order
+        assert list(index.lookup(15, 30)) == [1, 2, 3]
+
+        index.add(50)
+        assert list(index.lookup(35, 60)) == [4, 5]
+        index.set(4, 5)
+        assert list(index.lookup(0, 10)) == [0, 4]
+
+
+class TestParseTimeRange:
+    """Test range specs and their precision"""
+
+    def test_time_of_day_uses_reference_date(self):
+        start, end = parse_time_range("10:02:00..10:07:30", micros("2024-01-20 00:00:00"))
+        assert (start, end) == (micros("2024-01-20 10:02:00"), micros("2024-01-20 10:07:30.999999"))
+
+    def test_open_ends_and_dates(self):
+        start, end = parse_time_range("..2024-01-20")
+        assert end == micros("2024-01-20 23:59:59.999999") and start < end
+        assert parse_time_range("2024-01-20T10:07..", 0)[0] == micros("2024-01-20 10:07:00")
+
+    def test_past_midnight(self):
+        start, end = parse_time_range("23:50..00:10", micros("2024-01-20 00:00:00"))
+        assert end == micros("2024-01-21 00:10:59.999999")
+
+    def test_naive_bounds_on_log_clock(self):
+        start, end = parse_time_range("10:04..10:06", micros("2024-01-19 23:30:00+00:00"),
+                                      timedelta(hours=2))
+        assert start == micros("2024-01-20 10:04:00+02:00")
+        assert end == micros("2024-01-20 10:06:59.999999+02:00")
+        assert parse_time_range("2024-01-20T10:04Z..", 0, timedelta(hours=2))[0] == \
+            micros("2024-01-20 10:04:00")
+
+    @pytest.mark.parametrize("spec", ["10:02", "..", "10:99..", "2024-01-21..2024-01-20"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_time_range(spec, 0)
+
+
+class TestTimeFilter:
+    """Test the time filter in the viewer"""
+
+    def test_window_keeps_continuation_lines(self, viewer):
+        viewer.filter_logs(time_range="10:02..10:07:30")
+        assert [entry.line_number for entry in viewer.filtered_entries] == [2, 3, 4, 5]
+
+    def test_stacks_with_other_filters(self, viewer):
+        viewer.filter_logs(level="ERROR")
+        viewer.filter_logs(time_range="10:05 ..")
+        assert [entry.line_number for entry in viewer.filtered_entries] == [5]
+
+        viewer.filter_logs(time_range="..10:03")
+        assert [entry.line_number for entry in viewer.filtered_entries] == [2]
+        viewer.undo_filter()
+        assert [entry.line_number for entry in viewer.filtered_entries] == [5]
+
+    def test_invalid_range_keeps_view(self, viewer):
+        viewer.filter_logs(time_range="tomorrow")
+        assert len(viewer.filtered_entries) == len(LINES)
+
+    def test_edit_moves_entry(self, viewer):
+        viewer.edit_entry(1, "2024-01-20 10:06:00 INFO GET /api/users 200 45ms")
+        viewer.filter_logs(time_range="10:06..10:06")
+        assert [entry.line_number for entry in viewer.filtered_entries] == [1]
+
+    def test_offset_stamped_log(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_text("\n".join([
+            "2024-01-20T09:58:00.000+02:00 INFO GET /api/users 200 45ms",
+            "2024-01-20T10:05:00.000+02:00 ERROR POST /api/orders 500 120ms",
+            "2024-01-20T10:09:00.000+02:00 INFO GET /api/items 200 10ms",
+        ]) + "\n", encoding="utf-8")
+        viewer = LogViewer(str(path), index_cache=False)
+        viewer.load(preview=False)
+
+        viewer.filter_logs(time_range="10:04..10:06")
+        assert [entry.line_number for entry in viewer.filtered_entries] == [2]
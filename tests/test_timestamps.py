@@ -0,0 +1,56 @@
+"""
+Unit tests for timestamp decoding
+"""
+
+import pickle
+from datetime import datetime, timedelta, timezone
+import pytest
+from src.models.timestamps import LAYOUT_CLOCK, LAYOUT_DATETIME, TimestampDecoder
+
+
+@pytest.fixture
+def decoder():
+    return TimestampDecoder()
+
+
+class TestTimestampDecoder:
+    """Test the fast paths against the formats they replace"""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("2024-01-20 10:00:01", datetime(2024, 1, 20, 10, 0, 1)),
+        ("2024-01-20 10:00:01.5", datetime(2024, 1, 20, 10, 0, 1, 500000)),
+        ("2024-01-20T10:00:01.123Z", datetime(2024, 1, 20, 10, 0, 1, 123000)),
+        ("2024-01-20T10:00:01+02:00", datetime(2024, 1, 20, 10, 0, 1,
+                                               tzinfo=timezone(timedelta(hours=2)))),
+        ("2024-01-20T10:00:01.5+0200", datetime(2024, 1, 20, 10, 0, 1, 500000,
+                                                tzinfo=timezone(timedelta(hours=2)))),
+        ("2024-01-20T10:00:01", None),
+        ("2024-01-20 10:00:01Z", None),
+        ("2024-02-30 10:00:01", None),
+        ("2024-01-20 10:00:01.1234567", None),
+        ("", None),
+    ])
+    def test_datetimes(self, decoder, text, expected):
+        assert decoder.decode(text) == expected
+
+    def test_clock_uses_session_date(self, decoder):
+        decoder._today = datetime(2024, 1, 20).date()
+        assert decoder.decode("10:00:01.250") == datetime(2024, 1, 20, 10, 0, 1, 250000)
+        assert decoder.layout == LAYOUT_CLOCK
+        assert decoder.decode("25:00:00") is None
+
+    def test_memo_and_layout(self, decoder):
+        first = decoder.decode("2024-01-20 10:00:01.100")
+        second = decoder.decode("2024-01-20 10:00:01.200")
+        assert second - first == timedelta(milliseconds=100)
+        assert decoder.layout == LAYOUT_DATETIME
+        assert list(decoder._seconds) == ["2024-01-20 10:00:01"]
+
+        decoder.memo_size = 1
+        decoder.decode("2024-01-20 10:00:02")
+        assert list(decoder._seconds) == ["2024-01-20 10:00:02"]
+
+    def test_pickles_without_memo(self, decoder):
+        decoder.decode("2024-01-20 10:00:01")
+        copy = pickle.loads(pickle.dumps(decoder))
+        assert copy._seconds == {} and copy.layout is None
@@ -0,0 +1,56 @@
+"""
+Unit tests for the trigram search index
+"""
+
+from src.models.trigram import TrigramIndex, trigrams
+
+
+TEXTS = [
+    "ERROR payment gateway timeout",
+    "INFO order created",
+    "WARN Payment retry scheduled",
+    "INFO health check ok",
+    "ERROR database Timeout after 30s",
+]
+
+
+def build_index(block_lines=1, **options):
+    index = TrigramIndex(block_lines=block_lines, **options)
+    for entry_id, text in enumerate(TEXTS):
+        index.add(entry_id, text)
+    index.flush()
+    return index
+
+
+class TestTrigramIndex:
+    """Test candidate lookup, blocks, edits and the memory cap"""
+
+    def test_trigrams_are_case_folded(self):
+        assert trigrams("ABcd") == {('a', 'b', 'c'), ('b', 'c', 'd')}
+        assert trigrams("ab") == set()
+
+    def test_candidates(self):
+        index = build_index()
+        assert list(index.candidates("timeout", len(TEXTS))) == [0, 4]
+        assert list(index.candidates("PAYMENT", len(TEXTS))) == [0, 2]
+        assert list(index.candidates("missing", len(TEXTS))) == []
+
+    def test_short_query_not_answered(self):
+        index = build_index()
+        assert index.candidates("ok", len(TEXTS)) is None
+
+    def test_blocks_expand_to_ids(self):
+        index = build_index(block_lines=2)
+        assert list(index.candidates("health", len(TEXTS))) == [2, 3]
+        assert list(index.candidates("database", len(TEXTS))) == [4]
+
+    def test_insert(self):
+        index = build_index()
+        index.insert(1, "INFO order timeout")
+        assert list(index.candidates("timeout", len(TEXTS))) == [0, 1, 4]
+
+    def test_memory_cap(self):
+        index = build_index(max_postings=10)
+        assert index.overflowed
+        assert index.postings == {}
+        assert index.candidates("timeout", len(TEXTS)) is None